@@ -0,0 +1,55 @@
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+
+from src.main.controllers.agents.policy.predator_prey.compiled_actor import (
+    CompiledActor,
+)
+
+
+def _latencies(actor, states: np.ndarray, steps: int):
+    latencies = []
+    for _ in range(steps):
+        t_start = time.perf_counter()
+        np.asarray(actor(states))
+        latencies.append(time.perf_counter() - t_start)
+    return np.array(latencies)
+
+
+def benchmark(actor_model_path: str, batch_size: int, steps: int):
+    """
+    Compares the per-step latency of the eager Keras actor against the compiled one,
+    including the first call after the model is loaded.
+    :param actor_model_path: path of the .keras actor model
+    :param batch_size: number of agents sharing the policy
+    :param steps: number of measured steps
+    """
+    model = load_model(actor_model_path)
+    num_states = model.inputs[0].shape[-1]
+    states = np.random.uniform(size=(batch_size, num_states)).astype(np.float32)
+
+    t_start = time.perf_counter()
+    compiled = CompiledActor(model, num_states).warm_up()
+    warm_up = time.perf_counter() - t_start
+
+    eager = _latencies(lambda s: model(tf.convert_to_tensor(s)), states, steps)
+    compiled_latencies = _latencies(compiled, states, steps)
+    print(f"warm up: {warm_up * 1e3:9.3f} ms (paid once, after each model load)")
+    for name, latencies in [("eager", eager), ("compiled", compiled_latencies)]:
+        print(
+            f"{name:>8}: first {latencies[0] * 1e3:9.3f} ms, "
+            f"median {np.median(latencies) * 1e3:9.3f} ms/step, "
+            f"p99 {np.percentile(latencies, 99) * 1e3:9.3f} ms/step"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Policy inference benchmark")
+    parser.add_argument("actor_model_path")
+    parser.add_argument("--batch", type=int, default=5)
+    parser.add_argument("--steps", type=int, default=1000)
+    args = parser.parse_args()
+    benchmark(args.actor_model_path, args.batch, args.steps)
@@ -0,0 +1,58 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.main.controllers.agents.sensor.incremental_z3_sensor import (
+    IncrementalZ3Sensor,
+)
+from src.main.controllers.agents.sensor.ray_casting_sensor import RayCastingSensor
+from src.main.controllers.agents.sensor.z3_sensor import Z3Sensor
+
+
+def benchmark(num_agents: int, num_states: int, steps: int, seed: int):
+    """
+    Measures the per-step latency of each sensor backend on the same random walk
+    of the population, checking that they all return the same observations.
+    :param num_agents: number of agents, half predators and half preys
+    :param num_states: number of rays of each agent
+    :param steps: number of steps of the random walk
+    :param seed: random seed
+    """
+    rng = np.random.default_rng(seed)
+    agent_types = np.arange(num_agents) % 2 + 1
+    positions = rng.uniform(0, 50, size=(num_agents, 2))
+    walk = [positions]
+    for _ in range(steps - 1):
+        walk.append(np.clip(walk[-1] + rng.normal(0, 5, size=(num_agents, 2)), 0, 49))
+
+    sensors = {
+        "z3": Z3Sensor(num_states, 3, 20),
+        "z3 incremental": IncrementalZ3Sensor(num_states, 3, 20),
+        "ray casting": RayCastingSensor(num_states, 3, 20),
+    }
+    reference = None
+    for name, sensor in sensors.items():
+        latencies, observations = [], []
+        for positions in walk:
+            t_start = time.perf_counter()
+            observations.append(sensor.sense_all(positions, agent_types))
+            latencies.append(time.perf_counter() - t_start)
+        observations = np.array(observations)
+        if reference is None:
+            reference = observations
+        print(
+            f"{name:>15}: mean {np.mean(latencies) * 1e3:9.3f} ms/step, "
+            f"first {latencies[0] * 1e3:9.3f} ms, "
+            f"max abs diff {np.max(np.abs(observations - reference)):.2e}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sensor backends benchmark")
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--states", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark(args.agents, args.states, args.steps, args.seed)
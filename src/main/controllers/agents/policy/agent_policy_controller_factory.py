@@ -1,11 +1,15 @@
 import os
+from functools import partial
+from typing import Any, Callable
 
-from src.main.controllers.agents.policy.predator_prey.predator_prey_policy_controller_simulation import (
-    PredatorPreyPolicyControllerSimulation,
-)
+from src.main.controllers.agents.policy.predator_prey.numpy_actor import NumpyActor
 from src.main.controllers.agents.policy.predator_prey.predator_prey_policy_controller_learning import (
     PredatorPreyPolicyControllerLearning,
 )
+from src.main.controllers.agents.policy.predator_prey.predator_prey_policy_controller_numpy import (
+    PredatorPreyPolicyControllerNumpy,
+)
+from src.main.model.config.config import PolicyEngine
 from src.main.model.config.config_utils import PredatorPreyConfig
 from src.main.controllers.agents.policy.agent_policy_controller import (
     AgentPolicyController,
@@ -13,7 +17,14 @@ from src.main.controllers.agents.policy.agent_policy_controller import (
 
 
 class AgentPolicyControllerFactory:
-    def __init__(self, project_root_path: str):
+    def __init__(
+        self,
+        project_root_path: str,
+        num_states: int,
+        policy_engine: PolicyEngine = PolicyEngine.TENSORFLOW,
+    ):
+        self.__num_states = num_states
+        self.__policy_engine = policy_engine
         self.__prey_actor_model_path: str = os.path.join(
             project_root_path, "src", "main", "resources", "prey.keras"
         )
@@ -29,6 +40,7 @@ class AgentPolicyControllerFactory:
             .pubsub_broker,
             actor_model_path=self.__prey_actor_model_path,
             routing_key="prey-actor-model",
+            load_actor=self.__actor_loader(),
         )
 
     def predator_policy_controller_learning(self, init: bool) -> AgentPolicyController:
@@ -39,14 +51,40 @@ class AgentPolicyControllerFactory:
             .pubsub_broker,
             actor_model_path=self.__predator_actor_model_path,
             routing_key="predator-actor-model",
+            load_actor=self.__actor_loader(),
         )
 
     def prey_policy_controller_simulation(self) -> AgentPolicyController:
-        return PredatorPreyPolicyControllerSimulation(
-            actor_model_path=self.__prey_actor_model_path
-        )
+        return self.__policy_controller_simulation(self.__prey_actor_model_path)
 
     def predator_policy_controller_simulation(self) -> AgentPolicyController:
+        return self.__policy_controller_simulation(self.__predator_actor_model_path)
+
+    def __policy_controller_simulation(
+        self, actor_model_path: str
+    ) -> AgentPolicyController:
+        if self.__policy_engine == PolicyEngine.NUMPY:
+            return PredatorPreyPolicyControllerNumpy(actor_model_path=actor_model_path)
+        # TensorFlow is only imported when it's the selected engine
+        from src.main.controllers.agents.policy.predator_prey.predator_prey_policy_controller_simulation import (
+            PredatorPreyPolicyControllerSimulation,
+        )
+
         return PredatorPreyPolicyControllerSimulation(
-            actor_model_path=self.__predator_actor_model_path
+            actor_model_path=actor_model_path,
+            num_states=self.__num_states,
         )
+
+    def __actor_loader(self) -> Callable[[bytes], Any]:
+        """
+        Gets the function deserializing an actor model with the selected engine.
+        :return: function from the .keras archive content to the actor
+        """
+        if self.__policy_engine == PolicyEngine.NUMPY:
+            return NumpyActor.from_bytes
+        # TensorFlow is only imported when it's the selected engine
+        from src.main.controllers.agents.policy.predator_prey.compiled_actor import (
+            CompiledActor,
+        )
+
+        return partial(CompiledActor.from_bytes, num_states=self.__num_states)
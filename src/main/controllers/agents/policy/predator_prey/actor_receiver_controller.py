@@ -1,9 +1,13 @@
 import logging
-from threading import Lock
+import os
+from contextlib import contextmanager
+from threading import Condition, Lock
 from threading import Thread
+from typing import Any, Callable, Iterator
 
 import pika
-from tensorflow.keras.models import load_model
+
+from src.main.model.policy.weights_update import WeightsUpdate
 
 
 class ActorReceiverController:
@@ -13,24 +17,79 @@ class ActorReceiverController:
         broker_host: str,
         actor_model_path: str,
         routing_key: str,
+        load_actor: Callable[[bytes], Any],
     ):
         self.__broker_host = broker_host
         self.__actor_model_path = actor_model_path
         self.__routing_key = routing_key
-        self.__lock = Lock()
+        self.__load_actor = load_actor
         self.__save_lock = Lock()
-        self.__latest_actor = None
+        # Double buffer: the env loop reads the active slot, while new actors are
+        # prepared in the standby one and published by flipping the active index
+        self.__actors = [None, None]
+        self.__active = 0
+        # Readers holding the actor of each slot, a standby actor is only updated
+        # in place once the readers that got it before the last flip released it
+        self.__readers = [0, 0]
+        self.__readers_condition = Condition()
+        self.reader_grace_period = 1.0
+        # Full model the slots are built from, its generation and the one of each slot,
+        # so that weights-only updates are only applied to actors of the same model
+        self.__model_body = None
+        self.__generation = 0
+        self.__slot_generations = [-1, -1]
+        self.__weights_version = -1
+        self.__pending_save = None
+        self.__pending_weights = None
+        self.__save_condition = Condition()
+        self.__save_closed = False
+        self.__save_thread = None
         self.stop_recv = False
         self.recv_thread = None
         self.__start(init)
 
     def set_latest_actor(self, latest_actor):
-        with self.__lock:
-            self.__latest_actor = latest_actor
+        """
+        Publishes an already deserialized and warmed up actor, by writing it into the
+        standby slot and then atomically making it the active one.
+        :param latest_actor: new actor
+        """
+        standby = 1 - self.__active
+        self.__actors[standby] = latest_actor
+        self.__slot_generations[standby] = self.__generation
+        with self.__readers_condition:
+            self.__active = standby
+
+    @contextmanager
+    def latest_actor(self) -> Iterator[Any]:
+        """
+        Holds the active actor for the duration of the context, during which it is
+        never updated, even if a newer actor is published meanwhile.
+        :return: the latest actor
+        """
+        with self.__readers_condition:
+            slot = self.__active
+            self.__readers[slot] += 1
+            actor = self.__actors[slot]
+        try:
+            yield actor
+        finally:
+            with self.__readers_condition:
+                self.__readers[slot] -= 1
+                self.__readers_condition.notify_all()
 
-    def get_latest_actor(self):
-        with self.__lock:
-            return self.__latest_actor
+    def stop(self):
+        """
+        Stops receiving actors, then writes the pending disk copy of the latest one.
+        """
+        self.stop_recv = True
+        if self.recv_thread is not None:
+            self.recv_thread.join()
+        if self.__save_thread is not None:
+            with self.__save_condition:
+                self.__save_closed = True
+                self.__save_condition.notify()
+            self.__save_thread.join()
 
     def __start(self, init: bool):
         if init:
@@ -39,7 +98,14 @@ class ActorReceiverController:
         else:
             # An actor model already exists from previous computation,
             # load it and start a new thread to subscribe for model updates
-            self.set_latest_actor(load_model(self.__actor_model_path))
+            with open(self.__actor_model_path, "rb") as actor_model_file:
+                self.__apply_model(actor_model_file.read())
+            if os.path.exists(self.__weights_path()):
+                # Weights-only updates received after the last full model
+                with open(self.__weights_path(), "rb") as weights_file:
+                    self.__apply_weights(weights_file.read())
+            self.__save_thread = Thread(target=self.__save_loop, daemon=True)
+            self.__save_thread.start()
             self.__update_latest_actor()
 
     def __update_latest_actor(self):
@@ -82,21 +148,119 @@ class ActorReceiverController:
         )
 
     def __get_actor_and_exit_callback(self, a, b, c, body):
+        if WeightsUpdate.is_weights_update(body):
+            # Weights can only be applied once the full model is known
+            return
         self.__save_actor(body)
         self.channel.stop_consuming()
         self.channel.close()
         self.connection.close()
 
+    def __weights_path(self) -> str:
+        return f"{self.__actor_model_path}.weights"
+
+    def __apply_model(self, body: bytes):
+        """
+        Builds a new actor from a full model and publishes it.
+        :param body: .keras archive content
+        """
+        actor = self.__load_actor(body)
+        self.__model_body = body
+        self.__generation += 1
+        self.set_latest_actor(actor)
+
+    def __apply_weights(self, body: bytes) -> bool:
+        """
+        Applies a weights-only update to the standby actor and publishes it.
+        The standby actor is only updated in place once no reader holds it, and it is
+        rebuilt from the current full model when it belongs to an older one, e.g.
+        after an architecture change, or when a reader still holds it after the
+        grace period.
+        :param body: encoded WeightsUpdate
+        :return: True if applied, False if the update is stale
+        """
+        update = WeightsUpdate.from_bytes(body)
+        if update.version <= self.__weights_version:
+            logging.info(
+                f"{self.__routing_key} weights version {update.version} skipped, "
+                f"already at {self.__weights_version}"
+            )
+            return False
+        standby = 1 - self.__active
+        with self.__readers_condition:
+            # No new reader gets the standby actor, only the previous ones may hold it
+            released = self.__readers_condition.wait_for(
+                lambda: self.__readers[standby] == 0, self.reader_grace_period
+            )
+        actor = self.__actors[standby]
+        if not released or self.__slot_generations[standby] != self.__generation:
+            actor = self.__load_actor(self.__model_body)
+        actor.set_weights(update.weights)
+        self.__weights_version = update.version
+        self.set_latest_actor(actor)
+        return True
+
+    @staticmethod
+    def __write_file(path: str, body: bytes):
+        """
+        Writes the file through a temporary one, replacing the previous file atomically
+        so that a crash never leaves a truncated file behind.
+        :param path: file path
+        :param body: file content
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as tmp_file:
+            tmp_file.write(body)
+        os.replace(tmp_path, path)
+
     def __save_actor(self, body):
+        """
+        Writes the actor model to disk, dropping the weights of the previous model.
+        :param body: serialized actor model
+        """
         with self.__save_lock:
-            with open(self.__actor_model_path, "wb") as actor_model_file:
-                actor_model_file.write(body)
-            actor_model_file.close()
+            self.__write_file(self.__actor_model_path, body)
+            if os.path.exists(self.__weights_path()):
+                os.remove(self.__weights_path())
+
+    def __save_actor_async(self, body, weights: bool = False):
+        """
+        Schedules the disk copy of the actor, used only for crash recovery.
+        Only the latest pending model and weights are written.
+        :param body: serialized actor model or weights-only update
+        :param weights: True if body is a weights-only update
+        """
+        with self.__save_condition:
+            if weights:
+                self.__pending_weights = body
+            else:
+                self.__pending_save, self.__pending_weights = body, None
+            self.__save_condition.notify()
+
+    def __save_loop(self):
+        while True:
+            with self.__save_condition:
+                while self.__pending_save is None and self.__pending_weights is None:
+                    if self.__save_closed:
+                        return
+                    self.__save_condition.wait()
+                body, self.__pending_save = self.__pending_save, None
+                weights, self.__pending_weights = self.__pending_weights, None
+            if body is not None:
+                self.__save_actor(body)
+            if weights is not None:
+                with self.__save_lock:
+                    self.__write_file(self.__weights_path(), weights)
 
     def __update_actor_callback(self, a, b, c, body):
         if not self.stop_recv:
-            self.__save_actor(body)
-            self.set_latest_actor(load_model(self.__actor_model_path))
+            # Actors are built or updated in memory and warmed up before being published
+            if WeightsUpdate.is_weights_update(body):
+                if self.__apply_weights(body):
+                    self.__save_actor_async(body, weights=True)
+            else:
+                self.__apply_model(body)
+                self.__save_actor_async(body)
             logging.info(f"{self.__routing_key} updated")
         else:
             self.channel.stop_consuming()
@@ -0,0 +1,67 @@
+import uuid
+
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+
+
+class CompiledActor:
+    """
+    Actor model wrapped in a tf.function with a fixed (None, num_states) input
+    signature, so that it is traced once for any batch size.
+    """
+
+    def __init__(self, model: tf.keras.Model, num_states: int):
+        self.model = model
+        self.num_states = num_states
+        self.__forward = tf.function(
+            lambda states: model(states, training=False),
+            input_signature=[tf.TensorSpec(shape=(None, num_states), dtype=tf.float32)],
+        )
+
+    @classmethod
+    def from_keras_file(cls, actor_model_path: str, num_states: int):
+        """
+        Loads the actor model and warms up its compiled inference path.
+        :param actor_model_path: path of the .keras model
+        :param num_states: size of the state
+        :return: the warmed up actor
+        """
+        return cls(load_model(actor_model_path), num_states).warm_up()
+
+    @classmethod
+    def from_bytes(cls, body: bytes, num_states: int):
+        """
+        Deserializes the actor model from the content of a .keras file without
+        touching the disk, going through the in-memory ram:// filesystem,
+        and warms up its compiled inference path.
+        :param body: .keras archive content
+        :param num_states: size of the state
+        :return: the warmed up actor
+        """
+        ram_path = f"ram://{uuid.uuid4().hex}.keras"
+        with tf.io.gfile.GFile(ram_path, "wb") as ram_file:
+            ram_file.write(body)
+        try:
+            return cls(load_model(ram_path), num_states).warm_up()
+        finally:
+            tf.io.gfile.remove(ram_path)
+
+    def warm_up(self):
+        """
+        Traces the compiled forward pass, so that the first step using this actor
+        does not pay for it.
+        :return: the warmed up actor
+        """
+        self.__forward(tf.zeros((1, self.num_states), dtype=tf.float32))
+        return self
+
+    def set_weights(self, weights):
+        """
+        Assigns the new weights to the model variables in place. The compiled
+        forward pass reads the same variables, so it needs no retracing.
+        :param weights: tensors in the order of Keras get_weights
+        """
+        self.model.set_weights(weights)
+
+    def __call__(self, states):
+        return self.__forward(tf.convert_to_tensor(states, dtype=tf.float32))
@@ -0,0 +1,171 @@
+import io
+import json
+import re
+import zipfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+import h5py
+import numpy as np
+
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    e = np.exp(x - np.max(x, axis=-1, keepdims=True))
+    return e / np.sum(e, axis=-1, keepdims=True)
+
+
+ACTIVATIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+    "softmax": _softmax,
+}
+
+
+class NumpyActor:
+    """
+    TensorFlow-free actor, running the forward pass of a chain of Dense layers in NumPy.
+    """
+
+    def __init__(
+        self, layers: List[Tuple[Optional[np.ndarray], Optional[np.ndarray], str]]
+    ):
+        self.layers = layers
+
+    @classmethod
+    def from_keras_file(cls, actor_model_path: str):
+        """
+        Loads the actor from a .keras model file.
+        :param actor_model_path: path of the .keras model
+        :return: NumpyActor
+        """
+        with open(actor_model_path, "rb") as actor_model_file:
+            return cls.from_bytes(actor_model_file.read())
+
+    @classmethod
+    def from_bytes(cls, body: bytes):
+        """
+        Loads the actor from the content of a .keras model file, extracting
+        the Dense-layer weights and activations.
+        :param body: .keras archive content
+        :return: NumpyActor
+        """
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            config = json.loads(archive.read("config.json"))
+            weights = h5py.File(io.BytesIO(archive.read("model.weights.h5")), "r")
+        with weights:
+            return cls(cls.__read_layers(config, weights))
+
+    def set_weights(self, weights: List[np.ndarray]):
+        """
+        Replaces the weights of the Dense layers in place, keeping the architecture.
+        :param weights: tensors in the order of Keras get_weights, i.e. the kernel
+            and, if any, the bias of each Dense layer
+        """
+        tensors = iter(weights)
+        layers = []
+        for kernel, bias, activation in self.layers:
+            if kernel is not None:
+                kernel = self.__replace(kernel, next(tensors))
+            if bias is not None:
+                bias = self.__replace(bias, next(tensors))
+            layers.append((kernel, bias, activation))
+        if next(tensors, None) is not None:
+            raise ValueError("More weights than the NumPy actor layers")
+        self.layers = layers
+
+    def __call__(self, states) -> np.ndarray:
+        x = np.asarray(states, dtype=np.float32)
+        for kernel, bias, activation in self.layers:
+            if kernel is not None:
+                x = x @ kernel
+            if bias is not None:
+                x = x + bias
+            x = ACTIVATIONS[activation](x)
+        return x
+
+    @staticmethod
+    def __replace(current: np.ndarray, new) -> np.ndarray:
+        new = np.asarray(new, dtype=np.float32)
+        if new.shape != current.shape:
+            raise ValueError(
+                f"Weight of shape {new.shape} does not match the layer shape {current.shape}"
+            )
+        return new
+
+    @staticmethod
+    def __read_layers(
+        config: dict, weights
+    ) -> List[Tuple[Optional[np.ndarray], Optional[np.ndarray], str]]:
+        """
+        Walks the model config in order, checking that it is a chain of supported layers.
+        :param config: content of config.json
+        :param weights: model.weights.h5 file
+        :return: list of (kernel, bias, activation) of each Dense or Activation layer,
+            where Activation layers have neither kernel nor bias and Dense layers
+            without bias have no bias
+        """
+        if config["class_name"] not in ["Sequential", "Functional", "Model"]:
+            raise ValueError(f"Unsupported model type {config['class_name']}")
+
+        layers, used_names, previous = [], {}, None
+        for layer_config in config["config"]["layers"]:
+            class_name = layer_config["class_name"]
+            # Weights are stored by snake-cased class name, numbered in layer order
+            name = re.sub("(.)([A-Z][a-z0-9]+)", r"\1_\2", class_name)
+            name = re.sub("([a-z])([A-Z])", r"\1_\2", name).lower()
+            used_names[name] = used_names.get(name, -1) + 1
+            if used_names[name] > 0:
+                name = f"{name}_{used_names[name]}"
+
+            inbound = NumpyActor.__inbound_layers(layer_config)
+            if previous is not None and inbound not in [[], [previous]]:
+                raise ValueError("The NumPy actor only supports a chain of layers")
+            previous = layer_config["config"]["name"]
+
+            layer = layer_config["config"]
+            if class_name == "Dense":
+                kernel = np.array(weights[f"layers/{name}/vars/0"], dtype=np.float32)
+                bias = (
+                    np.array(weights[f"layers/{name}/vars/1"], dtype=np.float32)
+                    if layer.get("use_bias", True)
+                    else None
+                )
+                layers.append((kernel, bias, NumpyActor.__activation(layer)))
+            elif class_name == "Activation":
+                layers.append((None, None, NumpyActor.__activation(layer)))
+            elif class_name not in ["InputLayer", "Dropout"]:
+                raise ValueError(
+                    f"Unsupported layer type {class_name} in the NumPy actor"
+                )
+        return layers
+
+    @staticmethod
+    def __activation(layer: dict) -> str:
+        activation = layer.get("activation", "linear")
+        if isinstance(activation, dict):
+            activation = activation.get("config")
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unsupported activation {activation} in the NumPy actor")
+        return activation
+
+    @staticmethod
+    def __inbound_layers(layer_config: dict) -> List[str]:
+        """
+        Gets the names of the layers feeding this one, in both the Keras 2 and Keras 3
+        config formats. Sequential layers have none.
+        :param layer_config: layer config
+        :return: list of layer names
+        """
+        names = []
+        for node in layer_config.get("inbound_nodes", []):
+            if isinstance(node, dict):
+                names.extend(
+                    arg["config"]["keras_history"][0]
+                    for arg in node.get("args", [])
+                    if isinstance(arg, dict)
+                    and "keras_history" in arg.get("config", {})
+                )
+            else:
+                names.extend(inbound[0] for inbound in node)
+        return names
@@ -1,3 +1,5 @@
+from typing import Any, Callable
+
 from src.main.controllers.agents.policy.predator_prey.actor_receiver_controller import (
     ActorReceiverController,
 )
@@ -8,16 +10,20 @@ from src.main.controllers.agents.policy.agent_policy_controller import (
 
 class PredatorPreyPolicyControllerLearning(AgentPolicyController):
     def __init__(
-        self, init: bool, broker_host: str, actor_model_path: str, routing_key: str
+        self,
+        init: bool,
+        broker_host: str,
+        actor_model_path: str,
+        routing_key: str,
+        load_actor: Callable[[bytes], Any],
     ):
         self.actor_receiver_controller = ActorReceiverController(
-            init, broker_host, actor_model_path, routing_key
+            init, broker_host, actor_model_path, routing_key, load_actor
         )
 
     def policy(self, state):
-        actor = self.actor_receiver_controller.get_latest_actor()
-        return actor(state)
+        with self.actor_receiver_controller.latest_actor() as actor:
+            return actor(state)
 
     def stop(self):
-        self.actor_receiver_controller.stop_recv = True
-        self.actor_receiver_controller.recv_thread.join()
+        self.actor_receiver_controller.stop()
@@ -0,0 +1,15 @@
+from src.main.controllers.agents.policy.agent_policy_controller import (
+    AgentPolicyController,
+)
+from src.main.controllers.agents.policy.predator_prey.numpy_actor import NumpyActor
+
+
+class PredatorPreyPolicyControllerNumpy(AgentPolicyController):
+    def __init__(self, actor_model_path: str):
+        self.__actor = NumpyActor.from_keras_file(actor_model_path)
+
+    def policy(self, state):
+        return self.__actor(state)
+
+    def stop(self):
+        pass
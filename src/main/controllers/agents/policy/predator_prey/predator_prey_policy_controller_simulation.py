@@ -3,11 +3,14 @@ from tensorflow.keras.models import load_model
 from src.main.controllers.agents.policy.agent_policy_controller import (
     AgentPolicyController,
 )
+from src.main.controllers.agents.policy.predator_prey.compiled_actor import (
+    CompiledActor,
+)
 
 
 class PredatorPreyPolicyControllerSimulation(AgentPolicyController):
-    def __init__(self, actor_model_path: str):
-        self.__actor = load_model(actor_model_path)
+    def __init__(self, actor_model_path: str, num_states: int):
+        self.__actor = CompiledActor(load_model(actor_model_path), num_states).warm_up()
 
     def policy(self, state):
         return self.__actor(state)
@@ -1,5 +1,3 @@
-from typing import List
-
 import numpy as np
 
 from src.main.controllers.agents.agent_controller import AgentController
@@ -7,7 +5,6 @@ from src.main.controllers.agents.policy.agent_policy_controller import (
     AgentPolicyController,
 )
 from src.main.model.config.config import EnvironmentConfig
-from src.main.model.environment.agents.agent import Agent
 from src.main.model.environment.agents.predator import Predator
 
 
@@ -34,10 +31,11 @@ class PredatorController(AgentController):
         """
         return -np.min(self.last_state) * 1000
 
-    def done(self, _: List[Agent]) -> bool:
+    @staticmethod
+    def rewards(states: np.ndarray) -> np.ndarray:
         """
-        The predator is done when life is equal to zero.
-        :return: true if it is done, false otherwise
+        Computes the reward of many predators at once, as in reward.
+        :param states: (N, num_states) array of current states
+        :return: (N,) array of rewards
         """
-        self.life = self.life - 1
-        return self.life == 0
+        return -np.min(states, axis=-1) * 1000
@@ -1,10 +1,5 @@
-from typing import List
-
 import numpy as np
 
-from z3 import Solver, sat, Real
-
-from src.main.model.environment.agents.agent import Agent
 from src.main.model.config.config import EnvironmentConfig
 from src.main.controllers.agents.policy.agent_policy_controller import (
     AgentPolicyController,
@@ -39,25 +34,11 @@ class PreyController(AgentController):
         # ) * 1000 - 1000
         return np.min(self.last_state) * 1000 - 1000
 
-    def done(self, agents: List[Agent]) -> bool:
+    @staticmethod
+    def rewards(states: np.ndarray) -> np.ndarray:
         """
-        Checks if this agent is eaten by the target agents given as parameter
-        :param agents: other agents inside the environment
-        :return: True if the current agent is being eaten, False otherwise
+        Computes the reward of many preys at once, as in reward.
+        :param states: (N, num_states) array of current states
+        :return: (N,) array of rewards
         """
-        for agent in agents:
-            x, y = Real("x"), Real("y")
-            s = Solver()
-            s.add(
-                x < self.agent.x + self.r,
-                x >= self.agent.x - self.r,
-                x < agent.x + self.r,
-                x >= agent.x - self.r,
-                y < self.agent.y + self.r,
-                y >= self.agent.y - self.r,
-                y < agent.y + self.r,
-                y >= agent.y - self.r,
-            )
-            if s.check() == sat:
-                return True
-        return False
+        return np.min(states, axis=-1) * 1000 - 1000
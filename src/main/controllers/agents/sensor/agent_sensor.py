@@ -0,0 +1,55 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class AgentSensor:
+    def __init__(self, num_states: int, r: float, vd: float):
+        self.num_states = num_states
+        self.r = r
+        self.vd = vd
+
+    def sense(self, origin: Tuple[float, float], cds: np.ndarray) -> np.ndarray:
+        """
+        Base sense method, to be overridden by subclasses
+        :param origin: (x, y) coordinates of the sensing agent
+        :param cds: (M, 2) array with the centers of the opposing agents' boxes
+        :return: the normalized distances, one for each of the num_states rays
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def sense_all(
+        self,
+        positions: np.ndarray,
+        agent_types: np.ndarray,
+        candidates: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Captures the state of the whole population, where each agent senses the boxes
+        of the agents of a different type. Subclasses may override it with a batched
+        implementation.
+        :param positions: (N, 2) array with the agents' coordinates
+        :param agent_types: (N,) array with the agents' types
+        :param candidates: optional (i, j) index pairs, restricting agent i to only
+            sense the candidate agents j (e.g. the ones found by a spatial index)
+        :return: (N, num_states) float32 observation matrix
+        """
+        visible = self.visibility_mask(agent_types)
+        if candidates is not None:
+            near = np.zeros_like(visible)
+            near[candidates] = True
+            visible &= near
+        return np.array(
+            [self.sense(tuple(p), positions[v]) for p, v in zip(positions, visible)],
+            dtype=np.float32,
+        )
+
+    @staticmethod
+    def visibility_mask(agent_types: np.ndarray) -> np.ndarray:
+        """
+        Predators only see preys and preys only see predators.
+        :param agent_types: (N,) array with the agents' types
+        :return: (N, N) boolean mask, True where agent i senses agent j
+        """
+        agent_types = np.asarray(agent_types)
+        return agent_types[:, np.newaxis] != agent_types[np.newaxis, :]
@@ -0,0 +1,24 @@
+from src.main.controllers.agents.sensor.agent_sensor import AgentSensor
+from src.main.controllers.agents.sensor.incremental_z3_sensor import (
+    IncrementalZ3Sensor,
+)
+from src.main.controllers.agents.sensor.ray_casting_sensor import RayCastingSensor
+from src.main.controllers.agents.sensor.z3_sensor import Z3Sensor
+from src.main.model.config.config import EnvironmentConfig, SensorBackend
+
+
+class AgentSensorFactory:
+    @staticmethod
+    def sensor_from_config(env_config: EnvironmentConfig) -> AgentSensor:
+        """
+        Creates the sensor selected by the environment configuration.
+        :param env_config: EnvironmentConfig
+        :return: AgentSensor
+        """
+        if env_config.sensor == SensorBackend.Z3:
+            return Z3Sensor(env_config.num_states, env_config.r, env_config.vd)
+        if env_config.sensor == SensorBackend.Z3_INCREMENTAL:
+            return IncrementalZ3Sensor(
+                env_config.num_states, env_config.r, env_config.vd
+            )
+        return RayCastingSensor(env_config.num_states, env_config.r, env_config.vd)
@@ -0,0 +1,184 @@
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+from z3 import And, Bool, Optimize, Or, Real, RealVal, sat
+
+from src.main.controllers.agents.sensor.agent_sensor import AgentSensor
+from src.main.controllers.agents.sensor.ray_casting_sensor import RayCastingSensor
+
+
+class _SolverSlot:
+    """
+    Persistent Optimize instance of a single agent, where the agent position and the
+    box centers are symbolic parameters bound at every step.
+    """
+
+    def __init__(
+        self,
+        r: float,
+        vd: float,
+        capacity: int,
+        angles: np.ndarray,
+        directions: np.ndarray,
+    ):
+        self.capacity = capacity
+        self.optimize = Optimize()
+        self.x, self.y = Real("x"), Real("y")
+        self.x_0, self.y_0 = Real("x_0"), Real("y_0")
+        self.cxs = [Real(f"cx_{i}") for i in range(capacity)]
+        self.cys = [Real(f"cy_{i}") for i in range(capacity)]
+        self.actives = [Bool(f"active_{i}") for i in range(capacity)]
+
+        x, y = self.x, self.y
+        x_rng, y_rng = x - self.x_0, y - self.y_0
+        # Range and box constraints are added once and kept across rays and steps,
+        # with |x - x_0| < vd and |y - y_0| < vd written as linear bounds
+        self.optimize.add(
+            x_rng < vd,
+            -x_rng < vd,
+            y_rng < vd,
+            -y_rng < vd,
+            Or(
+                [
+                    And(
+                        active,
+                        Or(
+                            And(x <= cx + r, x >= cx - r, y == cy - r),
+                            And(x <= cx + r, x >= cx - r, y == cy + r),
+                            And(y <= cy + r, y >= cy - r, x == cx - r),
+                            And(y <= cy + r, y >= cy - r, x == cx + r),
+                        ),
+                    )
+                    for cx, cy, active in zip(self.cxs, self.cys, self.actives)
+                ]
+            ),
+        )
+        # Constraints and objective of each half-line, in the order of the directions
+        self.rays = []
+        for a, (first, second) in zip(angles, directions.reshape(-1, 2, 2)):
+            line = x_rng * np.sin(a) - y_rng * np.cos(a) == 0
+            for half_line, (d_x, d_y) in [
+                (x >= self.x_0, first),
+                (x < self.x_0, second),
+            ]:
+                self.rays.append(
+                    (And(line, half_line), x_rng * RealVal(d_x) + y_rng * RealVal(d_y))
+                )
+
+
+class IncrementalZ3Sensor(AgentSensor):
+    def __init__(self, num_states: int, r: float, vd: float):
+        super().__init__(num_states, r, vd)
+        self.angles = np.linspace(0, np.pi, int(num_states / 2) + 1, endpoint=False)[1:]
+        self.directions = RayCastingSensor.ray_directions(num_states)
+        self.__slots: Dict[Optional[Hashable], _SolverSlot] = {}
+
+    def sense(self, origin: Tuple[float, float], cds: np.ndarray) -> np.ndarray:
+        r"""
+        Captures the state given the positions of the opposing agents, with the same
+        constraints and exact rational arithmetic of the Z3Sensor.
+
+        Instead of creating a new Solver for every ray and enumerating all the
+        intersections, a single Optimize instance is kept across rays and steps:
+        the agent position and the box centers are bound with push/pop and the nearest
+        intersection along each half-line is found with a single minimization of
+
+            .. math:: t = (x - x_0) d_x + (y - y_0) d_y
+
+        where :math:`(d_x, d_y)` is the unit direction of the half-line.
+
+        :param origin: (x, y) coordinates of the sensing agent
+        :param cds: (M, 2) array with the centers of the opposing agents' boxes
+        :return: a new state
+        """
+        return self.__sense(None, origin, cds)
+
+    def sense_all(
+        self,
+        positions: np.ndarray,
+        agent_types: np.ndarray,
+        candidates: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Captures the state of the whole population, keeping one solver for each agent.
+        :param positions: (N, 2) array with the agents' coordinates
+        :param agent_types: (N,) array with the agents' types
+        :param candidates: optional (i, j) index pairs, restricting agent i to only
+            sense the candidate agents j (e.g. the ones found by a spatial index)
+        :return: (N, num_states) float32 observation matrix
+        """
+        visible = self.visibility_mask(agent_types)
+        if candidates is not None:
+            near = np.zeros_like(visible)
+            near[candidates] = True
+            visible &= near
+        return np.array(
+            [
+                self.__sense(i, tuple(p), positions[v])
+                for i, (p, v) in enumerate(zip(positions, visible))
+            ],
+            dtype=np.float32,
+        )
+
+    def __slot(self, key: Optional[Hashable], num_boxes: int) -> _SolverSlot:
+        """
+        Gets the solver of an agent, growing it when there are more boxes than it can bind.
+        :param key: agent key
+        :param num_boxes: number of boxes to bind
+        :return: the agent's solver slot
+        """
+        slot = self.__slots.get(key)
+        if slot is None or slot.capacity < num_boxes:
+            capacity = max(num_boxes, 2 * slot.capacity if slot else 1)
+            slot = _SolverSlot(self.r, self.vd, capacity, self.angles, self.directions)
+            self.__slots[key] = slot
+        return slot
+
+    def __sense(
+        self, key: Optional[Hashable], origin: Tuple[float, float], cds: np.ndarray
+    ) -> np.ndarray:
+        cds = np.asarray(cds, dtype=float).reshape(-1, 2)
+        (x_0, y_0) = origin
+        slot = self.__slot(key, len(cds))
+        o, x, y = slot.optimize, slot.x, slot.y
+
+        o.push()
+        o.add(slot.x_0 == x_0, slot.y_0 == y_0)
+        for i, (cx, cy, active) in enumerate(zip(slot.cxs, slot.cys, slot.actives)):
+            if i < len(cds):
+                o.add(cx == cds[i][0], cy == cds[i][1], active)
+            else:
+                o.add(active == False)  # noqa: E712
+
+        distances = []
+        for half_line_constraint, objective in slot.rays:
+            o.push()
+            o.add(half_line_constraint)
+            o.minimize(objective)
+            distances.append(self.__extract_distance(o, x, y, x_0, y_0))
+            o.pop()
+        o.pop()
+        return np.array(distances)
+
+    def __extract_distance(
+        self, o: Optimize, x: Real, y: Real, x_0: float, y_0: float
+    ) -> float:
+        """
+        Checks the Optimize object and extracts the normalized distance of the optimum.
+        :param o: Optimize object to check
+        :param x: x-coordinate variable to evaluate
+        :param y: y-coordinate variable to evaluate
+        :param x_0: x-coordinate of the reference agent
+        :param y_0: y-coordinate of the reference agent
+        :return: the normalized distance, 1 if UNSAT
+        """
+        if o.check() == sat:
+            model = o.model()
+            mx, my = model[x], model[y]
+            x_p, y_p = (
+                float(mx.numerator_as_long()) / float(mx.denominator_as_long()),
+                float(my.numerator_as_long()) / float(my.denominator_as_long()),
+            )
+            d = np.linalg.norm(np.array([x_0, y_0]) - np.array([x_p, y_p]))
+            return min(d / self.vd, 1.0)
+        return 1.0
@@ -0,0 +1,138 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.main.controllers.agents.sensor.agent_sensor import AgentSensor
+
+
+class RayCastingSensor(AgentSensor):
+    def __init__(self, num_states: int, r: float, vd: float):
+        super().__init__(num_states, r, vd)
+        self.directions = self.ray_directions(num_states)
+        with np.errstate(divide="ignore"):
+            self.__inv_directions = 1 / self.directions
+        # Offset from the box center to the side each ray enters from
+        self.__entry_offsets = np.where(self.directions >= 0, -r, r)
+        # As in the Z3Sensor, the origin itself only lies on the half-line with x >= x_0,
+        # so an agent touching a box only sees it at distance 0 along those rays
+        self.__closed = (np.arange(len(self.directions)) % 2 == 0)[:, np.newaxis]
+
+    @staticmethod
+    def ray_directions(num_states: int) -> np.ndarray:
+        """
+        Computes the unit direction of each ray, in the same order the Z3Sensor visits them:
+        for each angle of the pencil of lines, first the half-line with x >= x_0 and then
+        the one with x < x_0.
+        :param num_states: number of rays
+        :return: (num_states, 2) array of unit directions
+        """
+        angles = np.linspace(0, np.pi, int(num_states / 2) + 1, endpoint=False)[1:]
+        lines = np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+        # Orient each line so that its first half-line points towards x >= x_0
+        lines *= np.where(lines[:, :1] >= 0, 1.0, -1.0)
+        return np.stack([lines, -lines], axis=1).reshape(-1, 2)
+
+    def sense(self, origin: Tuple[float, float], cds: np.ndarray) -> np.ndarray:
+        r"""
+        Captures the state given the positions of the opposing agents, intersecting
+        every ray with every box in closed form (slab method).
+
+        For a ray :math:`o + t d` and a box :math:`[c - r, c + r]` the entry and exit
+        parameters are:
+
+            .. math:: t_{near} = \max_{k \in \{x, y\}} \min(t^{lo}_k, t^{hi}_k), \quad
+                t_{far} = \min_{k \in \{x, y\}} \max(t^{lo}_k, t^{hi}_k)
+
+        where :math:`t^{lo}_k = (c_k - r - o_k) / d_k` and :math:`t^{hi}_k = (c_k + r - o_k) / d_k`.
+        The ray hits the box side at :math:`t_{near}` when the agent is outside the box
+        and at :math:`t_{far}` when it is inside it. The origin (:math:`t = 0`) only
+        belongs to the half-lines with :math:`x \geq x_0`, as in the Z3Sensor.
+        Distances are normalized by the visual depth and capped to 1.
+
+        :param origin: (x, y) coordinates of the sensing agent
+        :param cds: (M, 2) array with the centers of the opposing agents' boxes
+        :return: a new state
+        """
+        cds = np.asarray(cds, dtype=float).reshape(-1, 2)
+        t_hit = self.__hit_distances(cds - np.asarray(origin, dtype=float))
+        return np.minimum(np.min(t_hit, axis=-1, initial=np.inf) / self.vd, 1.0)
+
+    def sense_all(
+        self,
+        positions: np.ndarray,
+        agent_types: np.ndarray,
+        candidates: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Captures the state of the whole population in a few broadcasted computations
+        over (agents x rays x boxes). Since all the agents of a type share the same
+        visibility mask, each type is sensed as one block against the visible boxes only.
+        When candidate pairs are given, only those (agent, box) pairs are intersected,
+        so that the cost is linear in the number of pairs.
+        :param positions: (N, 2) array with the agents' coordinates
+        :param agent_types: (N,) array with the agents' types
+        :param candidates: optional (i, j) index pairs, sorted by i, restricting agent i
+            to only sense the candidate agents j (e.g. the ones found by a spatial index)
+        :return: (N, num_states) float32 observation matrix
+        """
+        if candidates is not None:
+            return self.__sense_pairs(positions, agent_types, candidates)
+
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        agent_types = np.asarray(agent_types)
+        observations = np.empty((len(positions), len(self.directions)), np.float32)
+        for agent_type in np.unique(agent_types):
+            sensing = agent_types == agent_type
+            visible = ~sensing
+            rel = positions[np.newaxis, visible] - positions[sensing, np.newaxis]
+            t_hit = np.min(self.__hit_distances(rel), axis=-1, initial=np.inf)
+            observations[sensing] = np.minimum(t_hit / self.vd, 1.0)
+        return observations
+
+    def __sense_pairs(
+        self,
+        positions: np.ndarray,
+        agent_types: np.ndarray,
+        candidates: Tuple[np.ndarray, np.ndarray],
+    ) -> np.ndarray:
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        agent_types = np.asarray(agent_types)
+        rows, cols = candidates
+        visible = agent_types[rows] != agent_types[cols]
+        rows, cols = rows[visible], cols[visible]
+
+        observations = np.ones((len(positions), len(self.directions)), np.float32)
+        if len(rows) > 0:
+            rel = positions[cols] - positions[rows]
+            # (P, num_states) hit distances, reduced to the nearest one per agent
+            t_hit = self.__hit_distances(rel[:, np.newaxis, :])[..., 0]
+            sensing, starts = np.unique(rows, return_index=True)
+            t_min = np.minimum.reduceat(t_hit, starts, axis=0)
+            observations[sensing] = np.minimum(t_min / self.vd, 1.0)
+        return observations
+
+    def __hit_distances(self, rel: np.ndarray) -> np.ndarray:
+        """
+        Distance along each ray to the side of each box, inf when the ray misses it.
+        :param rel: (..., M, 2) box centers relative to the ray origin
+        :return: (..., num_states, M) hit distances
+        """
+        # (..., 1, M) boxes against (num_states, 1) directions
+        rx, ry = rel[..., np.newaxis, :, 0], rel[..., np.newaxis, :, 1]
+        inv_x, inv_y = self.__inv_directions[:, :1], self.__inv_directions[:, 1:]
+        off_x, off_y = self.__entry_offsets[:, :1], self.__entry_offsets[:, 1:]
+        with np.errstate(invalid="ignore"):
+            t_near = np.maximum((rx + off_x) * inv_x, (ry + off_y) * inv_y)
+            t_far = np.minimum((rx - off_x) * inv_x, (ry - off_y) * inv_y)
+
+            t_hit = np.where(self.__ahead(t_near), t_near, t_far)
+            hit = (t_near <= t_far) & self.__ahead(t_far)
+        return np.where(hit, t_hit, np.inf)
+
+    def __ahead(self, t: np.ndarray) -> np.ndarray:
+        """
+        Whether the points at distance t lie on the half-line of each ray.
+        :param t: (..., num_states, M) distances along the rays
+        :return: boolean mask of the same shape
+        """
+        return np.where(self.__closed, t >= 0, t > 0)
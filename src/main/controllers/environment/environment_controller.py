@@ -1,13 +1,20 @@
+import asyncio
 import logging
-from typing import List, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 import numpy as np
-import tensorflow as tf
 
 from src.main.model.environment.agents.predator import Predator
 from src.main.controllers.agents.agent_controller import AgentController
-from src.main.controllers.environment.utils.environment_controller_utils import (
-    EnvironmentControllerUtils,
+from src.main.controllers.agents.sensor.agent_sensor import AgentSensor
+from src.main.controllers.environment.step.step_controller import StepController
+from src.main.controllers.environment.termination.termination_controller import (
+    TerminationController,
+)
+from src.main.controllers.environment.telemetry.telemetry_controller import (
+    TelemetryController,
 )
 from src.main.controllers.agents.policy.agent_policy_controller import (
     AgentPolicyController,
@@ -17,6 +24,7 @@ from src.main.controllers.replay_buffer.replay_buffer_controller import (
 )
 from src.main.model.environment.agents.agent_type import AgentType
 from src.main.model.environment.environment import Environment
+from src.main.model.environment.pipeline_metrics import PipelineMetrics
 
 
 class EnvironmentController:
@@ -26,14 +34,32 @@ class EnvironmentController:
         agent_controllers: List[AgentController],
         buffer_controller: ReplayBufferController,
         policy_controllers: List[AgentPolicyController],
-        env_controller_utils: EnvironmentControllerUtils,
+        telemetry: TelemetryController,
+        sensor: AgentSensor,
+        termination_controller: TerminationController,
+        pipeline_depth: int = 2,
     ):
         self.__environment = environment
         self.__t_step = 1
+        self.__step_controller = StepController(environment, self.__t_step)
         self.__agent_controllers = agent_controllers
         self.__buffer_controller = buffer_controller
         self.__policy_controllers = policy_controllers
-        self.__utils = env_controller_utils
+        self.__telemetry = telemetry
+        self.__sensor = sensor
+        self.__agent_types = environment.state.type
+        self.__sense_radius = sensor.vd + sensor.r
+        self.__termination_controller = termination_controller
+        self.__policy_groups = self.__group_by_policy(agent_controllers)
+        # Sensing and replay buffer sends of the asyncio pipeline run off the loop
+        self.__executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="step-pipeline"
+        )
+        self.__pipeline_depth = pipeline_depth
+        self.__pipeline_steps, self.__pipeline_wall_time = 0, 0.0
+        self.__phase_times = dict.fromkeys(
+            ["sense", "act", "move", "record", "telemetry"], 0.0
+        )
 
     def train(self):
         """
@@ -46,20 +72,117 @@ class EnvironmentController:
             actions = self.__actions(prev_states)
             # Move all the agents at once and get their rewards only after
             next_states, rewards = self.__step(actions), self.__rewards()
-            # Print and save coords and rewards
-            agents_coords = [
-                (ac.agent.x, ac.agent.y) for ac in self.__agent_controllers
-            ]
-            logging.info(agents_coords)
-            logging.info(f"Avg reward: {np.average(list(rewards.values()))}")
-            self.__utils.save_data(
-                list(rewards.values()),
-                [(ac.agent.x, ac.agent.y) for ac in self.__agent_controllers],
-            )
+            # Log and save coords and rewards in background
+            self.__record_telemetry(rewards)
             # Record to buffer for batch learning
             self.__record_to_buffer((prev_states, actions, rewards, next_states))
             prev_states = next_states
+        self.__buffer_controller.end_episode()
+        self.__telemetry.end_episode()
+
+    async def train_async(self):
+        """
+        Starts the training as an asyncio pipeline producing the same transitions
+        of train, in the same order. The steps themselves stay sequential, as
+        the rewards and the actions of step t + 1 need its sensing, which needs
+        the move of step t: sensing runs in an executor but is awaited inline.
+        Only the I/O is handed off, to tasks each consuming a bounded queue in step
+        order: the replay buffer sends run in an executor thread and may overlap
+        any phase of the following steps, while the telemetry writes run on the
+        loop and only overlap the awaited sensing. There is no model-update task,
+        policies receive their weights through their own controllers.
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        records, snapshots, errors = (
+            asyncio.Queue(maxsize=self.__pipeline_depth),
+            asyncio.Queue(maxsize=self.__pipeline_depth),
+            [],
+        )
+        tasks = [
+            asyncio.create_task(
+                self.__consume(
+                    records, "record", self.__record_to_buffer, errors, self.__executor
+                )
+            ),
+            asyncio.create_task(
+                self.__consume(snapshots, "telemetry", self.__telemetry.record, errors)
+            ),
+        ]
+        start, steps = time.perf_counter(), 0
+        try:
+            prev_states = await loop.run_in_executor(self.__executor, self.__sense)
+            while not self.__is_done():
+                actions = self.__timed("act", self.__actions, prev_states)
+                self.__timed("move", self.__step_controller.step, actions)
+                next_states = await loop.run_in_executor(self.__executor, self.__sense)
+                rewards = self.__rewards()
+                # Snapshots are taken now, as positions keep changing in place
+                await snapshots.put(
+                    (
+                        np.fromiter(rewards.values(), dtype=float, count=len(rewards)),
+                        self.__positions().copy(),
+                    )
+                )
+                await records.put(((prev_states, actions, rewards, next_states),))
+                if errors:
+                    raise errors[0]
+                prev_states = next_states
+                steps += 1
+            await records.join()
+            await snapshots.join()
+            if errors:
+                raise errors[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.__pipeline_steps += steps
+            self.__pipeline_wall_time += time.perf_counter() - start
+        self.__buffer_controller.end_episode()
+        self.__telemetry.end_episode()
+
+    def pipeline_metrics(self) -> PipelineMetrics:
+        """
+        Gets a snapshot of the metrics of the asyncio pipeline, summed over
+        the episodes trained with train_async.
+        :return: PipelineMetrics
+        """
+        return PipelineMetrics(
+            steps=self.__pipeline_steps,
+            wall_time=self.__pipeline_wall_time,
+            phase_times=dict(self.__phase_times),
+        )
+
+    def reset(self, seed: Optional[int] = None):
+        """
+        Starts a new episode in the same world, re-randomizing the agents' positions
+        and velocities and restoring the predators' life, while keeping the policy
+        controllers, their broker subscriptions, the buffer client and the
+        experiment files alive. Agents are drawn in the same order and from the same
+        distributions of the AgentControllerFactory.
+        :param seed: optional seed of the global random generator
+        :return:
+        """
+        if seed is not None:
+            np.random.seed(seed)
+        self.__environment.randomize()
+        for agent_controller in self.__agent_controllers:
+            agent_controller.last_state = None
+        self.__termination_controller.reset()
+        self.__telemetry.reset()
+
+    def stop(self):
+        """
+        Stops the policy controllers and closes the buffer controller and the
+        experiment files, to be called once no more episodes will be run.
+        :return:
+        """
         self.__stop_policy_controllers()
+        self.__executor.shutdown()
+        if self.__buffer_controller is not None:
+            self.__buffer_controller.close()
+        self.__telemetry.close()
 
     def simulate(self):
         """
@@ -70,64 +193,154 @@ class EnvironmentController:
         while not self.__is_done():
             actions = self.__actions(prev_states)
             next_states, rewards = self.__step(actions), self.__rewards()
-            logging.info([(ac.agent.x, ac.agent.y) for ac in self.__agent_controllers])
-            logging.info(f"Avg reward: {np.average(list(rewards.values()))}")
             prev_states = next_states
-            self.__utils.save_data(
-                list(rewards.values()),
-                [(ac.agent.x, ac.agent.y) for ac in self.__agent_controllers],
-            )
+            self.__record_telemetry(rewards)
+        self.__telemetry.end_episode()
 
     def __states(self):
         """
-        Gets each agent current state.
+        Gets each agent current state, sensing the whole population at once.
+        Agent controllers are in the same order as the environment agents.
         :return: the joint state, a dict of key: agent_id, value: state
         """
-        return {
-            agent_controller.agent.id: agent_controller.state(self.__environment.agents)
-            for agent_controller in self.__agent_controllers
-        }
+        positions = self.__positions()
+        # Only boxes whose side can be within the visual depth are worth intersecting
+        candidates = self.__environment.candidate_pairs(self.__sense_radius)
+        observations = self.__sensor.sense_all(
+            positions, self.__agent_types, candidates
+        )
+        states = {}
+        for agent_controller, observation in zip(
+            self.__agent_controllers, observations
+        ):
+            agent_controller.last_state = observation
+            states.update({agent_controller.agent.id: observation})
+        return states
+
+    def __sense(self):
+        """
+        Senses the joint state, timing the sensing phase.
+        :return: the joint state
+        """
+        return self.__timed("sense", self.__states)
+
+    async def __consume(
+        self,
+        queue: asyncio.Queue,
+        phase: str,
+        f,
+        errors: list,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        """
+        Calls f on the queued arguments one at a time, in step order, timing the
+        given phase. Failures are collected rather than stopping the consumer,
+        so that the producer never waits on a queue nobody consumes.
+        :param queue: queue of argument tuples
+        :param phase: name of the phase
+        :param f: function to call
+        :param errors: list collecting the failures
+        :param executor: optional executor to run f in, e.g. for blocking I/O
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            args = await queue.get()
+            try:
+                if executor is None:
+                    self.__timed(phase, f, *args)
+                else:
+                    await loop.run_in_executor(executor, self.__timed, phase, f, *args)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                queue.task_done()
+
+    def __timed(self, phase: str, f, *args):
+        """
+        Calls f, adding its duration to the time spent in the given phase.
+        :param phase: name of the phase
+        :param f: function to call
+        :param args: arguments of f
+        :return: the result of f
+        """
+        start = time.perf_counter()
+        try:
+            return f(*args)
+        finally:
+            self.__phase_times[phase] += time.perf_counter() - start
 
     def __actions(self, states):
         """
-        Gets each agent action based on its current state.
+        Gets each agent action based on its current state, running a single batched
+        inference for all the agents sharing the same policy controller.
         :param states: joint state
-        :return: the joint action, a dict of key: agent_id, value: action
+        :return: the joint action, a (N, 2) array in the order of the agent controllers
         """
-        actions = {}
-        for agent_controller in self.__agent_controllers:
-            agent = agent_controller.agent
-            tf_prev_state = tf.expand_dims(tf.convert_to_tensor(states[agent.id]), 0)
-            action = agent_controller.action(tf_prev_state)
-            actions.update({agent.id: list(action)})
+        actions = np.empty((len(self.__agent_controllers), 2))
+        for policy_controller, agent_controllers, indices in self.__policy_groups:
+            group_states = np.array([states[ac.agent.id] for ac in agent_controllers])
+            actions[indices] = AgentController.actions(policy_controller, group_states)
         return actions
 
+    @staticmethod
+    def __group_by_policy(agent_controllers: List[AgentController]):
+        """
+        Groups the agent controllers by policy controller, preserving their order.
+        :param agent_controllers: agent controllers
+        :return: list of (policy controller, agent controllers, their indices) triples
+        """
+        groups = {}
+        for i, agent_controller in enumerate(agent_controllers):
+            policy_controller = agent_controller.policy_controller
+            _, group, indices = groups.setdefault(
+                id(policy_controller), (policy_controller, [], [])
+            )
+            group.append(agent_controller)
+            indices.append(i)
+        return [
+            (policy_controller, group, np.array(indices))
+            for policy_controller, group, indices in groups.values()
+        ]
+
     def __stop_policy_controllers(self):
         for policy_controller in self.__policy_controllers:
             policy_controller.stop()
 
     def __is_done(self):
-        return any(
-            [
-                ac.done(
-                    [
-                        agent_controller.agent
-                        for agent_controller in self.__agent_controllers
-                        if agent_controller.agent.agent_type != ac.agent.agent_type
-                    ]
-                )
-                for ac in self.__agent_controllers
-            ]
+        """
+        Checks the termination of the whole population at once, decreasing
+        the predators' life.
+        :return: True if the episode is over, False otherwise
+        """
+        termination = self.__termination_controller.check(self.__positions())
+        if np.any(termination.caught):
+            logging.info("Caught preys: %s", np.flatnonzero(termination.caught))
+        return termination.done
+
+    def __record_telemetry(self, rewards):
+        """
+        Hands the snapshot of the step over to the telemetry.
+        :param rewards: a dict of key: agent_id, value: reward
+        """
+        self.__telemetry.record(
+            np.fromiter(rewards.values(), dtype=float, count=len(rewards)),
+            self.__positions().copy(),
         )
 
+    def __positions(self):
+        """
+        Gets the coordinates of the agents, in the order of the agent controllers.
+        :return: (N, 2) view of the environment coordinates
+        """
+        return self.__environment.state.positions()
+
     def __step(self, actions):
         """
-        Moves each agent of one step, returning the new joint state.
+        Moves all the agents of one step at once, returning the new joint state.
         :param actions: joint action
         :return: joint state
         """
-        for agent_id, action in actions.items():
-            self.__step_agent(agent_id, action)
+        self.__step_controller.step(actions)
         return self.__states()
 
     def __rewards(self):
@@ -150,10 +363,10 @@ class EnvironmentController:
 
         prev_states, actions, rewards, next_states = tuple
         prev_states_t, actions_t, rewards_t, next_states_t = [], [], [], []
-        for agent_controller in self.__agent_controllers:
+        for agent_controller, action in zip(self.__agent_controllers, actions.tolist()):
             agent = agent_controller.agent
             prev_states_t.append(prev_states[agent.id])
-            actions_t.append(actions[agent.id])
+            actions_t.append(action)
             rewards_t.append(rewards[agent.id])
             next_states_t.append(next_states[agent.id])
 
@@ -161,35 +374,3 @@ class EnvironmentController:
         self.__buffer_controller.record(
             record_tuple=(prev_states_t, actions_t, rewards_t, next_states_t),
         )
-
-    def __agent_by_id(self, agent_id: str):
-        """
-        Get the agent with the specified id.
-        :param agent_id: agent id to search for
-        :return: agent if any, None otherwise
-        """
-        return next(
-            (agent for agent in self.__environment.agents if agent.id == agent_id), None
-        )
-
-    def __step_agent(self, agent_id: str, action: Tuple[float, float]):
-        """
-        Step an agent inside the environment given its action
-        :param agent_id: id of the agent
-        :param action: respective action
-        :return:
-        """
-        agent = self.__agent_by_id(agent_id)
-        v, turn = action[0], action[1]
-
-        agent.vx, agent.vy = np.abs(v) * np.cos(turn), np.abs(v) * np.sin(turn)
-
-        next_x, next_y = (
-            agent.x + agent.vx * self.__t_step,
-            agent.y + agent.vy * self.__t_step,
-        )
-
-        agent.x, agent.y = (
-            np.clip(next_x, 0, self.__environment.x_dim - 1),
-            np.clip(next_y, 0, self.__environment.y_dim - 1),
-        )
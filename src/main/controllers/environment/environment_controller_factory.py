@@ -1,4 +1,16 @@
-from src.main.model.config.config import EnvironmentConfig
+from typing import List, Union
+
+from src.main.model.config.config import (
+    EnvironmentConfig,
+    ReplayBufferBackend,
+    ReplayBufferServiceConfig,
+)
+from src.main.controllers.replay_buffer.local.local_replay_buffer_controller import (
+    LocalReplayBufferController,
+)
+from src.main.controllers.replay_buffer.n_step.n_step_replay_buffer_controller import (
+    NStepReplayBufferController,
+)
 from src.main.controllers.replay_buffer.replay_buffer_controller import (
     ReplayBufferController,
 )
@@ -8,9 +20,21 @@ from src.main.controllers.agents.policy.agent_policy_controller import (
 from src.main.controllers.agents.predator_prey.agent_controller_factory import (
     AgentControllerFactory,
 )
+from src.main.controllers.agents.sensor.agent_sensor_factory import (
+    AgentSensorFactory,
+)
 from src.main.controllers.environment.environment_controller import (
     EnvironmentController,
 )
+from src.main.controllers.environment.pool.pool_environment_controller import (
+    PoolEnvironmentController,
+)
+from src.main.controllers.environment.telemetry.telemetry_controller import (
+    TelemetryController,
+)
+from src.main.controllers.environment.termination.termination_controller import (
+    TerminationController,
+)
 from src.main.controllers.environment.utils.environment_controller_utils import (
     EnvironmentControllerUtils,
 )
@@ -20,8 +44,20 @@ from src.main.controllers.environment.utils.predator_prey_utils.predator_prey_ut
 from src.main.controllers.agents.policy.agent_policy_controller_factory import (
     AgentPolicyControllerFactory,
 )
-from src.main.controllers.replay_buffer.remote.remote_replay_buffer_controller import (
-    RemoteReplayBufferController,
+from src.main.controllers.replay_buffer.remote.batched_replay_buffer_controller import (
+    BatchedReplayBufferController,
+)
+from src.main.controllers.replay_buffer.remote.spooled_replay_buffer_controller import (
+    SpooledReplayBufferController,
+)
+from src.main.controllers.environment.vector.vector_agents_controller import (
+    VectorAgentsController,
+)
+from src.main.controllers.environment.vector.vector_environment_controller import (
+    VectorEnvironmentController,
+)
+from src.main.controllers.environment.vector.vector_world_controller_factory import (
+    VectorWorldControllerFactory,
 )
 from src.main.model.config.config_utils import PredatorPreyConfig
 from src.main.model.environment.environment import Environment
@@ -45,14 +81,17 @@ class EnvironmentControllerFactory:
         if init:
             utils = PredatorPreyUtils()
             utils.initialize_policy_receivers(
-                project_root_path=env_config.project_root_path
+                project_root_path=env_config.project_root_path,
+                num_states=env_config.num_states,
+                policy_engine=env_config.policy_engine,
             )
-        buffer_controller = RemoteReplayBufferController(
-            replay_buffer_config.replay_buffer_host,
-            replay_buffer_config.replay_buffer_port,
+        buffer_controller = self.__n_step(
+            self.__buffer_controller(replay_buffer_config), replay_buffer_config
         )
         policy_controller_factory = AgentPolicyControllerFactory(
-            env_config.project_root_path
+            env_config.project_root_path,
+            env_config.num_states,
+            env_config.policy_engine,
         )
         return self.__create_predator_prey(
             init=init,
@@ -77,7 +116,9 @@ class EnvironmentControllerFactory:
         :return: EnvironmentController
         """
         policy_controller_factory = AgentPolicyControllerFactory(
-            project_root_path=pred_prey_config.environment_configuration().project_root_path
+            project_root_path=pred_prey_config.environment_configuration().project_root_path,
+            num_states=pred_prey_config.environment_configuration().num_states,
+            policy_engine=pred_prey_config.environment_configuration().policy_engine,
         )
         return self.__create_predator_prey(
             init=init,
@@ -87,6 +128,134 @@ class EnvironmentControllerFactory:
             buffer_controller=None,
         )
 
+    def create_predator_prey_vector_learning(
+        self, pred_prey_config: PredatorPreyConfig, init: bool = True
+    ) -> Union[VectorEnvironmentController, PoolEnvironmentController]:
+        """
+        Creates a VectorEnvironmentController in learning mode, running num_envs
+        random worlds in lockstep, or a PoolEnvironmentController running num_envs
+        worlds in each of num_workers processes if any.
+        :param pred_prey_config: PredatorPreyConfig
+        :param init: Should be True if it's the first run
+        :return: VectorEnvironmentController or PoolEnvironmentController
+        """
+        env_config, replay_buffer_config = (
+            pred_prey_config.environment_configuration(),
+            pred_prey_config.replay_buffer_configuration(),
+        )
+        if init:
+            utils = PredatorPreyUtils()
+            utils.initialize_policy_receivers(
+                project_root_path=env_config.project_root_path,
+                num_states=env_config.num_states,
+                policy_engine=env_config.policy_engine,
+            )
+        buffer_controller = self.__buffer_controller(replay_buffer_config)
+        policy_controller_factory = AgentPolicyControllerFactory(
+            env_config.project_root_path,
+            env_config.num_states,
+            env_config.policy_engine,
+        )
+        return self.__create_predator_prey_vector(
+            init=init,
+            env_config=env_config,
+            prey_policy_controller=policy_controller_factory.prey_policy_controller_learning(
+                init=False
+            ),
+            pred_policy_controller=policy_controller_factory.predator_policy_controller_learning(
+                init=False
+            ),
+            buffer_controller=buffer_controller,
+            # Each world keeps its own n-step window
+            world_buffer_controllers=[
+                self.__n_step(buffer_controller, replay_buffer_config)
+                for _ in range(env_config.num_envs * max(env_config.num_workers, 1))
+            ],
+        )
+
+    def create_predator_prey_vector_simulation(
+        self, init: bool, pred_prey_config: PredatorPreyConfig
+    ) -> Union[VectorEnvironmentController, PoolEnvironmentController]:
+        """
+        Creates a VectorEnvironmentController in simulation mode, running num_envs
+        random worlds in lockstep, or a PoolEnvironmentController running num_envs
+        worlds in each of num_workers processes if any.
+        :param init: Indicates if it's the first simulation run
+        :param pred_prey_config: PredatorPreyConfig
+        :return: VectorEnvironmentController or PoolEnvironmentController
+        """
+        env_config = pred_prey_config.environment_configuration()
+        policy_controller_factory = AgentPolicyControllerFactory(
+            project_root_path=env_config.project_root_path,
+            num_states=env_config.num_states,
+            policy_engine=env_config.policy_engine,
+        )
+        return self.__create_predator_prey_vector(
+            init=init,
+            env_config=env_config,
+            prey_policy_controller=policy_controller_factory.prey_policy_controller_simulation(),
+            pred_policy_controller=policy_controller_factory.predator_policy_controller_simulation(),
+            buffer_controller=None,
+            world_buffer_controllers=None,
+        )
+
+    @staticmethod
+    def __n_step(
+        buffer_controller: ReplayBufferController,
+        replay_buffer_config: ReplayBufferServiceConfig,
+    ) -> ReplayBufferController:
+        """
+        Wraps the buffer controller into an n-step aggregation stage, if configured.
+        :param buffer_controller: ReplayBufferController
+        :param replay_buffer_config: ReplayBufferServiceConfig
+        :return: ReplayBufferController
+        """
+        if replay_buffer_config.n_step > 1 or replay_buffer_config.stride > 1:
+            return NStepReplayBufferController(
+                buffer_controller,
+                n=replay_buffer_config.n_step,
+                gamma=replay_buffer_config.gamma,
+                stride=replay_buffer_config.stride,
+            )
+        return buffer_controller
+
+    @staticmethod
+    def __buffer_controller(
+        replay_buffer_config: ReplayBufferServiceConfig,
+    ) -> ReplayBufferController:
+        """
+        Creates the buffer controller selected by the replay buffer configuration.
+        :param replay_buffer_config: ReplayBufferServiceConfig
+        :return: ReplayBufferController
+        """
+        if replay_buffer_config.backend == ReplayBufferBackend.LOCAL:
+            return LocalReplayBufferController(
+                capacity=replay_buffer_config.capacity,
+                spill_path=replay_buffer_config.spill_path,
+            )
+        if replay_buffer_config.backend == ReplayBufferBackend.SPOOLED:
+            return SpooledReplayBufferController(
+                replay_buffer_config.replay_buffer_host,
+                replay_buffer_config.replay_buffer_port,
+                spool_path=replay_buffer_config.spool_path,
+                batch_size=replay_buffer_config.batch_size,
+                flush_interval=replay_buffer_config.flush_interval,
+                segment_size=replay_buffer_config.segment_size,
+                sync_interval=replay_buffer_config.sync_interval,
+                wire_format=replay_buffer_config.wire_format,
+                request_timeout=replay_buffer_config.request_timeout,
+            )
+        return BatchedReplayBufferController(
+            replay_buffer_config.replay_buffer_host,
+            replay_buffer_config.replay_buffer_port,
+            batch_size=replay_buffer_config.batch_size,
+            flush_interval=replay_buffer_config.flush_interval,
+            queue_size=replay_buffer_config.queue_size,
+            backpressure=replay_buffer_config.backpressure,
+            wire_format=replay_buffer_config.wire_format,
+            request_timeout=replay_buffer_config.request_timeout,
+        )
+
     @staticmethod
     def __create_predator_prey(
         init: bool,
@@ -108,14 +277,87 @@ class EnvironmentControllerFactory:
                 agent_controller.agent
                 for agent_controller in predator_controllers + prey_controllers
             ],
+            cell_size=env_config.vd,
         )
         return EnvironmentController(
             environment=environment,
             agent_controllers=predator_controllers + prey_controllers,
             buffer_controller=buffer_controller,
             policy_controllers=[prey_policy_controller, pred_policy_controller],
-            env_controller_utils=EnvironmentControllerUtils(
+            telemetry=EnvironmentControllerFactory.__telemetry(init, env_config),
+            sensor=AgentSensorFactory.sensor_from_config(env_config),
+            termination_controller=TerminationController(
+                r=env_config.r,
+                life=env_config.life,
+                agent_types=[agent.agent_type.value for agent in environment.agents],
+            ),
+        )
+
+    @staticmethod
+    def __create_predator_prey_vector(
+        init: bool,
+        env_config: EnvironmentConfig,
+        prey_policy_controller: AgentPolicyController,
+        pred_policy_controller: AgentPolicyController,
+        buffer_controller: ReplayBufferController,
+        world_buffer_controllers: List[ReplayBufferController],
+    ):
+        if env_config.num_workers > 0:
+            # The worlds live in the workers, only the layout of a world is needed here
+            agent_controllers = AgentControllerFactory.predator_controllers_from_config(
+                env_config, pred_policy_controller
+            ) + AgentControllerFactory.prey_controllers_from_config(
+                env_config, prey_policy_controller
+            )
+            return PoolEnvironmentController(
+                env_config=env_config,
+                agents_controller=VectorAgentsController(
+                    agent_controllers=agent_controllers,
+                    num_worlds=env_config.num_envs * env_config.num_workers,
+                    buffer_controller=buffer_controller,
+                    world_buffer_controllers=world_buffer_controllers,
+                    policy_controllers=[prey_policy_controller, pred_policy_controller],
+                    telemetry=EnvironmentControllerFactory.__telemetry(
+                        init, env_config
+                    ),
+                ),
+                num_workers=env_config.num_workers,
+            )
+        world_controller, agent_controllers = (
+            VectorWorldControllerFactory.worlds_from_config(
+                env_config,
+                env_config.num_envs,
+                prey_policy_controller=prey_policy_controller,
+                pred_policy_controller=pred_policy_controller,
+            )
+        )
+        return VectorEnvironmentController(
+            world_controller=world_controller,
+            agents_controller=VectorAgentsController(
+                agent_controllers=agent_controllers,
+                num_worlds=env_config.num_envs,
+                buffer_controller=buffer_controller,
+                world_buffer_controllers=world_buffer_controllers,
+                policy_controllers=[prey_policy_controller, pred_policy_controller],
+                telemetry=EnvironmentControllerFactory.__telemetry(init, env_config),
+            ),
+        )
+
+    @staticmethod
+    def __telemetry(init: bool, env_config: EnvironmentConfig) -> TelemetryController:
+        """
+        Creates the telemetry selected by the environment configuration.
+        :param init: Should be True if it's the first run
+        :param env_config: EnvironmentConfig
+        :return: TelemetryController
+        """
+        return TelemetryController(
+            EnvironmentControllerUtils(
                 init=init,
                 project_root_path=env_config.project_root_path,
-            ),
+                data_format=env_config.experiment_data_format,
+            )
+            if env_config.save_experiment_data
+            else None,
+            decimation=env_config.telemetry_decimation,
         )
@@ -0,0 +1,83 @@
+import numpy as np
+
+from src.main.controllers.environment.pool.shared_step_buffer import SharedStepBuffer
+from src.main.controllers.environment.vector.vector_world_controller_factory import (
+    VectorWorldControllerFactory,
+)
+from src.main.model.config.config import EnvironmentConfig
+
+
+class EnvironmentWorker:
+    """
+    Worker process of a PoolEnvironmentController, running the environment side of
+    num_envs worlds: it senses, steps and rewards them and writes the outcome into
+    its rows of the SharedStepBuffer, then waits for the actions of the next step.
+    """
+
+    @staticmethod
+    def run(
+        env_config: EnvironmentConfig,
+        worker: int,
+        num_workers: int,
+        buffer_name: str,
+        depth: int,
+        seed: int,
+        states_ready,
+        actions_ready,
+        stopped,
+    ):
+        """
+        Runs the worker until stopped.
+        :param env_config: EnvironmentConfig
+        :param worker: index of the worker
+        :param num_workers: number of workers
+        :param buffer_name: name of the SharedStepBuffer memory block
+        :param depth: number of slots of the SharedStepBuffer
+        :param seed: seed of the worker's random generator
+        :param states_ready: semaphore released once the states of a step are written
+        :param actions_ready: semaphore acquired before reading the actions of a step
+        :param stopped: event set when the worker has to stop
+        """
+        np.random.seed(seed)
+        world_controller, _ = VectorWorldControllerFactory.worlds_from_config(
+            env_config, env_config.num_envs
+        )
+        num_worlds, size = world_controller.num_worlds, world_controller.size
+        buffer = SharedStepBuffer(
+            num_workers * num_worlds,
+            size,
+            env_config.num_states,
+            depth=depth,
+            name=buffer_name,
+        )
+        worlds = slice(worker * num_worlds, (worker + 1) * num_worlds)
+        rows = slice(worlds.start * size, worlds.stop * size)
+        try:
+            slot = 0
+            ended = world_controller.auto_reset()
+            buffer.resets[slot, worlds] = np.bincount(ended, minlength=num_worlds)
+            buffer.states[slot, rows] = world_controller.states()
+            states_ready.release()
+            while True:
+                actions_ready.acquire()
+                if stopped.is_set():
+                    break
+                next_slot = (slot + 1) % depth
+                next_states, rewards = world_controller.step(buffer.actions[slot, rows])
+                buffer.next_states[next_slot, rows] = next_states
+                buffer.rewards[next_slot, worlds] = rewards
+                buffer.positions[next_slot, worlds] = (
+                    world_controller.environment.state.positions()
+                )
+                ended = world_controller.auto_reset()
+                buffer.resets[next_slot, worlds] = np.bincount(
+                    ended, minlength=num_worlds
+                )
+                # The next states of the worlds just reset are sensed again
+                buffer.states[next_slot, rows] = (
+                    world_controller.states() if ended else next_states
+                )
+                states_ready.release()
+                slot = next_slot
+        finally:
+            buffer.close()
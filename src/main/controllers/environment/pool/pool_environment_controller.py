@@ -0,0 +1,177 @@
+import multiprocessing
+from typing import List, Optional
+
+import numpy as np
+
+from src.main.controllers.environment.pool.environment_worker import (
+    EnvironmentWorker,
+)
+from src.main.controllers.environment.pool.shared_step_buffer import SharedStepBuffer
+from src.main.controllers.environment.vector.vector_agents_controller import (
+    VectorAgentsController,
+)
+from src.main.model.config.config import EnvironmentConfig
+
+
+class PoolEnvironmentController:
+    """
+    Runs the worlds of M worker processes in lockstep, each worker sensing and
+    stepping num_envs worlds on its own core, while this process runs the batched
+    inference over the agents of all the worlds and records their transitions.
+    Observations, actions and rewards are exchanged through a SharedStepBuffer,
+    and only semaphores cross the process boundary.
+
+    The workers step the actions of step t + 1 while the transitions of step t are
+    being recorded, which is why the ring has (at least) three slots: the one being
+    recorded, the one being acted upon and the one being written by the workers.
+    """
+
+    def __init__(
+        self,
+        env_config: EnvironmentConfig,
+        agents_controller: VectorAgentsController,
+        num_workers: int,
+        depth: int = 3,
+        timeout: float = 1.0,
+    ):
+        """
+        :param env_config: EnvironmentConfig, giving the num_envs worlds of each worker
+        :param agents_controller: agent side of the worlds of all the workers
+        :param num_workers: number of worker processes
+        :param depth: number of slots of the SharedStepBuffer, at least 3
+        :param timeout: interval between the checks that the workers are alive while
+            waiting for them, in seconds
+        """
+        if depth < 3:
+            raise ValueError("The step buffer needs at least 3 slots")
+        self.timeout = timeout
+        self.__agents_controller = agents_controller
+        self.__buffer = SharedStepBuffer(
+            num_workers * env_config.num_envs,
+            agents_controller.size,
+            env_config.num_states,
+            depth=depth,
+        )
+        # Spawned rather than forked, since the policies may run threads
+        context = multiprocessing.get_context("spawn")
+        self.__states_ready = [context.Semaphore(0) for _ in range(num_workers)]
+        self.__actions_ready = [context.Semaphore(0) for _ in range(num_workers)]
+        self.__stopped = context.Event()
+        # Workers are seeded from the global random generator, for reproducibility
+        seeds = np.random.randint(2**31 - 1, size=num_workers).tolist()
+        self.__workers = [
+            context.Process(
+                target=EnvironmentWorker.run,
+                args=(
+                    env_config,
+                    worker,
+                    num_workers,
+                    self.__buffer.name,
+                    depth,
+                    seeds[worker],
+                    self.__states_ready[worker],
+                    self.__actions_ready[worker],
+                    self.__stopped,
+                ),
+                daemon=True,
+            )
+            for worker in range(num_workers)
+        ]
+        for worker in self.__workers:
+            worker.start()
+        self.__slot: Optional[int] = None
+
+    def train(self, num_steps: Optional[int] = None):
+        """
+        Steps the worlds of all the workers, recording their transitions to the
+        replay buffer.
+        :param num_steps: number of steps, forever if None
+        :return:
+        """
+        self.__run(num_steps, training=True)
+
+    def simulate(self, num_steps: Optional[int] = None):
+        """
+        Steps the worlds of all the workers without recording their transitions.
+        :param num_steps: number of steps, forever if None
+        :return:
+        """
+        self.__run(num_steps, training=False)
+
+    def stop(self):
+        """
+        Stops the workers and the policy controllers, closes the buffer controller and
+        the experiment files and destroys the shared memory block.
+        :return:
+        """
+        self.__stopped.set()
+        for actions_ready in self.__actions_ready:
+            actions_ready.release()
+        for worker in self.__workers:
+            worker.join(timeout=10 * self.timeout)
+            if worker.is_alive():
+                worker.terminate()
+        self.__agents_controller.stop()
+        self.__buffer.unlink()
+
+    def __run(self, num_steps: Optional[int], training: bool):
+        """
+        Steps the worlds in lockstep, keeping the actions of one step in flight.
+        :param num_steps: number of steps, forever if None
+        :param training: whether to record the transitions to the replay buffer
+        """
+        buffer, agents = self.__buffer, self.__agents_controller
+        if self.__slot is None:
+            self.__slot = 0
+            self.__wait_states()
+            agents.end_episodes(self.__ended(self.__slot), training)
+            self.__act(self.__slot)
+        step = 0
+        while num_steps is None or step < num_steps:
+            slot, next_slot = self.__slot, (self.__slot + 1) % buffer.depth
+            self.__wait_states()
+            # The workers step the next actions while this step is being recorded
+            self.__act(next_slot)
+            agents.record(
+                buffer.states[slot],
+                buffer.actions[slot],
+                buffer.rewards[next_slot],
+                buffer.next_states[next_slot],
+                buffer.positions[next_slot],
+                training,
+            )
+            agents.end_episodes(self.__ended(next_slot), training)
+            self.__slot = next_slot
+            step += 1
+
+    def __act(self, slot: int):
+        """
+        Writes the actions taken from the states of the given slot and hands them
+        over to the workers.
+        :param slot: slot of the ring
+        """
+        self.__agents_controller.actions(
+            self.__buffer.states[slot], out=self.__buffer.actions[slot]
+        )
+        for actions_ready in self.__actions_ready:
+            actions_ready.release()
+
+    def __wait_states(self):
+        """
+        Waits until every worker wrote the states of the step.
+        """
+        for worker, states_ready in zip(self.__workers, self.__states_ready):
+            while not states_ready.acquire(timeout=self.timeout):
+                if not worker.is_alive():
+                    raise RuntimeError(
+                        f"Environment worker {worker.name} exited with code {worker.exitcode}"
+                    )
+
+    def __ended(self, slot: int) -> List[int]:
+        """
+        Gets the worlds reset after the step of the given slot.
+        :param slot: slot of the ring
+        :return: worlds whose episode ended, a world reset more than once is repeated
+        """
+        resets = self.__buffer.resets[slot]
+        return np.repeat(np.arange(len(resets)), resets).tolist()
@@ -0,0 +1,90 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+
+
+class SharedStepBuffer:
+    """
+    Ring of step slots in shared memory, through which the environment workers and
+    the central process exchange observations, actions and rewards without pickling.
+    Each worker owns a contiguous range of worlds, hence of rows, so that the central
+    process sees the observations of all the workers as a single matrix.
+
+    A slot holds, for every world:
+
+    - states: (K * N, num_states) observations to act on
+    - next_states: (K * N, num_states) observations right after the step, which
+      differ from states only for the worlds reset after the step
+    - actions: (K * N, 2) actions taken from states
+    - rewards: (K, N) rewards of the step
+    - positions: (K, N, 2) coordinates after the step
+    - resets: (K,) number of times each world was reset after the step
+    """
+
+    ALIGNMENT = 64
+
+    def __init__(
+        self,
+        num_worlds: int,
+        size: int,
+        num_states: int,
+        depth: int = 3,
+        name: Optional[str] = None,
+    ):
+        """
+        :param num_worlds: number of worlds of all the workers
+        :param size: number of agents of each world
+        :param num_states: size of the observations
+        :param depth: number of slots of the ring
+        :param name: name of the shared memory block to attach to, a new block
+            is created if None
+        """
+        self.num_worlds, self.size, self.num_states, self.depth = (
+            num_worlds,
+            size,
+            num_states,
+            depth,
+        )
+        rows = num_worlds * size
+        fields = [
+            ("states", np.float32, (depth, rows, num_states)),
+            ("next_states", np.float32, (depth, rows, num_states)),
+            ("actions", np.float64, (depth, rows, 2)),
+            ("rewards", np.float64, (depth, num_worlds, size)),
+            ("positions", np.float32, (depth, num_worlds, size, 2)),
+            ("resets", np.int32, (depth, num_worlds)),
+        ]
+        offsets, nbytes = [], 0
+        for _, dtype, shape in fields:
+            offsets.append(nbytes)
+            field_size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            nbytes += -(-field_size // self.ALIGNMENT) * self.ALIGNMENT
+        self.memory = SharedMemory(name=name, create=name is None, size=nbytes)
+        self.__fields = [field for field, _, _ in fields]
+        for (field, dtype, shape), offset in zip(fields, offsets):
+            setattr(
+                self,
+                field,
+                np.ndarray(shape, dtype=dtype, buffer=self.memory.buf, offset=offset),
+            )
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def close(self):
+        """
+        Detaches from the shared memory block, dropping the arrays viewing it.
+        """
+        for field in self.__fields:
+            setattr(self, field, None)
+        self.memory.close()
+
+    def unlink(self):
+        """
+        Detaches from the shared memory block and destroys it, to be called by its
+        creator once all the workers detached.
+        """
+        self.close()
+        self.memory.unlink()
@@ -0,0 +1,46 @@
+from typing import Union
+
+import numpy as np
+
+from src.main.model.environment.environment import Environment
+from src.main.model.environment.vector_environment import VectorEnvironment
+
+
+class StepController:
+    """
+    Vectorized step of the whole population, updating the environment arrays
+    in place through preallocated buffers.
+    """
+
+    def __init__(
+        self, environment: Union[Environment, VectorEnvironment], t_step: int = 1
+    ):
+        self.environment = environment
+        self.t_step = t_step
+        shape = environment.state.x.shape
+        self.__speed = np.empty(shape)
+        self.__trig = np.empty(shape)
+        self.__displacement = np.empty(shape, dtype=np.float32)
+
+    def step(self, actions: np.ndarray):
+        r"""
+        Moves every agent of one step given its (v, turn) action, with
+
+            .. math:: v_x = |v| \cos{turn}, v_y = |v| \sin{turn}
+
+        and the new position clipped inside the environment.
+        :param actions: (N, 2) array of actions, in the order of the environment agents,
+            or (K, N, 2) for an environment of K stacked worlds
+        """
+        state = self.environment.state
+        np.abs(actions[..., 0], out=self.__speed)
+        for trig, velocity, position, dim in [
+            (np.cos, state.vx, state.x, self.environment.x_dim),
+            (np.sin, state.vy, state.y, self.environment.y_dim),
+        ]:
+            trig(actions[..., 1], out=self.__trig)
+            np.multiply(self.__speed, self.__trig, out=velocity)
+            np.multiply(velocity, self.t_step, out=self.__displacement)
+            np.add(position, self.__displacement, out=position)
+            np.clip(position, 0, dim - 1, out=position)
+        self.environment.update_positions()
@@ -0,0 +1,113 @@
+import logging
+import time
+from queue import Full, Queue
+from threading import Thread
+from typing import Optional
+
+import numpy as np
+
+from src.main.controllers.environment.utils.environment_controller_utils import (
+    EnvironmentControllerUtils,
+)
+
+
+class TelemetryController:
+    """
+    Telemetry stage of the environment loop, which only hands over array snapshots:
+    one every decimation steps is logged and saved on a background thread, together
+    with a summary at the end of each episode. Snapshots are dropped rather than
+    blocking the loop when the background thread falls behind, and a snapshot that
+    fails to be written is logged and skipped, without stopping the thread.
+    """
+
+    def __init__(
+        self,
+        env_controller_utils: Optional[EnvironmentControllerUtils],
+        decimation: int = 1,
+        queue_size: int = 1024,
+    ):
+        self.decimation = decimation
+        self.dropped = 0
+        self.failed = 0
+        self.__utils = env_controller_utils
+        self.__queue = Queue(maxsize=queue_size)
+        self.__step = 0
+        self.__reward_sum = 0.0
+        self.__writer = Thread(target=self.__write_loop, daemon=True)
+        self.__writer.start()
+
+    def record(self, rewards: np.ndarray, positions: np.ndarray):
+        """
+        Records the snapshot of a step, without blocking.
+        :param rewards: (N,) array of the agents' rewards, not modified afterwards
+        :param positions: (N, 2) array of the agents' coordinates, not modified afterwards
+        """
+        self.__reward_sum += float(np.mean(rewards))
+        if self.__step % self.decimation == 0:
+            self.__put(("step", time.time(), rewards, positions))
+        self.__step += 1
+
+    def end_episode(self):
+        """
+        Records the summary of the episode.
+        """
+        if self.__step > 0:
+            self.__put(("episode", self.__step, self.__reward_sum / self.__step))
+
+    def reset(self):
+        """
+        Starts a new episode.
+        """
+        self.__step = 0
+        self.__reward_sum = 0.0
+        self.__put(("reset", time.time()))
+
+    def close(self, timeout: float = 10.0):
+        """
+        Writes the pending snapshots, then closes the experiment files. The files are
+        left open if the background thread is still writing after the timeout.
+        :param timeout: maximum time to wait for the background thread, in seconds
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            self.__queue.put(None, timeout=timeout)
+        except Full:
+            logging.warning("Telemetry queue still full, pending snapshots not written")
+        self.__writer.join(max(deadline - time.monotonic(), 0))
+        if self.__writer.is_alive():
+            logging.warning("Telemetry writer still busy, experiment files left open")
+            return
+        if self.__utils is not None:
+            self.__utils.close()
+
+    def __put(self, item):
+        try:
+            self.__queue.put_nowait(item)
+        except Full:
+            self.dropped += 1
+
+    def __write_loop(self):
+        while (item := self.__queue.get()) is not None:
+            try:
+                self.__write(item)
+            except Exception:
+                self.failed += 1
+                logging.exception(f"Failed to write the telemetry {item[0]}")
+
+    def __write(self, item):
+        """
+        Logs and saves a queued item.
+        :param item: step snapshot, episode summary or reset
+        """
+        if item[0] == "step":
+            _, timestamp, rewards, positions = item
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info([tuple(p) for p in positions.tolist()])
+                logging.info(f"Avg reward: {np.average(rewards)}")
+            if self.__utils is not None:
+                self.__utils.save_data(rewards.tolist(), positions.tolist(), timestamp)
+        elif item[0] == "episode":
+            _, steps, avg_reward = item
+            logging.info(f"Episode of {steps} steps, avg reward: {avg_reward}")
+        elif item[0] == "reset" and self.__utils is not None:
+            self.__utils.reset(item[1])
@@ -0,0 +1,75 @@
+from typing import Optional
+
+import numpy as np
+
+from src.main.model.environment.agents.agent_type import AgentType
+from src.main.model.environment.termination import Termination
+
+
+class TerminationController:
+    def __init__(
+        self,
+        r: float,
+        life: int,
+        agent_types: np.ndarray,
+        num_worlds: Optional[int] = None,
+    ):
+        self.r = r
+        self.life = life
+        agent_types = np.asarray(agent_types)
+        self.__preys = agent_types == AgentType.PREY.value
+        self.__predators = agent_types == AgentType.PREDATOR.value
+        # The lives of stacked worlds have the world as the leading axis
+        shape = np.count_nonzero(self.__predators)
+        if num_worlds is not None:
+            shape = (num_worlds, shape)
+        self.predator_lives = np.full(shape, life)
+
+    def reset(self, worlds: Optional[np.ndarray] = None):
+        """
+        Restores the life of every predator.
+        :param worlds: optional indices of the stacked worlds to restore, all if None
+        """
+        if worlds is None:
+            self.predator_lives[:] = self.life
+        else:
+            self.predator_lives[worlds] = self.life
+
+    def check(
+        self, positions: np.ndarray, worlds: Optional[np.ndarray] = None
+    ) -> Termination:
+        """
+        Checks the termination of the whole population in a single pass:
+        a prey is caught when its box overlaps the box of any predator,
+        that is when their centers are closer than 2r on both axes,
+        while a predator is done when its life reaches zero.
+        The episode is over as soon as a prey is caught or a predator is done.
+        Stacked worlds are checked at once, each with its own outcome.
+        :param positions: (N, 2) array with the agents' coordinates,
+            or (K, N, 2) for stacked worlds
+        :param worlds: optional indices of the stacked worlds whose positions
+            are given, all if None
+        :return: Termination, whose fields have the world as the leading axis
+            for stacked worlds
+        """
+        positions = np.asarray(positions)
+        # (preys x predators x 2) distances on each axis
+        diff = (
+            positions[..., self.__preys, np.newaxis, :]
+            - positions[..., np.newaxis, self.__predators, :]
+        )
+        overlaps = np.all(np.abs(diff) < 2 * self.r, axis=-1)
+        caught = np.any(overlaps, axis=-1)
+
+        if worlds is None:
+            self.predator_lives -= 1
+            predator_lives = self.predator_lives.copy()
+        else:
+            self.predator_lives[worlds] -= 1
+            predator_lives = self.predator_lives[worlds]
+        done = np.any(caught, axis=-1) | np.any(predator_lives == 0, axis=-1)
+        return Termination(
+            caught=caught,
+            predator_lives=predator_lives,
+            done=bool(done) if done.ndim == 0 else done,
+        )
@@ -0,0 +1,80 @@
+import os
+import time
+from typing import List, Optional, Sequence
+
+
+class CsvWriter:
+    """
+    Append-only CSV writer keeping the file open and writing only the new rows,
+    in the same layout of pandas DataFrame.to_csv: an unnamed index column, numbered
+    from zero across the whole file, followed by the named columns.
+    Rows are buffered and flushed to disk at most every flush_interval seconds.
+
+    An existing file is resumed in constant time, reading only its header and its
+    last row, whose index is continued.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.index = 0
+        self.__columns: Optional[List[str]] = None
+        self.__file = None
+        self.__last_flush = time.monotonic()
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.__resume()
+
+    def append(self, columns: List[str], values: Sequence[float]):
+        """
+        Appends a row, writing the header first if the file is new.
+        :param columns: column names, which must stay the same for the whole file
+        :param values: row values
+        """
+        if self.__columns is None:
+            self.__columns = list(columns)
+            self.__file = open(self.path, "a", buffering=1 << 16)
+            self.__file.write(f",{','.join(self.__columns)}\n")
+        elif columns != self.__columns:
+            raise ValueError(f"Columns of {self.path} cannot change while writing")
+        elif self.__file is None:
+            self.__file = open(self.path, "a", buffering=1 << 16)
+        self.__file.write(f"{self.index},{','.join(repr(float(v)) for v in values)}\n")
+        self.index += 1
+        if time.monotonic() - self.__last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.__file is not None:
+            self.__file.flush()
+        self.__last_flush = time.monotonic()
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __resume(self):
+        """
+        Reads the column layout from the header and the next index from the last
+        complete row, dropping a row truncated by a crash.
+        """
+        with open(self.path, "rb+") as f:
+            self.__columns = f.readline().decode().rstrip("\n").split(",")[1:]
+            header_end = f.tell()
+            size = f.seek(0, os.SEEK_END)
+            # Walk back in blocks until the last two newlines are found
+            block, tail = 4096, b""
+            position = size
+            while position > header_end and tail.count(b"\n") < 2:
+                step = min(block, position - header_end)
+                position -= step
+                f.seek(position)
+                tail = f.read(step) + tail
+            if not tail.endswith(b"\n"):
+                # Truncated last row
+                complete = tail.rfind(b"\n") + 1
+                f.truncate(position + complete)
+                tail = tail[:complete]
+            rows = tail.rstrip(b"\n").split(b"\n")
+            if rows and rows[-1]:
+                self.index = int(rows[-1].split(b",", 1)[0]) + 1
@@ -1,50 +1,60 @@
 import os
+import shutil
 import time
 
-import pandas as pd
+from src.main.controllers.environment.utils.csv_writer import CsvWriter
+from src.main.controllers.environment.utils.trajectory_store import (
+    TrajectoryStoreWriter,
+)
+from src.main.model.config.config import ExperimentDataFormat
 
 
 class EnvironmentControllerUtils:
-    def __init__(self, init: bool, project_root_path: str):
+    def __init__(
+        self,
+        init: bool,
+        project_root_path: str,
+        data_format: ExperimentDataFormat = ExperimentDataFormat.CSV,
+        flush_interval: float = 1.0,
+    ):
+        self.__data_format = data_format
         self.__rewards_file, self.__coordinates_file = self.__experiment_files_path(
             project_root_path
         )
-        self.__elapsed_times, self.__rewards, self.__coordinates = (
-            self.__setup_experiment_files(init)
+        self.__trajectories_dir = os.path.join(
+            project_root_path, "src", "main", "resources", "trajectories"
         )
+        self.__setup_experiment_files(init)
+        if data_format == ExperimentDataFormat.NPY:
+            self.__trajectory_writer = TrajectoryStoreWriter(
+                self.__trajectories_dir, flush_interval=flush_interval
+            )
+        else:
+            self.__rewards_writer = CsvWriter(self.__rewards_file, flush_interval)
+            self.__coordinates_writer = CsvWriter(
+                self.__coordinates_file, flush_interval
+            )
+        self.__elapsed_time = 0.0
         self.__t_start = time.time()
 
     def __setup_experiment_files(self, init: bool):
-        if os.path.exists(self.__rewards_file) and os.path.exists(
-            self.__coordinates_file
-        ):
-            if init:
-                os.remove(self.__rewards_file)
-                os.remove(self.__coordinates_file)
-                return [], [], []
-
-            df_rewards = pd.read_csv(self.__rewards_file)
-            df_coordinates = pd.read_csv(self.__coordinates_file)
-            elapsed_times = [float(et) for et in df_coordinates["elapsed_time"]]
-            num_agents = len(
-                [column for column in df_coordinates.columns if column.startswith("x")]
-            )
-
-            rewards = []
-            for index, row in df_rewards.iterrows():
-                row_rewards = []
-                for i in range(num_agents):
-                    row_rewards.append(row[f"r_{i}"])
-                rewards.append(row_rewards)
+        """
+        Removes the experiment files of previous runs on the first run,
+        otherwise new rows are appended to them.
+        :param init: True if it's the first run
+        """
+        if init:
+            for path in [self.__rewards_file, self.__coordinates_file]:
+                if os.path.exists(path):
+                    os.remove(path)
+            shutil.rmtree(self.__trajectories_dir, ignore_errors=True)
 
-            coords = []
-            for index, row in df_coordinates.iterrows():
-                row_coords = []
-                for i in range(num_agents):
-                    row_coords.append((row[f"x_{i}"], row[f"y_{i}"]))
-                coords.append(row_coords)
-            return elapsed_times, rewards, coords
-        return [], [], []
+    def reset(self, timestamp: float = None):
+        """
+        Starts a new episode, restarting the elapsed time from zero.
+        :param timestamp: optional time the episode started at, now if None
+        """
+        self.__t_start = time.time() if timestamp is None else timestamp
 
     @staticmethod
     def __experiment_files_path(project_root_path):
@@ -54,33 +64,58 @@ class EnvironmentControllerUtils:
             os.path.join(common_path, f"positions.csv"),
         )
 
-    def save_data(self, rewards, coordinates):
-        self.__elapsed_times.append(time.time() - self.__t_start)
-        self.save_rewards(rewards)
-        self.save_coordinates(coordinates)
+    def save_data(self, rewards, coordinates, timestamp: float = None):
+        """
+        Saves the rewards and coordinates of a step.
+        :param rewards: agents' rewards
+        :param coordinates: agents' (x, y) coordinates
+        :param timestamp: optional time of the step, now if None
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self.__elapsed_time = timestamp - self.__t_start
+        if self.__data_format == ExperimentDataFormat.NPY:
+            self.save_trajectory(rewards, coordinates)
+        else:
+            self.save_rewards(rewards)
+            self.save_coordinates(coordinates)
+
+    def save_trajectory(self, rewards, coordinates):
+        """
+        Saves a single row of elapsed time, coordinates and rewards
+        in the trajectory store.
+        :param rewards: agents' rewards
+        :param coordinates: agents' (x, y) coordinates
+        """
+        columns = ["elapsed_time"]
+        values = [self.__elapsed_time]
+        for i, (x, y) in enumerate(coordinates):
+            columns += [f"x_{i}", f"y_{i}"]
+            values += [x, y]
+        columns += [f"r_{i}" for i in range(len(rewards))]
+        values += list(rewards)
+        self.__trajectory_writer.append(columns, values)
 
     def save_rewards(self, rewards):
         if len(rewards) > 0:
-            self.__rewards.append(rewards)
-
-            rewards_dict = {"elapsed_time": self.__elapsed_times}
-            for i in range(len(self.__rewards[0])):
-                curr_rewards = [reward[i] for reward in self.__rewards]
-                rewards_dict.update({f"r_{i}": curr_rewards})
-
-            df_rewards = pd.DataFrame(rewards_dict)
-            df_rewards.to_csv(self.__rewards_file)
+            self.__rewards_writer.append(
+                ["elapsed_time"] + [f"r_{i}" for i in range(len(rewards))],
+                [self.__elapsed_time, *rewards],
+            )
 
     def save_coordinates(self, coordinates):
-        positions_dict = {"elapsed_time": self.__elapsed_times}
-        self.__coordinates.append(coordinates)
-        for i in range(len(self.__coordinates[0])):
-            curr_coords = [coord[i] for coord in self.__coordinates]
-            positions_dict.update(
-                {
-                    f"x_{i}": [c[0] for c in curr_coords],
-                    f"y_{i}": [c[1] for c in curr_coords],
-                }
-            )
-        df_positions = pd.DataFrame(positions_dict)
-        df_positions.to_csv(self.__coordinates_file)
+        columns = ["elapsed_time"]
+        values = [self.__elapsed_time]
+        for i, (x, y) in enumerate(coordinates):
+            columns += [f"x_{i}", f"y_{i}"]
+            values += [x, y]
+        self.__coordinates_writer.append(columns, values)
+
+    def close(self):
+        """
+        Flushes and closes the experiment files.
+        """
+        if self.__data_format == ExperimentDataFormat.NPY:
+            self.__trajectory_writer.close()
+        else:
+            self.__rewards_writer.close()
+            self.__coordinates_writer.close()
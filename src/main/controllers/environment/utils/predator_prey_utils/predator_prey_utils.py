@@ -4,6 +4,7 @@ from multiprocessing import Pool
 from src.main.controllers.agents.policy.agent_policy_controller_factory import (
     AgentPolicyControllerFactory,
 )
+from src.main.model.config.config import PolicyEngine
 
 
 class PredatorPreyUtils:
@@ -15,19 +16,25 @@ class PredatorPreyUtils:
         f()
 
     @staticmethod
-    def initialize_policy_receivers(project_root_path: str):
+    def initialize_policy_receivers(
+        project_root_path: str, num_states: int, policy_engine: PolicyEngine
+    ):
         """
         Initialize policy receivers of both predator and prey.
         """
         partial_prey_policy_controller = partial(
             AgentPolicyControllerFactory(
-                project_root_path=project_root_path
+                project_root_path=project_root_path,
+                num_states=num_states,
+                policy_engine=policy_engine,
             ).prey_policy_controller_learning,
             init=True,
         )
         partial_pred_policy_controller = partial(
             AgentPolicyControllerFactory(
-                project_root_path=project_root_path
+                project_root_path=project_root_path,
+                num_states=num_states,
+                policy_engine=policy_engine,
             ).predator_policy_controller_learning,
             init=True,
         )
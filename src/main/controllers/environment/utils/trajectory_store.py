@@ -0,0 +1,185 @@
+import json
+import os
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+INDEX_FILE = "index.json"
+
+
+class TrajectoryStoreWriter:
+    """
+    Columnar store of the experiment data, writing fixed-width float32 rows
+    (e.g. elapsed_time, x_i, y_i, r_i) into memory-mapped .npy chunks of chunk_size
+    rows, so that the store grows by chunk rather than by row.
+    A small JSON index lists the columns, the chunks and the number of rows written.
+    """
+
+    def __init__(
+        self, directory: str, chunk_size: int = 65536, flush_interval: float = 1.0
+    ):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+        self.columns: Optional[List[str]] = None
+        self.rows = 0
+        self.__chunks: List[str] = []
+        self.__chunk = None
+        self.__last_flush = time.monotonic()
+        index_path = os.path.join(directory, INDEX_FILE)
+        if os.path.exists(index_path):
+            # Resume writing after the last indexed row
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+            self.columns, self.rows = index["columns"], index["rows"]
+            self.chunk_size, self.__chunks = index["chunk_size"], index["chunks"]
+            if self.rows % self.chunk_size:
+                self.__chunk = np.lib.format.open_memmap(
+                    os.path.join(directory, self.__chunks[-1]), mode="r+"
+                )
+
+    def append(self, columns: List[str], values: Sequence[float]):
+        """
+        Appends a row, allocating a new chunk when the current one is full.
+        :param columns: column names, which must stay the same for the whole store
+        :param values: row values
+        """
+        if self.columns is None:
+            self.columns = list(columns)
+        elif columns != self.columns:
+            raise ValueError(f"Columns of {self.directory} cannot change")
+        if self.__chunk is None:
+            self.__new_chunk()
+        self.__chunk[self.rows % self.chunk_size] = values
+        self.rows += 1
+        if self.rows % self.chunk_size == 0:
+            self.__chunk.flush()
+            self.__chunk = None
+        if time.monotonic() - self.__last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Flushes the current chunk and then writes the index, which never refers
+        to rows not on disk.
+        """
+        if self.__chunk is not None:
+            self.__chunk.flush()
+        if self.columns is not None:
+            tmp_path = os.path.join(self.directory, f"{INDEX_FILE}.tmp")
+            with open(tmp_path, "w") as index_file:
+                json.dump(
+                    {
+                        "columns": self.columns,
+                        "chunk_size": self.chunk_size,
+                        "rows": self.rows,
+                        "chunks": self.__chunks,
+                    },
+                    index_file,
+                )
+            os.replace(tmp_path, os.path.join(self.directory, INDEX_FILE))
+        self.__last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.__chunk = None
+
+    def __new_chunk(self):
+        name = f"chunk_{len(self.__chunks):06d}.npy"
+        self.__chunk = np.lib.format.open_memmap(
+            os.path.join(self.directory, name),
+            mode="w+",
+            dtype=np.float32,
+            shape=(self.chunk_size, len(self.columns)),
+        )
+        self.__chunks.append(name)
+
+
+class TrajectoryStoreReader:
+    """
+    Reader of a TrajectoryStoreWriter directory, memory-mapping only the chunks
+    overlapping the requested rows.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as index_file:
+            index = json.load(index_file)
+        self.columns: List[str] = index["columns"]
+        self.rows: int = index["rows"]
+        self.chunk_size: int = index["chunk_size"]
+        self.__chunks: List[str] = index["chunks"]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def read(
+        self, start: int = 0, stop: Optional[int] = None, columns: List[str] = None
+    ) -> np.ndarray:
+        """
+        Reads a window of rows.
+        :param start: first row
+        :param stop: row after the last one, the end of the store if None
+        :param columns: column names, all of them if None
+        :return: (rows, columns) float32 array
+        """
+        start, stop, _ = slice(start, stop).indices(self.rows)
+        stop = max(start, stop)
+        selected = (
+            slice(None)
+            if columns is None
+            else [self.columns.index(column) for column in columns]
+        )
+        parts = []
+        for chunk in range(start // self.chunk_size, -(-stop // self.chunk_size)):
+            offset = chunk * self.chunk_size
+            data = np.load(
+                os.path.join(self.directory, self.__chunks[chunk]), mmap_mode="r"
+            )
+            parts.append(
+                data[max(start - offset, 0) : min(stop - offset, self.chunk_size)][
+                    :, selected
+                ]
+            )
+        width = len(self.columns) if columns is None else len(columns)
+        return (
+            np.concatenate(parts) if parts else np.empty((0, width), dtype=np.float32)
+        )
+
+    def agent(self, i: int, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Reads the elapsed time, coordinates and reward of a single agent.
+        :param i: agent index
+        :param start: first row
+        :param stop: row after the last one, the end of the store if None
+        :return: (rows, 4) array of elapsed_time, x_i, y_i, r_i
+        """
+        return self.read(start, stop, ["elapsed_time", f"x_{i}", f"y_{i}", f"r_{i}"])
+
+    def to_csv(self, rewards_path: str, positions_path: str):
+        """
+        Converts the store into the rewards.csv and positions.csv layout,
+        one chunk at a time.
+        :param rewards_path: rewards CSV path
+        :param positions_path: positions CSV path
+        """
+        rewards_columns = ["elapsed_time"] + [
+            c for c in self.columns if c.startswith("r_")
+        ]
+        positions_columns = ["elapsed_time"] + [
+            c for c in self.columns if c.startswith(("x_", "y_"))
+        ]
+        for path, columns in [
+            (rewards_path, rewards_columns),
+            (positions_path, positions_columns),
+        ]:
+            for start in range(0, max(self.rows, 1), self.chunk_size):
+                stop = min(start + self.chunk_size, self.rows)
+                pd.DataFrame(
+                    self.read(start, stop, columns).astype(float),
+                    columns=columns,
+                    index=pd.RangeIndex(start, stop),
+                ).to_csv(path, mode="w" if start == 0 else "a", header=start == 0)
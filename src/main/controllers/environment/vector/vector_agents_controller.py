@@ -0,0 +1,138 @@
+from typing import List, Optional
+
+import numpy as np
+
+from src.main.controllers.agents.agent_controller import AgentController
+from src.main.controllers.agents.policy.agent_policy_controller import (
+    AgentPolicyController,
+)
+from src.main.controllers.environment.telemetry.telemetry_controller import (
+    TelemetryController,
+)
+from src.main.controllers.environment.vector.vector_world_controller import (
+    VectorWorldController,
+)
+from src.main.controllers.replay_buffer.replay_buffer_controller import (
+    ReplayBufferController,
+)
+
+
+class VectorAgentsController:
+    """
+    Agent side of K worlds run in lockstep: runs a single batched inference for each
+    policy controller over the agents of all the worlds, records the K joint
+    transitions together and hands the first world over to the telemetry.
+    """
+
+    def __init__(
+        self,
+        agent_controllers: List[AgentController],
+        num_worlds: int,
+        buffer_controller: Optional[ReplayBufferController],
+        world_buffer_controllers: Optional[List[ReplayBufferController]],
+        policy_controllers: List[AgentPolicyController],
+        telemetry: TelemetryController,
+    ):
+        """
+        :param agent_controllers: agent controllers of the first world, giving the
+            policy of the agent of each row in every world
+        :param num_worlds: number of worlds
+        :param buffer_controller: buffer controller to close once done, None
+            when not training
+        :param world_buffer_controllers: buffer controller recording the transitions
+            of each world, forwarding them to buffer_controller (e.g. keeping
+            the n-step window of the world), None when not training
+        :param policy_controllers: policy controllers shared by all the worlds
+        :param telemetry: telemetry of the first world
+        """
+        self.num_worlds, self.size = num_worlds, len(agent_controllers)
+        self.__buffer_controller = buffer_controller
+        self.__world_buffer_controllers = world_buffer_controllers
+        self.__policy_controllers = policy_controllers
+        self.__telemetry = telemetry
+        self.__policy_groups = VectorWorldController.group_rows(
+            [ac.policy_controller for ac in agent_controllers], num_worlds, self.size
+        )
+
+    def actions(self, states: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Gets the actions of the agents of all the worlds, running a single batched
+        inference for each policy controller.
+        :param states: (K * N, num_states) observation matrix
+        :param out: optional (K * N, 2) array to write the actions into
+        :return: (K * N, 2) array of actions
+        """
+        actions = np.empty((len(states), 2)) if out is None else out
+        for policy_controller, indices in self.__policy_groups:
+            actions[indices] = AgentController.actions(
+                policy_controller, states[indices]
+            )
+        return actions
+
+    def record(
+        self,
+        prev_states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        positions: np.ndarray,
+        training: bool,
+    ):
+        """
+        Records the step of all the worlds: the rewards and positions of the first
+        world to the telemetry and, when training, the joint transition of each
+        world to its buffer controller. Arrays are copied, so that they can be reused.
+        :param prev_states: (K * N, num_states) observations before the step
+        :param actions: (K * N, 2) actions
+        :param rewards: (K, N) rewards
+        :param next_states: (K * N, num_states) observations after the step
+        :param positions: (K, N, 2) coordinates after the step
+        :param training: whether to record the transitions to the replay buffer
+        """
+        self.__telemetry.record(rewards[0].copy(), positions[0].copy())
+        if not training:
+            return
+        for world, buffer_controller in enumerate(self.__world_buffer_controllers):
+            rows = slice(world * self.size, (world + 1) * self.size)
+            buffer_controller.record(
+                record_tuple=(
+                    prev_states[rows].copy(),
+                    actions[rows].tolist(),
+                    rewards[world].tolist(),
+                    next_states[rows].copy(),
+                )
+            )
+
+    def end_episodes(self, worlds: List[int], training: bool):
+        """
+        Notifies the end of the episodes of the given worlds, which were reset.
+        :param worlds: worlds whose episode ended, in the order they were reset
+        :param training: whether to notify the replay buffer
+        """
+        for world in worlds:
+            if training:
+                self.__world_buffer_controllers[world].end_episode()
+            if world == 0:
+                self.__telemetry.end_episode()
+                self.__telemetry.reset()
+
+    def reset(self):
+        """
+        Starts a new episode in every world.
+        """
+        self.__telemetry.reset()
+
+    def stop(self):
+        """
+        Stops the policy controllers, drains the buffer controller of each world and
+        closes the shared one and the experiment files.
+        """
+        for policy_controller in self.__policy_controllers:
+            policy_controller.stop()
+        if self.__world_buffer_controllers is not None:
+            # The episodes in progress are cut, as if they were over
+            for buffer_controller in self.__world_buffer_controllers:
+                buffer_controller.end_episode()
+        if self.__buffer_controller is not None:
+            self.__buffer_controller.close()
+        self.__telemetry.close()
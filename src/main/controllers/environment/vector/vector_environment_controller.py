@@ -0,0 +1,90 @@
+from typing import Optional
+
+from src.main.controllers.environment.vector.vector_agents_controller import (
+    VectorAgentsController,
+)
+from src.main.controllers.environment.vector.vector_world_controller import (
+    VectorWorldController,
+)
+
+
+class VectorEnvironmentController:
+    """
+    Runs K independent episodes in lockstep on the stacked worlds of a
+    VectorEnvironment: the agents of all the worlds are sensed with a single call,
+    each policy runs a single batched inference for its agents of every world, the
+    K worlds are stepped at once and their K joint transitions are recorded together.
+    A world is reset as soon as its episode is over, while the others keep going.
+    """
+
+    def __init__(
+        self,
+        world_controller: VectorWorldController,
+        agents_controller: VectorAgentsController,
+    ):
+        """
+        :param world_controller: environment side of the K worlds
+        :param agents_controller: agent side of the K worlds
+        """
+        self.__world_controller = world_controller
+        self.__agents_controller = agents_controller
+
+    def train(self, num_steps: Optional[int] = None):
+        """
+        Steps the K worlds, recording their transitions to the replay buffer.
+        :param num_steps: number of steps, forever if None
+        :return:
+        """
+        self.__run(num_steps, training=True)
+
+    def simulate(self, num_steps: Optional[int] = None):
+        """
+        Steps the K worlds without recording their transitions.
+        :param num_steps: number of steps, forever if None
+        :return:
+        """
+        self.__run(num_steps, training=False)
+
+    def reset(self, seed: Optional[int] = None):
+        """
+        Starts a new episode in every world.
+        :param seed: optional seed of the global random generator
+        :return:
+        """
+        self.__world_controller.reset(seed)
+        self.__agents_controller.reset()
+
+    def stop(self):
+        """
+        Stops the policy controllers and closes the buffer controller and the
+        experiment files, to be called once no more steps will be run.
+        :return:
+        """
+        self.__agents_controller.stop()
+
+    def __run(self, num_steps: Optional[int], training: bool):
+        """
+        Steps the K worlds in lockstep, resetting each world as soon as it is done.
+        As in EnvironmentController, termination is checked before acting.
+        :param num_steps: number of steps, forever if None
+        :param training: whether to record the transitions to the replay buffer
+        """
+        worlds, agents = self.__world_controller, self.__agents_controller
+        agents.end_episodes(worlds.auto_reset(), training)
+        prev_states, step = worlds.states(), 0
+        while num_steps is None or step < num_steps:
+            actions = agents.actions(prev_states)
+            next_states, rewards = worlds.step(actions)
+            agents.record(
+                prev_states,
+                actions,
+                rewards,
+                next_states,
+                worlds.environment.state.positions(),
+                training,
+            )
+            ended = worlds.auto_reset()
+            agents.end_episodes(ended, training)
+            # The next states of the worlds just reset are sensed again
+            prev_states = worlds.states() if ended else next_states
+            step += 1
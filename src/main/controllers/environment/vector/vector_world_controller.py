@@ -0,0 +1,142 @@
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.main.controllers.agents.agent_controller import AgentController
+from src.main.controllers.agents.sensor.agent_sensor import AgentSensor
+from src.main.controllers.environment.step.step_controller import StepController
+from src.main.controllers.environment.termination.termination_controller import (
+    TerminationController,
+)
+from src.main.model.environment.vector_environment import VectorEnvironment
+
+
+class VectorWorldController:
+    """
+    Environment side of K worlds run in lockstep: senses, steps and rewards the agents
+    of all the worlds at once and resets the worlds whose episode is over, leaving
+    the policies and the recording of the transitions to the caller.
+    """
+
+    def __init__(
+        self,
+        environment: VectorEnvironment,
+        agent_controllers: List[AgentController],
+        sensor: AgentSensor,
+        termination_controller: TerminationController,
+    ):
+        """
+        :param environment: VectorEnvironment of K worlds
+        :param agent_controllers: agent controllers of the first world, giving the
+            type of the agent of each row in every world
+        :param sensor: sensor of all the agents
+        :param termination_controller: termination controller of the stacked worlds
+        """
+        self.environment = environment
+        self.num_worlds, self.size = len(environment), len(environment.state)
+        self.__step_controller = StepController(environment, t_step=1)
+        self.__sensor = sensor
+        self.__sense_radius = sensor.vd + sensor.r
+        self.__termination_controller = termination_controller
+        self.__agent_types = environment.state.type.ravel()
+        self.__reward_groups = self.group_rows(
+            [type(ac) for ac in agent_controllers], self.num_worlds, self.size
+        )
+
+    def states(self) -> np.ndarray:
+        """
+        Senses the agents of all the worlds at once, pairing each agent only with the
+        candidate neighbours of its own world.
+        :return: (K * N, num_states) observation matrix, in world order
+        """
+        candidates = self.environment.candidate_pairs(self.__sense_radius)
+        return self.__sensor.sense_all(
+            self.environment.state.positions().reshape(-1, 2),
+            self.__agent_types,
+            candidates,
+        )
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Moves the agents of all the worlds of one step at once.
+        :param actions: (K * N, 2) array of actions, in world order
+        :return: the (K * N, num_states) observations and the (K, N) rewards
+            after the step
+        """
+        self.__step_controller.step(actions.reshape(self.num_worlds, -1, 2))
+        states = self.states()
+        return states, self.__rewards(states)
+
+    def auto_reset(self) -> List[int]:
+        """
+        Checks the termination of all the worlds at once, decreasing the predators'
+        life, and resets the ones whose episode is over until none of them is done.
+        :return: the worlds whose episode ended, in the order they were reset,
+            where a world reset more than once is repeated
+        """
+        worlds, ended = np.arange(self.num_worlds), []
+        while True:
+            termination = self.__termination_controller.check(
+                self.environment.state.positions()[worlds], worlds
+            )
+            for world, caught in zip(worlds.tolist(), termination.caught):
+                if np.any(caught):
+                    logging.info(
+                        "World %s caught preys: %s", world, np.flatnonzero(caught)
+                    )
+            worlds = worlds[termination.done]
+            if len(worlds) == 0:
+                return ended
+            for world in worlds.tolist():
+                self.__reset_world(world)
+            ended.extend(worlds.tolist())
+
+    def reset(self, seed: Optional[int] = None):
+        """
+        Starts a new episode in every world.
+        :param seed: optional seed of the global random generator
+        """
+        if seed is not None:
+            np.random.seed(seed)
+        for world in range(self.num_worlds):
+            self.__reset_world(world)
+
+    def __reset_world(self, world: int):
+        """
+        Starts a new episode in one of the worlds.
+        :param world: index of the world
+        """
+        self.environment.environments[world].randomize()
+        self.__termination_controller.reset(world)
+
+    def __rewards(self, states: np.ndarray) -> np.ndarray:
+        """
+        Gets the rewards of the agents of all the worlds, computed at once for each
+        type of agent controller.
+        :param states: (K * N, num_states) observation matrix
+        :return: (K, N) array of rewards
+        """
+        rewards = np.empty(len(states))
+        for agent_controller_type, indices in self.__reward_groups:
+            rewards[indices] = agent_controller_type.rewards(states[indices])
+        return rewards.reshape(self.num_worlds, -1)
+
+    @staticmethod
+    def group_rows(keys: list, num_worlds: int, size: int) -> list:
+        """
+        Groups the rows of all the worlds by the key of the agent of each row,
+        preserving the order of the first occurrence of each key.
+        :param keys: key of each agent of a world, compared by identity
+        :param num_worlds: number of worlds
+        :param size: number of agents of each world
+        :return: list of (key, indices of the rows of all the worlds) pairs
+        """
+        groups = {}
+        for i, key in enumerate(keys):
+            groups.setdefault(id(key), (key, []))[1].append(i)
+        offsets = np.arange(num_worlds)[:, np.newaxis] * size
+        return [
+            (key, (offsets + np.array(indices)).ravel())
+            for key, indices in groups.values()
+        ]
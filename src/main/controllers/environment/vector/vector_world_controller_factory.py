@@ -0,0 +1,66 @@
+from typing import List, Optional, Tuple
+
+from src.main.controllers.agents.agent_controller import AgentController
+from src.main.controllers.agents.policy.agent_policy_controller import (
+    AgentPolicyController,
+)
+from src.main.controllers.agents.predator_prey.agent_controller_factory import (
+    AgentControllerFactory,
+)
+from src.main.controllers.agents.sensor.agent_sensor_factory import (
+    AgentSensorFactory,
+)
+from src.main.controllers.environment.termination.termination_controller import (
+    TerminationController,
+)
+from src.main.controllers.environment.vector.vector_world_controller import (
+    VectorWorldController,
+)
+from src.main.model.config.config import EnvironmentConfig
+from src.main.model.environment.vector_environment import VectorEnvironment
+
+
+class VectorWorldControllerFactory:
+    @staticmethod
+    def worlds_from_config(
+        env_config: EnvironmentConfig,
+        num_worlds: int,
+        prey_policy_controller: Optional[AgentPolicyController] = None,
+        pred_policy_controller: Optional[AgentPolicyController] = None,
+    ) -> Tuple[VectorWorldController, List[AgentController]]:
+        """
+        Creates the environment side of num_worlds random worlds, whose agents are
+        drawn as for a single EnvironmentController, one world after the other.
+        :param env_config: EnvironmentConfig
+        :param num_worlds: number of worlds
+        :param prey_policy_controller: optional AgentPolicyController of the preys
+        :param pred_policy_controller: optional AgentPolicyController of the predators
+        :return: the VectorWorldController and the agent controllers of its last world
+        """
+        populations, agent_controllers = [], []
+        for _ in range(num_worlds):
+            agent_controllers = AgentControllerFactory.predator_controllers_from_config(
+                env_config, pred_policy_controller
+            ) + AgentControllerFactory.prey_controllers_from_config(
+                env_config, prey_policy_controller
+            )
+            populations.append(
+                [agent_controller.agent for agent_controller in agent_controllers]
+            )
+        world_controller = VectorWorldController(
+            environment=VectorEnvironment(
+                x_dim=env_config.x_dim,
+                y_dim=env_config.y_dim,
+                populations=populations,
+                cell_size=env_config.vd,
+            ),
+            agent_controllers=agent_controllers,
+            sensor=AgentSensorFactory.sensor_from_config(env_config),
+            termination_controller=TerminationController(
+                r=env_config.r,
+                life=env_config.life,
+                agent_types=[agent.agent_type.value for agent in populations[0]],
+                num_worlds=num_worlds,
+            ),
+        )
+        return world_controller, agent_controllers
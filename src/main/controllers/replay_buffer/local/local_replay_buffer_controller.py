@@ -0,0 +1,156 @@
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.main.controllers.replay_buffer.replay_buffer_controller import (
+    ReplayBufferController,
+)
+from src.main.model.replay_buffer.transition_batch import TransitionBatch
+
+
+class LocalReplayBufferController(ReplayBufferController):
+    """
+    In-process replay buffer, storing the transitions in a preallocated float32 ring
+    matrix with the TransitionBatch column layout (states, rewards, actions and
+    next states of all the agents). The matrix can be a np.memmap file, so that the
+    capacity is not bounded by the available memory. A JSON header next to the file
+    (spill_path + ".json") keeps the layout, the capacity, the size and the next
+    slot of the ring, so that the buffer can be reopened with from_spill_file().
+    """
+
+    def __init__(self, capacity: int, spill_path: Optional[str] = None):
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.size = 0
+        self.__next = 0
+        self.__layout = None
+        self.__matrix = None
+
+    @classmethod
+    def from_spill_file(cls, spill_path: str) -> "LocalReplayBufferController":
+        """
+        Reopens the replay buffer spilled to a file, as of its last flush.
+        :param spill_path: path of the np.memmap file
+        :return: LocalReplayBufferController appending to the same file
+        """
+        with open(cls.header_path(spill_path)) as header_file:
+            header = json.load(header_file)
+        controller = cls(header["capacity"], spill_path)
+        controller.size = header["size"]
+        controller.__next = header["next"]
+        controller.__layout = (
+            header["num_agents"],
+            header["state_size"],
+            header["action_size"],
+        )
+        controller.__matrix = np.memmap(
+            spill_path,
+            dtype=np.float32,
+            mode="r+",
+            shape=(controller.capacity, TransitionBatch.columns(*controller.__layout)),
+        )
+        return controller
+
+    @staticmethod
+    def header_path(spill_path: str) -> str:
+        return f"{spill_path}.json"
+
+    def record(self, record_tuple: Tuple):
+        """
+        Records a tuple in the ring, overwriting the oldest one when full.
+        :param record_tuple: tuple
+        :return:
+        """
+        transition = self._transition(record_tuple)
+        if self.__matrix is None:
+            self.__allocate(transition)
+        np.concatenate(transition, out=self.__matrix[self.__next], casting="same_kind")
+        self.__next = (self.__next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(
+        self, batch_size: int, rng: Optional[np.random.Generator] = None
+    ) -> TransitionBatch:
+        """
+        Samples a batch of transitions uniformly, with replacement.
+        :param batch_size: number of transitions
+        :param rng: optional random generator, a new unseeded one otherwise
+        :return: TransitionBatch, whose split() gives (states, rewards, actions, next_states)
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer")
+        rng = rng if rng is not None else np.random.default_rng()
+        indices = rng.integers(0, self.size, size=batch_size)
+        return TransitionBatch(*self.__layout, np.asarray(self.__matrix[indices]))
+
+    def transitions(self) -> TransitionBatch:
+        """
+        Gets the stored transitions, from the oldest to the newest, copying only
+        the two slices of the ring into memory.
+        :return: TransitionBatch
+        """
+        if self.size < self.capacity:
+            matrix = np.array(self.__matrix[: self.size])
+        else:
+            matrix = np.concatenate(
+                [self.__matrix[self.__next :], self.__matrix[: self.__next]]
+            )
+        return TransitionBatch(*self.__layout, np.asarray(matrix))
+
+    def flush(self):
+        """
+        Flushes the spill file, if any, and then writes its header, which never
+        refers to transitions not on disk.
+        :return:
+        """
+        if not isinstance(self.__matrix, np.memmap):
+            return
+        self.__matrix.flush()
+        num_agents, state_size, action_size = self.__layout
+        header_path = self.header_path(self.spill_path)
+        tmp_path = f"{header_path}.tmp"
+        with open(tmp_path, "w") as header_file:
+            json.dump(
+                {
+                    "dtype": "float32",
+                    "num_agents": num_agents,
+                    "state_size": state_size,
+                    "action_size": action_size,
+                    "capacity": self.capacity,
+                    "size": self.size,
+                    "next": self.__next,
+                },
+                header_file,
+            )
+        os.replace(tmp_path, header_path)
+
+    def close(self):
+        """
+        Flushes the spill file and its header, if any.
+        :return:
+        """
+        self.flush()
+
+    def __allocate(self, transition: Tuple[np.ndarray, ...]):
+        """
+        Allocates the ring once the size of the transitions is known.
+        :param transition: first (state, reward, action, next_state) flat arrays
+        """
+        state, reward, action, _ = transition
+        num_agents = len(reward)
+        self.__layout = (
+            num_agents,
+            len(state) // num_agents,
+            len(action) // num_agents,
+        )
+        shape = (self.capacity, TransitionBatch.columns(*self.__layout))
+        if self.spill_path is None:
+            self.__matrix = np.empty(shape, dtype=np.float32)
+        else:
+            os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+            self.__matrix = np.memmap(
+                self.spill_path, dtype=np.float32, mode="w+", shape=shape
+            )
+            self.flush()
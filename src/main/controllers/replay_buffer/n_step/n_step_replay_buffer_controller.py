@@ -0,0 +1,96 @@
+from collections import deque
+from typing import Tuple
+
+import numpy as np
+
+from src.main.controllers.replay_buffer.replay_buffer_controller import (
+    ReplayBufferController,
+)
+
+
+class NStepReplayBufferController(ReplayBufferController):
+    r"""
+    Recording stage aggregating the one-step transitions of every agent into n-step
+    ones before forwarding them to another buffer controller. Each emitted transition
+    holds the state and action at t, the state at t + n and the discounted sum
+
+        .. math:: R_t = \sum_{k=0}^{n-1} \gamma^k r_{t+k}
+
+    computed for all the agents at once. At the end of an episode the transitions of
+    the last steps, whose horizon is cut short, are dropped: the forwarded transitions
+    carry no horizon, so the learner would bootstrap them as n-step ones. Only one
+    every stride transitions is forwarded.
+    """
+
+    def __init__(
+        self,
+        buffer_controller: ReplayBufferController,
+        n: int,
+        gamma: float,
+        stride: int = 1,
+    ):
+        self.buffer_controller = buffer_controller
+        self.n = n
+        self.gamma = gamma
+        self.stride = stride
+        self.__discounts = gamma ** np.arange(n)
+        self.__window = deque()
+        self.__emitted = 0
+
+    def record(self, record_tuple: Tuple):
+        """
+        Adds a one-step joint transition to the window, forwarding the n-step
+        transition starting at its oldest step once the window is full.
+        :param record_tuple: tuple of (prev_states, actions, rewards, next_states)
+        :return:
+        """
+        prev_states, actions, rewards, next_states = record_tuple
+        self.__window.append(
+            (
+                prev_states,
+                actions,
+                np.asarray(rewards, dtype=float),
+                next_states,
+            )
+        )
+        if len(self.__window) == self.n:
+            self.__emit()
+
+    def end_episode(self):
+        """
+        Drops the steps still in the window, whose horizon is cut by the end of the
+        episode, and starts a new one.
+        :return:
+        """
+        self.__window.clear()
+        self.__emitted = 0
+        self.buffer_controller.end_episode()
+
+    def close(self):
+        """
+        Drains the window, as at the end of an episode, then closes the buffer
+        controller the transitions are forwarded to.
+        :return:
+        """
+        self.end_episode()
+        self.buffer_controller.close()
+
+    def __emit(self):
+        """
+        Forwards the transition starting at the oldest step of the window,
+        then drops that step.
+        """
+        prev_states, actions, _, _ = self.__window[0]
+        next_states = self.__window[-1][3]
+        rewards = np.stack([step[2] for step in self.__window])
+        if self.__emitted % self.stride == 0:
+            self.buffer_controller.record(
+                (
+                    prev_states,
+                    actions,
+                    (self.__discounts[: len(rewards)] @ rewards).tolist(),
+                    next_states,
+                )
+            )
+        self.__emitted += 1
+        self.__window.popleft()
@@ -0,0 +1,209 @@
+import logging
+import time
+from collections import deque
+from threading import Condition, Thread
+from typing import Tuple
+
+import numpy as np
+import requests
+
+from src.main.controllers.replay_buffer.remote.remote_replay_buffer_controller import (
+    RemoteReplayBufferController,
+)
+from src.main.model.config.config import Backpressure, WireFormat
+from src.main.model.replay_buffer.replay_buffer_client_metrics import (
+    ReplayBufferClientMetrics,
+)
+
+
+class BatchedReplayBufferController(RemoteReplayBufferController):
+    """
+    Remote replay buffer client taking the HTTP requests off the step loop:
+    transitions are put on a bounded in-memory queue and a background sender thread
+    posts them in batches over a keep-alive session. A batch whose request times out
+    or cannot connect is retried with exponential backoff, up to max_retries times.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        batch_size: int = 32,
+        flush_interval: float = 1.0,
+        queue_size: int = 1024,
+        backpressure: Backpressure = Backpressure.BLOCK,
+        wire_format: WireFormat = WireFormat.JSON,
+        request_timeout: float = 10.0,
+        max_retries: int = 3,
+        retry_interval: float = 0.5,
+    ):
+        super().__init__(host, port, wire_format, request_timeout)
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = max(queue_size, batch_size)
+        self.backpressure = backpressure
+        self.__queue = deque()
+        self.__condition = Condition()
+        self.__in_flight = 0
+        self.__closed = False
+        self.__session = requests.Session()
+        # Reused by the sender thread to build binary batches
+        self.__matrix = np.empty((0, 0), dtype=np.float32)
+        self.__recorded, self.__sent, self.__dropped, self.__failed = 0, 0, 0, 0
+        self.__batches, self.__last_latency, self.__total_latency = 0, 0.0, 0.0
+        self.__sender = Thread(target=self.__send_loop, daemon=True)
+        self.__sender.start()
+
+    def record(self, record_tuple: Tuple):
+        """
+        Queues a tuple to be sent to the remote Replay Buffer Service.
+        When the queue is full, it either blocks until the sender makes room or drops
+        the oldest queued transition, depending on the backpressure policy.
+        :param record_tuple: tuple
+        :return:
+        """
+        transition = self._transition(record_tuple)
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("The replay buffer client is closed")
+            if len(self.__queue) >= self.queue_size:
+                if self.backpressure == Backpressure.DROP_OLDEST:
+                    self.__queue.popleft()
+                    self.__dropped += 1
+                else:
+                    self.__condition.wait_for(
+                        lambda: len(self.__queue) < self.queue_size
+                    )
+            self.__queue.append(transition)
+            self.__recorded += 1
+            self.__condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every queued transition has been sent.
+        :param timeout: optional maximum time to wait, in seconds
+        :return: True if the queue has been drained, False on timeout
+        """
+        with self.__condition:
+            self.__condition.notify_all()
+            return self.__condition.wait_for(
+                lambda: not self.__queue and not self.__in_flight, timeout
+            )
+
+    def close(self):
+        """
+        Sends the queued transitions and stops the sender thread.
+        :return:
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        self.__sender.join()
+        self.__session.close()
+
+    def metrics(self) -> ReplayBufferClientMetrics:
+        """
+        Gets a snapshot of the client metrics.
+        :return: ReplayBufferClientMetrics
+        """
+        with self.__condition:
+            return ReplayBufferClientMetrics(
+                queue_depth=len(self.__queue),
+                recorded=self.__recorded,
+                sent=self.__sent,
+                dropped=self.__dropped,
+                failed=self.__failed,
+                batches=self.__batches,
+                last_send_latency=self.__last_latency,
+                mean_send_latency=self.__total_latency / max(self.__batches, 1),
+            )
+
+    def __next_batch(self):
+        """
+        Waits for a full batch, the flush interval to elapse or the client to be closed,
+        then takes up to batch_size transitions from the queue.
+        :return: list of transitions, empty once closed and drained
+        """
+        with self.__condition:
+            deadline = None
+            while not self.__closed and len(self.__queue) < self.batch_size:
+                if self.__queue and deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    break
+                self.__condition.wait(timeout)
+            batch = [
+                self.__queue.popleft()
+                for _ in range(min(self.batch_size, len(self.__queue)))
+            ]
+            self.__in_flight = len(batch)
+            self.__condition.notify_all()
+            return batch
+
+    def __send_loop(self):
+        while True:
+            batch = self.__next_batch()
+            if not batch:
+                return
+            t_start = time.perf_counter()
+            try:
+                self.__post_with_retries(batch)
+                sent, failed = len(batch), 0
+            except requests.RequestException as e:
+                logging.warning(f"Failed to send {len(batch)} transitions: {e}")
+                sent, failed = 0, len(batch)
+            latency = time.perf_counter() - t_start
+            with self.__condition:
+                self.__sent += sent
+                self.__failed += failed
+                self.__batches += 1
+                self.__last_latency = latency
+                self.__total_latency += latency
+                self.__in_flight = 0
+                self.__condition.notify_all()
+
+    def __post_with_retries(self, batch):
+        """
+        Posts a batch, retrying timeouts and connection errors with exponential
+        backoff, but not once the client is closed.
+        :param batch: list of transitions
+        """
+        retry_interval = self.retry_interval
+        for retry in range(self.max_retries + 1):
+            try:
+                return self._post(batch)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if retry == self.max_retries:
+                    raise
+                logging.warning(f"Retrying {len(batch)} transitions: {e}")
+            with self.__condition:
+                if self.__condition.wait_for(lambda: self.__closed, retry_interval):
+                    raise requests.ConnectionError("Client closed while retrying")
+            retry_interval *= 2
+
+    def _post(self, batch):
+        """
+        Posts a batch of transitions over the keep-alive session.
+        :param batch: list of transitions
+        :return:
+        """
+        out = (
+            self.__matrix_for(batch) if self.wire_format == WireFormat.BINARY else None
+        )
+        response = self.__session.post(self._url(), **self._request(batch, out))
+        response.raise_for_status()
+
+    def __matrix_for(self, batch) -> np.ndarray:
+        """
+        Gets the preallocated matrix binary batches are built into, allocating it
+        only when the size of the transitions changes.
+        :param batch: list of transitions
+        :return: (batch_size, columns) float32 matrix
+        """
+        width = sum(len(part) for part in batch[0])
+        if self.__matrix.shape != (self.batch_size, width):
+            self.__matrix = np.empty((self.batch_size, width), dtype=np.float32)
+        return self.__matrix
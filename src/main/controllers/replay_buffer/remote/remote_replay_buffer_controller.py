@@ -1,36 +1,90 @@
-import json
-import logging
-from typing import Tuple
+from typing import List, Optional, Tuple
 
-import requests
+import numpy as np
 
-from src.main.model.environment.agents.agent_type import AgentType
 from src.main.controllers.replay_buffer.replay_buffer_controller import (
     ReplayBufferController,
 )
+from src.main.model.config.config import WireFormat
+from src.main.model.replay_buffer.transition_batch import (
+    TRANSITION_BATCH_CONTENT_TYPE,
+    TransitionBatch,
+)
 
 
 class RemoteReplayBufferController(ReplayBufferController):
-    def __init__(self, host: str, port: int):
+    """
+    Base of the remote Replay Buffer Service clients, building the /record_data/
+    requests in the configured wire format. Subclasses post them.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        wire_format: WireFormat = WireFormat.JSON,
+        request_timeout: float = 10.0,
+    ):
+        """
+        :param host: host of the Replay Buffer Service
+        :param port: port of the Replay Buffer Service
+        :param wire_format: format of the /record_data/ bodies
+        :param request_timeout: connect and read timeout of each request, in seconds
+        """
         self._host = host
         self._port = port
+        self.wire_format = wire_format
+        self.request_timeout = request_timeout
+
+    def _url(self) -> str:
+        return f"http://{self._host}:{self._port}/record_data/"
+
+    def _request(
+        self,
+        transitions: List[Tuple[np.ndarray, ...]],
+        out: Optional[np.ndarray] = None,
+    ) -> dict:
+        """
+        Builds the /record_data/ request body in the configured wire format.
+        :param transitions: list of (state, reward, action, next_state) flat arrays
+        :param out: optional preallocated matrix for the binary format
+        :return: keyword arguments of the POST request
+        """
+        if self.wire_format == WireFormat.BINARY:
+            return self._batch_request(
+                TransitionBatch.from_transitions(transitions, out)
+            )
+        return {
+            "json": self._json_payload(transitions),
+            "timeout": self.request_timeout,
+        }
+
+    def _batch_request(self, batch: TransitionBatch) -> dict:
+        """
+        Builds the /record_data/ request body of an already encoded batch
+        in the configured wire format.
+        :param batch: TransitionBatch
+        :return: keyword arguments of the POST request
+        """
+        if self.wire_format == WireFormat.BINARY:
+            return {
+                "data": batch.to_bytes(),
+                "headers": {"Content-Type": TRANSITION_BATCH_CONTENT_TYPE},
+                "timeout": self.request_timeout,
+            }
+        return {"json": batch.to_json(), "timeout": self.request_timeout}
 
-    def record(self, record_tuple: Tuple):
+    @staticmethod
+    def _json_payload(transitions: List[Tuple[np.ndarray, ...]]) -> dict:
         """
-        Record a tuple to a remote Replay Buffer Service
-        :param record_tuple: tuple
-        :return:
+        Builds the /record_data/ JSON body, with one row per transition.
+        :param transitions: list of (state, reward, action, next_state) flat arrays
+        :return: JSON body
         """
-        prev_states, actions, rewards, next_states = record_tuple
-        record_json = {
-            "State": [[float(ps) for prev_state in prev_states for ps in prev_state]],
-            "Reward": [[float(r) for r in rewards]],
-            "Action": [[float(ps) for action in actions for ps in action]],
-            "Next State": [
-                [float(ns) for next_state in next_states for ns in next_state]
-            ],
+        states, rewards, actions, next_states = zip(*transitions)
+        return {
+            "State": np.stack(states).tolist(),
+            "Reward": np.stack(rewards).tolist(),
+            "Action": np.stack(actions).tolist(),
+            "Next State": np.stack(next_states).tolist(),
         }
-        requests.post(
-            f"http://{self._host}:{self._port}/record_data/",
-            json=record_json,
-        )
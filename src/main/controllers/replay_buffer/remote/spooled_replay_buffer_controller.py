@@ -0,0 +1,156 @@
+import logging
+import time
+from itertools import groupby
+from threading import Event, Lock, Thread
+from typing import List, Tuple
+
+import numpy as np
+import requests
+
+from src.main.controllers.replay_buffer.remote.remote_replay_buffer_controller import (
+    RemoteReplayBufferController,
+)
+from src.main.controllers.replay_buffer.remote.transition_spool import (
+    TransitionSpool,
+)
+from src.main.model.config.config import WireFormat
+from src.main.model.replay_buffer.replay_buffer_client_metrics import (
+    ReplayBufferClientMetrics,
+)
+from src.main.model.replay_buffer.transition_batch import TransitionBatch
+
+
+class SpooledReplayBufferController(RemoteReplayBufferController):
+    """
+    Remote replay buffer client writing every transition to a durable local spool,
+    which a background sender drains in batches while the replay buffer service
+    is healthy. When the service is slow or down the step loop is never blocked and
+    the transitions wait on disk, to be sent once it is back or after a restart.
+    Requests time out after request_timeout and failed ones are retried with
+    exponential backoff, up to max_retry_interval between two attempts.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        spool_path: str,
+        batch_size: int = 32,
+        flush_interval: float = 1.0,
+        segment_size: int = 64 * 1024 * 1024,
+        sync_interval: float = 1.0,
+        max_retry_interval: float = 30.0,
+        wire_format: WireFormat = WireFormat.JSON,
+        request_timeout: float = 10.0,
+    ):
+        super().__init__(host, port, wire_format, request_timeout)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retry_interval = max_retry_interval
+        self.__spool = TransitionSpool(spool_path, segment_size, sync_interval)
+        self.__session = requests.Session()
+        self.__closed = Event()
+        self.__lock = Lock()
+        self.__recorded, self.__sent, self.__failed = 0, 0, 0
+        self.__batches, self.__last_latency, self.__total_latency = 0, 0.0, 0.0
+        self.__sender = Thread(target=self.__send_loop, daemon=True)
+        self.__sender.start()
+
+    def record(self, record_tuple: Tuple):
+        """
+        Appends a tuple to the spool, to be sent to the remote Replay Buffer Service.
+        :param record_tuple: tuple
+        :return:
+        """
+        batch = TransitionBatch.from_transitions([self._transition(record_tuple)])
+        self.__spool.append(batch.to_bytes())
+        with self.__lock:
+            self.__recorded += 1
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every spooled transition has been sent.
+        :param timeout: optional maximum time to wait, in seconds
+        :return: True if the spool has been drained, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.__spool.pending() > 0:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = None):
+        """
+        Stops the sender thread, leaving the transitions not sent yet in the spool.
+        :param timeout: optional time to keep sending before stopping, in seconds
+        :return:
+        """
+        if timeout:
+            self.flush(timeout)
+        self.__closed.set()
+        self.__sender.join()
+        self.__spool.close()
+        self.__session.close()
+
+    def metrics(self) -> ReplayBufferClientMetrics:
+        """
+        Gets a snapshot of the client metrics, where the queue is the spool.
+        :return: ReplayBufferClientMetrics
+        """
+        with self.__lock:
+            return ReplayBufferClientMetrics(
+                queue_depth=self.__spool.pending(),
+                recorded=self.__recorded,
+                sent=self.__sent,
+                dropped=0,
+                failed=self.__failed,
+                batches=self.__batches,
+                last_send_latency=self.__last_latency,
+                mean_send_latency=self.__total_latency / max(self.__batches, 1),
+            )
+
+    def __send_loop(self):
+        while not self.__closed.is_set():
+            records, position = self.__spool.read(self.batch_size, self.flush_interval)
+            if not records:
+                continue
+            retry_interval = self.flush_interval
+            # The same records are retried until delivered or the client is closed
+            while not self.__send(records):
+                if self.__closed.wait(retry_interval):
+                    return
+                retry_interval = min(2 * retry_interval, self.max_retry_interval)
+            self.__spool.ack(position, len(records))
+
+    def __send(self, records: List[bytes]) -> bool:
+        """
+        Posts spooled records, one request for each run of records with the same layout.
+        :param records: encoded single-transition batches
+        :return: True if delivered, False otherwise
+        """
+        batches = [TransitionBatch.from_bytes(record) for record in records]
+        t_start = time.perf_counter()
+        try:
+            for layout, run in groupby(
+                batches, lambda b: (b.num_agents, b.state_size, b.action_size)
+            ):
+                batch = TransitionBatch(
+                    *layout, np.concatenate([b.matrix for b in run])
+                )
+                response = self.__session.post(
+                    self._url(), **self._batch_request(batch)
+                )
+                response.raise_for_status()
+        except requests.RequestException as e:
+            logging.warning(f"Failed to send {len(records)} transitions: {e}")
+            with self.__lock:
+                self.__failed += len(records)
+            return False
+        latency = time.perf_counter() - t_start
+        with self.__lock:
+            self.__sent += len(records)
+            self.__batches += 1
+            self.__last_latency = latency
+            self.__total_latency += latency
+        return True
@@ -0,0 +1,257 @@
+import glob
+import os
+import struct
+from threading import Condition, Event, Thread
+from typing import List, Optional, Tuple
+
+_LENGTH = struct.Struct("<I")
+_SEGMENT_SUFFIX = ".spool"
+_ACK_FILE = "ack"
+
+
+class TransitionSpool:
+    """
+    Durable append-only spool of length-prefixed binary records, split in numbered
+    segment files rotated once they exceed segment_size bytes.
+
+    A reader takes records in order and acknowledges them once delivered: the acked
+    position is persisted, fully acked segments are deleted and, after a restart,
+    reading resumes from the last acked position, so unsent records are replayed.
+
+    Appending only writes the record to the OS, so that the step loop never waits
+    for the disk: a background thread syncs the appended records every sync_interval
+    seconds, as soon as a segment is rotated and when the spool is closed, so that
+    a power loss loses at most sync_interval seconds of records. The ack file is
+    synced by the reader, before replacing the previous one.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        segment_size: int = 64 * 1024 * 1024,
+        sync_interval: float = 1.0,
+    ):
+        """
+        :param path: spool directory
+        :param segment_size: size in bytes a segment is rotated at
+        :param sync_interval: maximum time between two syncs of the active segment,
+            in seconds, 0 to sync as soon as possible after every record
+        """
+        self.path = path
+        self.segment_size = segment_size
+        self.sync_interval = sync_interval
+        os.makedirs(path, exist_ok=True)
+        self.__condition = Condition()
+        self.__segments = sorted(
+            int(os.path.basename(f)[: -len(_SEGMENT_SUFFIX)])
+            for f in glob.glob(os.path.join(path, f"*{_SEGMENT_SUFFIX}"))
+        )
+        acked_segment, acked_offset = self.__read_ack()
+        for segment in [s for s in self.__segments if s < acked_segment]:
+            self.__remove(segment)
+        self.__segments = [s for s in self.__segments if s >= acked_segment]
+        # Segments left by a previous run are complete, new records go to a new one
+        self.__sizes = {s: self.__valid_size(s) for s in self.__segments}
+        self.__cursor = (acked_segment, acked_offset)
+        self.__unread = sum(
+            self.__count(s, acked_offset if s == acked_segment else 0)
+            for s in self.__segments
+        )
+        self.__unacked = self.__unread
+        self.__active = (self.__segments[-1] if self.__segments else acked_segment) + 1
+        self.__segments.append(self.__active)
+        self.__sizes[self.__active] = 0
+        self.__file = open(self.__segment_path(self.__active), "ab")
+        # Rotated segments not synced yet and whether the active one has unsynced data
+        self.__unsynced = []
+        self.__dirty = False
+        self.__closed = False
+        self.__sync_requested = Event()
+        self.__syncer = Thread(target=self.__sync_loop, daemon=True)
+        self.__syncer.start()
+
+    def append(self, record: bytes):
+        """
+        Appends a record, rotating the active segment when it is full. The record is
+        handed over to the OS, but synced to disk later by the background thread.
+        :param record: record content
+        """
+        with self.__condition:
+            self.__file.write(_LENGTH.pack(len(record)) + record)
+            self.__file.flush()
+            self.__dirty = True
+            self.__sizes[self.__active] += _LENGTH.size + len(record)
+            self.__unread += 1
+            self.__unacked += 1
+            if self.__sizes[self.__active] >= self.segment_size:
+                self.__rotate()
+            self.__condition.notify_all()
+        if self.sync_interval == 0:
+            self.__sync_requested.set()
+
+    def sync(self):
+        """
+        Syncs the appended records to disk, without holding appends meanwhile.
+        """
+        with self.__condition:
+            rotated, self.__unsynced = self.__unsynced, []
+            # A duplicate descriptor stays valid even if the segment is rotated
+            active = os.dup(self.__file.fileno()) if self.__dirty else None
+            self.__dirty = False
+        for segment_file in rotated:
+            os.fsync(segment_file.fileno())
+            segment_file.close()
+        if active is not None:
+            try:
+                os.fsync(active)
+            finally:
+                os.close(active)
+        if rotated:
+            # The new segments must survive a crash as much as their records
+            self.__sync_directory()
+
+    def read(
+        self, max_records: int, timeout: Optional[float] = None
+    ) -> Tuple[List[bytes], Tuple[int, int]]:
+        """
+        Reads the next records, waiting until max_records are available or timeout.
+        :param max_records: maximum number of records
+        :param timeout: optional maximum time to wait, in seconds
+        :return: the records and the position following them, to be acked
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.__unread >= max_records, timeout)
+            records = []
+            segment, offset = self.__cursor
+            while len(records) < max_records and self.__unread > 0:
+                if offset >= self.__sizes.get(segment, 0):
+                    segment, offset = self.__following(segment), 0
+                    continue
+                with open(self.__segment_path(segment), "rb") as segment_file:
+                    segment_file.seek(offset)
+                    while len(records) < max_records and offset < self.__sizes[segment]:
+                        (length,) = _LENGTH.unpack(segment_file.read(_LENGTH.size))
+                        records.append(segment_file.read(length))
+                        offset += _LENGTH.size + length
+                        self.__unread -= 1
+            self.__cursor = (segment, offset)
+            return records, self.__cursor
+
+    def ack(self, position: Tuple[int, int], records: int):
+        """
+        Persists the position of the delivered records and deletes the segments
+        fully delivered.
+        :param position: position returned by read
+        :param records: number of records delivered
+        """
+        # The ack file is only written by the reader, appends are not held meanwhile
+        segment, offset = position
+        tmp_path = os.path.join(self.path, f"{_ACK_FILE}.tmp")
+        with open(tmp_path, "w") as ack_file:
+            ack_file.write(f"{segment} {offset}")
+            ack_file.flush()
+            os.fsync(ack_file.fileno())
+        os.replace(tmp_path, os.path.join(self.path, _ACK_FILE))
+        self.__sync_directory()
+        with self.__condition:
+            self.__unacked -= records
+            done = [s for s in self.__segments if s < segment]
+            self.__segments = [s for s in self.__segments if s >= segment]
+            for s in done:
+                self.__sizes.pop(s, None)
+        for s in done:
+            self.__remove(s)
+
+    def pending(self) -> int:
+        """
+        Gets the number of records not delivered yet.
+        :return: number of records
+        """
+        with self.__condition:
+            return self.__unacked
+
+    def close(self):
+        """
+        Syncs the appended records and closes the active segment.
+        """
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__condition.notify_all()
+        self.__sync_requested.set()
+        self.__syncer.join()
+        with self.__condition:
+            self.__file.close()
+
+    def __rotate(self):
+        # The full segment is synced and closed by the background thread
+        self.__unsynced.append(self.__file)
+        self.__active += 1
+        self.__segments.append(self.__active)
+        self.__sizes[self.__active] = 0
+        self.__file = open(self.__segment_path(self.__active), "ab")
+        self.__sync_requested.set()
+
+    def __sync_loop(self):
+        while True:
+            self.__sync_requested.wait(self.sync_interval or None)
+            self.__sync_requested.clear()
+            with self.__condition:
+                closed = self.__closed
+            self.sync()
+            if closed:
+                return
+
+    def __sync_directory(self):
+        """
+        Syncs the spool directory, persisting the creation and replacement of files.
+        """
+        if os.name != "posix":
+            return
+        directory = os.open(self.path, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def __following(self, segment: int) -> int:
+        return next(s for s in self.__segments if s > segment)
+
+    def __segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"{segment:010d}{_SEGMENT_SUFFIX}")
+
+    def __remove(self, segment: int):
+        if os.path.exists(self.__segment_path(segment)):
+            os.remove(self.__segment_path(segment))
+
+    def __read_ack(self) -> Tuple[int, int]:
+        ack_path = os.path.join(self.path, _ACK_FILE)
+        if not os.path.exists(ack_path):
+            return 0, 0
+        with open(ack_path) as ack_file:
+            segment, offset = ack_file.read().split()
+        return int(segment), int(offset)
+
+    def __records(self, segment: int):
+        """
+        Scans the complete records of a segment, ignoring a truncated last one.
+        :param segment: segment number
+        :return: generator of the records' end offsets
+        """
+        size = os.path.getsize(self.__segment_path(segment))
+        with open(self.__segment_path(segment), "rb") as segment_file:
+            offset = 0
+            while offset + _LENGTH.size <= size:
+                (length,) = _LENGTH.unpack(segment_file.read(_LENGTH.size))
+                if offset + _LENGTH.size + length > size:
+                    return
+                segment_file.seek(length, os.SEEK_CUR)
+                offset += _LENGTH.size + length
+                yield offset
+
+    def __valid_size(self, segment: int) -> int:
+        return max(self.__records(segment), default=0)
+
+    def __count(self, segment: int, start: int) -> int:
+        return sum(1 for end in self.__records(segment) if end > start)
@@ -1,5 +1,7 @@
 from typing import Tuple
 
+import numpy as np
+
 
 class ReplayBufferController:
     def record(self, record_tuple: Tuple):
@@ -9,3 +11,31 @@ class ReplayBufferController:
         :return:
         """
         raise NotImplementedError("Subclasses must implement this method")
+
+    def end_episode(self):
+        """
+        Notifies the end of an episode. Nothing to do by default.
+        :return:
+        """
+
+    def close(self):
+        """
+        Releases the resources of the controller, e.g. flushing pending records.
+        Nothing to release by default.
+        :return:
+        """
+
+    @staticmethod
+    def _transition(record_tuple: Tuple) -> Tuple[np.ndarray, ...]:
+        """
+        Flattens the joint observation tuple of the agents into a single transition.
+        :param record_tuple: tuple of (prev_states, actions, rewards, next_states)
+        :return: (state, reward, action, next_state) flat arrays
+        """
+        prev_states, actions, rewards, next_states = record_tuple
+        return (
+            np.ravel(np.asarray(prev_states, dtype=float)),
+            np.ravel(np.asarray(rewards, dtype=float)),
+            np.ravel(np.asarray(actions, dtype=float)),
+            np.ravel(np.asarray(next_states, dtype=float)),
+        )
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
 
 
 class Mode(Enum):
@@ -11,6 +12,62 @@ class Mode(Enum):
     SIMULATION = 2
 
 
+class SensorBackend(Enum):
+    """
+    Enum modelling the available implementations of the agents' sensor
+    """
+
+    RAY_CASTING = 1
+    Z3 = 2
+    Z3_INCREMENTAL = 3
+
+
+class PolicyEngine(Enum):
+    """
+    Enum modelling the available engines to run the actor models
+    """
+
+    TENSORFLOW = 1
+    NUMPY = 2
+
+
+class ExperimentDataFormat(Enum):
+    """
+    Enum modelling the formats the experiment data can be saved in
+    """
+
+    CSV = 1
+    NPY = 2
+
+
+class Backpressure(Enum):
+    """
+    Enum modelling what a full replay buffer client queue does with new transitions
+    """
+
+    BLOCK = 1
+    DROP_OLDEST = 2
+
+
+class ReplayBufferBackend(Enum):
+    """
+    Enum modelling where the transitions are recorded
+    """
+
+    REMOTE = 1
+    LOCAL = 2
+    SPOOLED = 3
+
+
+class WireFormat(Enum):
+    """
+    Enum modelling the encodings of the transitions sent to the replay buffer service
+    """
+
+    JSON = 1
+    BINARY = 2
+
+
 @dataclass(frozen=True)
 class EnvironmentConfig:
     """
@@ -29,6 +86,13 @@ class EnvironmentConfig:
     project_root_path: str
     mode: Mode
     random_seed: int
+    sensor: SensorBackend = SensorBackend.RAY_CASTING
+    policy_engine: PolicyEngine = PolicyEngine.TENSORFLOW
+    experiment_data_format: ExperimentDataFormat = ExperimentDataFormat.CSV
+    telemetry_decimation: int = 1
+    num_envs: int = 1
+    num_workers: int = 0
+    async_pipeline: bool = False
 
 
 @dataclass(frozen=True)
@@ -39,6 +103,21 @@ class ReplayBufferServiceConfig:
 
     replay_buffer_host: str
     replay_buffer_port: int
+    batch_size: int = 32
+    flush_interval: float = 1.0
+    queue_size: int = 1024
+    request_timeout: float = 10.0
+    backpressure: Backpressure = Backpressure.BLOCK
+    wire_format: WireFormat = WireFormat.JSON
+    backend: ReplayBufferBackend = ReplayBufferBackend.REMOTE
+    capacity: int = 100000
+    spill_path: Optional[str] = None
+    spool_path: Optional[str] = None
+    segment_size: int = 64 * 1024 * 1024
+    sync_interval: float = 1.0
+    n_step: int = 1
+    gamma: float = 0.99
+    stride: int = 1
 
 
 @dataclass
@@ -3,10 +3,16 @@ import os
 import yaml
 
 from src.main.model.config.config import (
+    Backpressure,
     EnvironmentConfig,
+    ExperimentDataFormat,
     ReplayBufferServiceConfig,
     LearnerServiceConfig,
     Mode,
+    PolicyEngine,
+    ReplayBufferBackend,
+    SensorBackend,
+    WireFormat,
 )
 
 
@@ -45,6 +51,19 @@ class PredatorPreyConfig:
             if os.environ.get("MODE") == "train"
             else Mode.SIMULATION,
             random_seed=int(os.environ.get("RANDOM_SEED")),
+            sensor=SensorBackend[env_conf.get("sensor", "ray_casting").upper()],
+            policy_engine=PolicyEngine[
+                env_conf.get("policy_engine", "tensorflow").upper()
+            ],
+            experiment_data_format=ExperimentDataFormat[
+                env_conf.get("experiment_data_format", "csv").upper()
+            ],
+            telemetry_decimation=env_conf.get("telemetry_decimation", 1),
+            num_envs=int(os.environ.get("NUM_ENVS", env_conf.get("num_envs", 1))),
+            num_workers=int(
+                os.environ.get("NUM_WORKERS", env_conf.get("num_workers", 0))
+            ),
+            async_pipeline=bool(env_conf.get("async_pipeline", False)),
         )
 
     def replay_buffer_configuration(self) -> ReplayBufferServiceConfig:
@@ -54,7 +73,32 @@ class PredatorPreyConfig:
         """
         return ReplayBufferServiceConfig(
             replay_buffer_host=os.environ.get("REPLAY_BUFFER_HOST"),
-            replay_buffer_port=int(os.environ.get("REPLAY_BUFFER_PORT")),
+            replay_buffer_port=int(os.environ.get("REPLAY_BUFFER_PORT", 0)),
+            batch_size=int(os.environ.get("REPLAY_BUFFER_BATCH_SIZE", 32)),
+            flush_interval=float(os.environ.get("REPLAY_BUFFER_FLUSH_INTERVAL", 1.0)),
+            queue_size=int(os.environ.get("REPLAY_BUFFER_QUEUE_SIZE", 1024)),
+            request_timeout=float(
+                os.environ.get("REPLAY_BUFFER_REQUEST_TIMEOUT", 10.0)
+            ),
+            backpressure=Backpressure[
+                os.environ.get("REPLAY_BUFFER_BACKPRESSURE", "block").upper()
+            ],
+            wire_format=WireFormat[
+                os.environ.get("REPLAY_BUFFER_WIRE_FORMAT", "json").upper()
+            ],
+            backend=ReplayBufferBackend[
+                os.environ.get("REPLAY_BUFFER_BACKEND", "remote").upper()
+            ],
+            capacity=int(os.environ.get("REPLAY_BUFFER_CAPACITY", 100000)),
+            spill_path=os.environ.get("REPLAY_BUFFER_SPILL_PATH"),
+            spool_path=os.environ.get("REPLAY_BUFFER_SPOOL_PATH"),
+            segment_size=int(
+                os.environ.get("REPLAY_BUFFER_SEGMENT_SIZE", 64 * 1024 * 1024)
+            ),
+            sync_interval=float(os.environ.get("REPLAY_BUFFER_SYNC_INTERVAL", 1.0)),
+            n_step=int(os.environ.get("REPLAY_BUFFER_N_STEP", 1)),
+            gamma=float(os.environ.get("REPLAY_BUFFER_GAMMA", 0.99)),
+            stride=int(os.environ.get("REPLAY_BUFFER_STRIDE", 1)),
         )
 
     def learner_service_configuration(self) -> LearnerServiceConfig:
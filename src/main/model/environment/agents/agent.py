@@ -1,8 +1,51 @@
+from src.main.model.environment.world_state import WorldState
+
+
 class Agent:
+    """
+    Read-only view of an agent inside a WorldState. A new agent owns a single-agent
+    state, until the Environment binds it to the state of the whole population.
+    """
+
+    __slots__ = ("id", "agent_type", "_state", "_index")
+
     def __init__(self, id, x, y, vx, vy, agent_type):
         self.id = id
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
         self.agent_type = agent_type
+        state = WorldState(1)
+        state.kinematics[:, 0] = (x, y, vx, vy)
+        state.type[0] = agent_type.value
+        self.bind(state, 0)
+
+    def bind(self, state: WorldState, index: int):
+        """
+        Makes the agent a view of the given row of the state.
+        :param state: WorldState
+        :param index: row of the agent
+        """
+        self._state = state
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def x(self):
+        return self._state.x[self._index]
+
+    @property
+    def y(self):
+        return self._state.y[self._index]
+
+    @property
+    def vx(self):
+        return self._state.vx[self._index]
+
+    @property
+    def vy(self):
+        return self._state.vy[self._index]
+
+    @property
+    def alive(self) -> bool:
+        return bool(self._state.alive[self._index])
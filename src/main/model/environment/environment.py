@@ -1,12 +1,102 @@
-from typing import List
+from typing import List, Tuple
+
+import numpy as np
 
 from src.main.model.environment.agents.agent import Agent
+from src.main.model.environment.spatial_grid import SpatialGrid
+from src.main.model.environment.world_state import WorldState
 
 
 class Environment:
-    def __init__(self, x_dim: int = 500, y_dim: int = 500, agents: List[Agent] = None):
+    def __init__(
+        self,
+        x_dim: int = 500,
+        y_dim: int = 500,
+        agents: List[Agent] = None,
+        cell_size: float = None,
+        state: WorldState = None,
+    ):
         if agents is None:
             agents = []
         self.x_dim = x_dim
         self.y_dim = y_dim
         self.agents = agents
+        # The population state is owned by the environment as arrays, while agents
+        # become read-only views of their row. A given state, e.g. one world of
+        # a stacked WorldState, is filled in place
+        self.state = state if state is not None else WorldState(len(agents))
+        for i, agent in enumerate(agents):
+            self.state.kinematics[:, i] = (agent.x, agent.y, agent.vx, agent.vy)
+            self.state.type[i] = agent.agent_type.value
+            self.state.alive[i] = agent.alive
+            agent.bind(self.state, i)
+        self.__indices = {agent.id: i for i, agent in enumerate(agents)}
+        # Without a cell size the whole environment falls in a single cell
+        self.grid = SpatialGrid(cell_size if cell_size else max(x_dim, y_dim))
+        self.reindex()
+
+    def index_of(self, agent_id: str) -> int:
+        """
+        Gets the row of an agent in the state arrays.
+        :param agent_id: agent id
+        :return: index of the agent
+        """
+        return self.__indices[agent_id]
+
+    def randomize(self):
+        """
+        Re-randomizes the agents' positions and velocities, with one uniform draw
+        for each (agent, x/y/vx/vy) in the same order and from the same distributions
+        of drawing them one agent at a time, then rebuilds the spatial index.
+        """
+        self.state.kinematics[:] = (
+            np.random.random_sample((len(self.state), 4))
+            * (self.x_dim, self.y_dim, 10, 10)
+        ).T
+        self.reindex()
+
+    def reindex(self):
+        """
+        Rebuilds the spatial index from scratch, e.g. after all the agents were moved.
+        """
+        self.grid.clear()
+        for i, (x, y) in enumerate(self.state.positions().tolist()):
+            self.grid.insert(i, x, y)
+        self.__cells = self.grid.cells(self.state.x, self.state.y)
+
+    def update_positions(self):
+        """
+        Updates the spatial index after any number of agents moved, touching
+        the grid only for the agents that changed cell.
+        """
+        cells = self.grid.cells(self.state.x, self.state.y)
+        changed = (cells[0] != self.__cells[0]) | (cells[1] != self.__cells[1])
+        for i in np.flatnonzero(changed).tolist():
+            self.move(i)
+        self.__cells = cells
+
+    def move(self, index: int):
+        """
+        Updates the spatial index after the agent of the given row moved.
+        :param index: index of the agent
+        """
+        self.grid.move(index, self.state.x[index], self.state.y[index])
+        self.__cells[0][index], self.__cells[1][index] = self.grid.cells(
+            self.state.x[index], self.state.y[index]
+        )
+
+    def candidate_pairs(self, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the (i, j) pairs of agent indices where agent j is a candidate neighbour
+        of agent i within the given radius. Pairs are sorted by i.
+        :param radius: search radius
+        :return: the arrays of indices i and j
+        """
+        rows, cols = [], []
+        for i, (x, y) in enumerate(self.state.positions().tolist()):
+            neighbours = self.grid.query(x, y, radius)
+            rows.extend([i] * len(neighbours))
+            cols.extend(neighbours)
+        rows, cols = np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
+        others = rows != cols
+        return rows[others], cols[others]
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class PipelineMetrics:
+    """
+    Value object representing a snapshot of the step pipeline metrics, where
+    phase_times holds the time spent in each phase and overlap is how much of it
+    ran concurrently with other phases. Since only the record and telemetry
+    phases run off the step, overlap is the part of the I/O time hidden behind
+    the sense, act and move phases
+    """
+
+    steps: int
+    wall_time: float
+    phase_times: Dict[str, float]
+
+    @property
+    def overlap(self) -> float:
+        return sum(self.phase_times.values()) - self.wall_time
@@ -0,0 +1,87 @@
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+
+class SpatialGrid:
+    """
+    Uniform grid (spatial hash) indexing the agents by the cell they lie in,
+    so that neighbor queries only visit the cells around the query point.
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.__cells: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self.__cell_of: Dict[int, Tuple[int, int]] = {}
+
+    def __cell(self, x: float, y: float) -> Tuple[int, int]:
+        # Always in double precision, to match the vectorized cells()
+        return int(float(x) // self.cell_size), int(float(y) // self.cell_size)
+
+    def cells(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the cells of many points at once.
+        :param xs: x-coordinates
+        :param ys: y-coordinates
+        :return: arrays of the cells' column and row
+        """
+        return (
+            np.floor_divide(np.asarray(xs, dtype=float), self.cell_size).astype(int),
+            np.floor_divide(np.asarray(ys, dtype=float), self.cell_size).astype(int),
+        )
+
+    def insert(self, key: int, x: float, y: float):
+        """
+        Adds an element to the grid.
+        :param key: element key
+        :param x: x-coordinate of the element
+        :param y: y-coordinate of the element
+        """
+        cell = self.__cell(x, y)
+        self.__cells[cell].add(key)
+        self.__cell_of[key] = cell
+
+    def move(self, key: int, x: float, y: float):
+        """
+        Updates the position of an element, touching the buckets only if its cell changed.
+        :param key: element key
+        :param x: new x-coordinate of the element
+        :param y: new y-coordinate of the element
+        """
+        cell = self.__cell(x, y)
+        old_cell = self.__cell_of[key]
+        if cell != old_cell:
+            self.__cells[old_cell].discard(key)
+            if not self.__cells[old_cell]:
+                del self.__cells[old_cell]
+            self.__cells[cell].add(key)
+            self.__cell_of[key] = cell
+
+    def clear(self):
+        """
+        Removes all the elements from the grid.
+        """
+        self.__cells.clear()
+        self.__cell_of.clear()
+
+    def query(self, x: float, y: float, radius: float) -> List[int]:
+        """
+        Gets the candidate elements whose distance on both axes from (x, y) may be lower
+        than radius, that is all the elements of the cells overlapping that square.
+        :param x: x-coordinate of the query point
+        :param y: y-coordinate of the query point
+        :param radius: half side of the query square
+        :return: list of keys
+        """
+        (x_min, y_min), (x_max, y_max) = (
+            self.__cell(x - radius, y - radius),
+            self.__cell(x + radius, y + radius),
+        )
+        candidates = []
+        for cx in range(x_min, x_max + 1):
+            for cy in range(y_min, y_max + 1):
+                cell = self.__cells.get((cx, cy))
+                if cell:
+                    candidates.extend(cell)
+        return candidates
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Termination:
+    """
+    Value object representing the outcome of the termination check of a step,
+    where done is an array with one outcome for each world of stacked worlds
+    """
+
+    caught: np.ndarray
+    predator_lives: np.ndarray
+    done: Union[bool, np.ndarray]
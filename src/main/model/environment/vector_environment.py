@@ -0,0 +1,62 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from src.main.model.environment.agents.agent import Agent
+from src.main.model.environment.environment import Environment
+from src.main.model.environment.world_state import WorldState
+
+
+class VectorEnvironment:
+    """
+    K independent worlds of the same population, whose states are stacked in a single
+    WorldState so that they can be stepped together. Each world is an Environment
+    working on its own view of the stacked arrays, with its own spatial index.
+    """
+
+    def __init__(
+        self,
+        x_dim: int,
+        y_dim: int,
+        populations: List[List[Agent]],
+        cell_size: float = None,
+    ):
+        self.x_dim = x_dim
+        self.y_dim = y_dim
+        self.state = WorldState(len(populations[0]), num_worlds=len(populations))
+        self.environments = [
+            Environment(
+                x_dim=x_dim,
+                y_dim=y_dim,
+                agents=agents,
+                cell_size=cell_size,
+                state=self.state.world(k),
+            )
+            for k, agents in enumerate(populations)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.environments)
+
+    def update_positions(self):
+        """
+        Updates the spatial index of every world after any number of agents moved.
+        """
+        for environment in self.environments:
+            environment.update_positions()
+
+    def candidate_pairs(self, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the (i, j) pairs of candidate neighbours of every world, where i and j
+        index the agents of all the worlds flattened in world order, so that agents
+        of different worlds are never paired. Pairs are sorted by i.
+        :param radius: search radius
+        :return: the arrays of indices i and j
+        """
+        size = len(self.state)
+        rows, cols = [], []
+        for k, environment in enumerate(self.environments):
+            world_rows, world_cols = environment.candidate_pairs(radius)
+            rows.append(world_rows + k * size)
+            cols.append(world_cols + k * size)
+        return np.concatenate(rows), np.concatenate(cols)
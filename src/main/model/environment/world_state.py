@@ -0,0 +1,44 @@
+from typing import Optional
+
+import numpy as np
+
+
+class WorldState:
+    """
+    Structure of arrays holding the state of a population of agents, where the
+    kinematics (x, y, vx, vy) are the rows of a single contiguous float32 block.
+    The state of many worlds of the same population can be stacked in one block,
+    with the world as the leading axis of each row.
+    """
+
+    __slots__ = ("kinematics", "x", "y", "vx", "vy", "type", "alive")
+
+    def __init__(self, size: int, num_worlds: Optional[int] = None):
+        shape = (size,) if num_worlds is None else (num_worlds, size)
+        self.kinematics = np.zeros((4, *shape), dtype=np.float32)
+        self.x, self.y, self.vx, self.vy = self.kinematics
+        self.type = np.zeros(shape, dtype=np.int8)
+        self.alive = np.ones(shape, dtype=bool)
+
+    def __len__(self) -> int:
+        return self.type.shape[-1]
+
+    def positions(self) -> np.ndarray:
+        """
+        Gets the agents' coordinates, without copying them.
+        :return: (N, 2) view of x and y, or (K, N, 2) if the worlds are stacked
+        """
+        return self.kinematics[:2].transpose((*range(1, self.kinematics.ndim), 0))
+
+    def world(self, index: int) -> "WorldState":
+        """
+        Gets the state of one of the stacked worlds, without copying it.
+        :param index: index of the world
+        :return: WorldState sharing its arrays with this one
+        """
+        state = WorldState.__new__(WorldState)
+        state.kinematics = self.kinematics[:, index]
+        state.x, state.y, state.vx, state.vy = state.kinematics
+        state.type = self.type[index]
+        state.alive = self.alive[index]
+        return state
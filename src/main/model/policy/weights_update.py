@@ -0,0 +1,60 @@
+import io
+import struct
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+# Prefix of the weights-only messages. Full models are .keras zip archives,
+# which start with the zip signature instead.
+WEIGHTS_UPDATE_MAGIC = b"PPWU"
+_VERSION = struct.Struct("<Q")
+
+
+@dataclass(frozen=True)
+class WeightsUpdate:
+    """
+    Value object representing a weights-only actor update, with the weight tensors
+    in the order of Keras get_weights and a monotonically increasing version.
+
+    The wire format is the magic prefix, the version as a little-endian uint64 and
+    the tensors as an uncompressed .npz payload.
+    """
+
+    version: int
+    weights: List[np.ndarray]
+
+    @staticmethod
+    def is_weights_update(body: bytes) -> bool:
+        """
+        Checks if a message carries a weights-only update rather than a full model.
+        :param body: message body
+        :return: True if it is a weights-only update
+        """
+        return body[: len(WEIGHTS_UPDATE_MAGIC)] == WEIGHTS_UPDATE_MAGIC
+
+    @classmethod
+    def from_bytes(cls, body: bytes):
+        """
+        Decodes a weights-only update.
+        :param body: message body
+        :return: WeightsUpdate
+        """
+        if not cls.is_weights_update(body):
+            raise ValueError("The message is not a weights-only update")
+        offset = len(WEIGHTS_UPDATE_MAGIC)
+        (version,) = _VERSION.unpack_from(body, offset)
+        with np.load(io.BytesIO(body[offset + _VERSION.size :])) as arrays:
+            weights = [arrays[f"arr_{i}"] for i in range(len(arrays.files))]
+        return cls(version, weights)
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the update, e.g. on the learner side with model.get_weights().
+        :return: message body
+        """
+        payload = io.BytesIO()
+        payload.write(WEIGHTS_UPDATE_MAGIC)
+        payload.write(_VERSION.pack(self.version))
+        np.savez(payload, *self.weights)
+        return payload.getvalue()
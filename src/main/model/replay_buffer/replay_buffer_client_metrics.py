@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ReplayBufferClientMetrics:
+    """
+    Value object representing a snapshot of the replay buffer client metrics
+    """
+
+    queue_depth: int
+    recorded: int
+    sent: int
+    dropped: int
+    failed: int
+    batches: int
+    last_send_latency: float
+    mean_send_latency: float
@@ -0,0 +1,127 @@
+import struct
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Content type of the binary /record_data/ body
+TRANSITION_BATCH_CONTENT_TYPE = "application/x-transition-batch"
+TRANSITION_BATCH_MAGIC = b"PPTB"
+TRANSITION_BATCH_VERSION = 1
+# magic, version, number of agents, number of transitions, state and action size
+_HEADER = struct.Struct("<4sBxHIHH")
+
+
+@dataclass(frozen=True)
+class TransitionBatch:
+    """
+    Value object representing a batch of joint transitions as a single float32
+    (transitions x columns) matrix, whose columns are the flattened states, rewards,
+    actions and next states of all the agents, in the order of the JSON body.
+
+    The wire format is a fixed little-endian header with the magic, the version,
+    the number of agents and transitions and the per-agent state and action sizes,
+    followed by the row-major matrix.
+    """
+
+    num_agents: int
+    state_size: int
+    action_size: int
+    matrix: np.ndarray
+
+    @staticmethod
+    def columns(num_agents: int, state_size: int, action_size: int) -> int:
+        """
+        Gets the number of columns of a transition row.
+        :param num_agents: number of agents
+        :param state_size: state size of a single agent
+        :param action_size: action size of a single agent
+        :return: number of columns
+        """
+        return num_agents * (2 * state_size + action_size + 1)
+
+    @classmethod
+    def from_transitions(
+        cls,
+        transitions: List[Tuple[np.ndarray, ...]],
+        out: Optional[np.ndarray] = None,
+    ):
+        """
+        Copies flat transitions into a matrix, without any per-element conversion.
+        :param transitions: list of (state, reward, action, next_state) flat arrays
+        :param out: optional preallocated float32 matrix with at least
+            len(transitions) rows, whose leading rows are filled and used
+        :return: TransitionBatch
+        """
+        state, reward, action, _ = transitions[0]
+        num_agents = len(reward)
+        state_size, action_size = len(state) // num_agents, len(action) // num_agents
+        width = cls.columns(num_agents, state_size, action_size)
+        if out is None or out.shape[1] != width or len(out) < len(transitions):
+            out = np.empty((len(transitions), width), dtype=np.float32)
+        matrix = out[: len(transitions)]
+        for row, transition in zip(matrix, transitions):
+            np.concatenate(transition, out=row, casting="same_kind")
+        return cls(num_agents, state_size, action_size, matrix)
+
+    @classmethod
+    def from_bytes(cls, body: bytes):
+        """
+        Decodes a binary batch, the reference decoder of the wire format.
+        :param body: message body
+        :return: TransitionBatch
+        """
+        magic, version, num_agents, rows, state_size, action_size = _HEADER.unpack_from(
+            body
+        )
+        if magic != TRANSITION_BATCH_MAGIC:
+            raise ValueError("The message is not a binary transition batch")
+        if version != TRANSITION_BATCH_VERSION:
+            raise ValueError(f"Unsupported transition batch version {version}")
+        matrix = np.frombuffer(body, dtype="<f4", offset=_HEADER.size).reshape(
+            rows, cls.columns(num_agents, state_size, action_size)
+        )
+        return cls(num_agents, state_size, action_size, matrix)
+
+    def to_bytes(self) -> bytes:
+        """
+        Encodes the batch.
+        :return: message body
+        """
+        header = _HEADER.pack(
+            TRANSITION_BATCH_MAGIC,
+            TRANSITION_BATCH_VERSION,
+            self.num_agents,
+            len(self.matrix),
+            self.state_size,
+            self.action_size,
+        )
+        return header + self.matrix.astype("<f4", copy=False).tobytes()
+
+    def split(self) -> Tuple[np.ndarray, ...]:
+        """
+        Splits the matrix columns, without copying them.
+        :return: (states, rewards, actions, next_states) views of the matrix
+        """
+        states_end = self.num_agents * self.state_size
+        rewards_end = states_end + self.num_agents
+        actions_end = rewards_end + self.num_agents * self.action_size
+        return (
+            self.matrix[:, :states_end],
+            self.matrix[:, states_end:rewards_end],
+            self.matrix[:, rewards_end:actions_end],
+            self.matrix[:, actions_end:],
+        )
+
+    def to_json(self) -> dict:
+        """
+        Converts the batch into the equivalent JSON /record_data/ body.
+        :return: JSON body
+        """
+        states, rewards, actions, next_states = self.split()
+        return {
+            "State": states.tolist(),
+            "Reward": rewards.tolist(),
+            "Action": actions.tolist(),
+            "Next State": next_states.tolist(),
+        }
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import numpy as np
 
@@ -18,16 +19,35 @@ def train():
     Run Predator Prey Service in Training mode
     :return:
     """
-    init = True
-    while True:
-        logging.info("Starting Predator-Prey Training...")
-        env_controller: EnvironmentController = (
-            EnvironmentControllerFactory().create_predator_prey_learning(
-                init=init, pred_prey_config=PredatorPreyConfig()
+    pred_prey_config = PredatorPreyConfig()
+    env_config = pred_prey_config.environment_configuration()
+    if env_config.num_envs > 1 or env_config.num_workers > 0:
+        # The worlds are stepped in lockstep and reset as soon as they are done
+        logging.info("Starting Predator-Prey Vector Training...")
+        vector_controller = (
+            EnvironmentControllerFactory().create_predator_prey_vector_learning(
+                init=True, pred_prey_config=pred_prey_config
             )
         )
-        env_controller.train()
-        init = False
+        # Stops the workers and releases the shared memory even if a worker died
+        try:
+            vector_controller.train()
+        finally:
+            vector_controller.stop()
+        return
+    # The world is built once, every following episode just resets it
+    env_controller: EnvironmentController = (
+        EnvironmentControllerFactory().create_predator_prey_learning(
+            init=True, pred_prey_config=pred_prey_config
+        )
+    )
+    while True:
+        logging.info("Starting Predator-Prey Training...")
+        if env_config.async_pipeline:
+            asyncio.run(env_controller.train_async())
+        else:
+            env_controller.train()
+        env_controller.reset()
 
 
 def simulate():
@@ -35,19 +55,31 @@ def simulate():
     Run Predator Prey Service in Simulation mode
     :return:
     """
-    init = True
     predator_prey_config = PredatorPreyConfig()
     # Set seed for reproducibility
-    np.random.seed(predator_prey_config.environment_configuration().random_seed)
-    while True:
-        logging.info("Starting Predator-Prey Simulation...")
-        env_controller: EnvironmentController = (
-            EnvironmentControllerFactory().create_predator_prey_simulation(
-                init=init, pred_prey_config=predator_prey_config
+    env_config = predator_prey_config.environment_configuration()
+    np.random.seed(env_config.random_seed)
+    if env_config.num_envs > 1 or env_config.num_workers > 0:
+        logging.info("Starting Predator-Prey Vector Simulation...")
+        vector_controller = (
+            EnvironmentControllerFactory().create_predator_prey_vector_simulation(
+                init=True, pred_prey_config=predator_prey_config
             )
         )
+        try:
+            vector_controller.simulate()
+        finally:
+            vector_controller.stop()
+        return
+    env_controller: EnvironmentController = (
+        EnvironmentControllerFactory().create_predator_prey_simulation(
+            init=True, pred_prey_config=predator_prey_config
+        )
+    )
+    while True:
+        logging.info("Starting Predator-Prey Simulation...")
         env_controller.simulate()
-        init = False
+        env_controller.reset()
 
 
 if __name__ == "__main__":
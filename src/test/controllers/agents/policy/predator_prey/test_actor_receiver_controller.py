@@ -0,0 +1,116 @@
+from threading import Event, Thread
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from src.main.controllers.agents.policy.predator_prey import actor_receiver_controller
+from src.main.controllers.agents.policy.predator_prey.actor_receiver_controller import (
+    ActorReceiverController,
+)
+from src.main.model.policy.weights_update import WeightsUpdate
+
+
+class FakeActor:
+    def __init__(self, body: bytes):
+        self.body = body
+        self.weights = None
+
+    def set_weights(self, weights):
+        self.weights = weights
+
+    def __call__(self, states):
+        return self.weights
+
+
+@pytest.fixture
+def receiver(tmp_path, monkeypatch):
+    """
+    Receiver restarted from a saved model, with the broker connection stubbed out,
+    together with the list of the actors it loaded.
+    """
+    monkeypatch.setattr(
+        actor_receiver_controller.pika, "BlockingConnection", mock.Mock()
+    )
+    model_path = tmp_path / "actor.keras"
+    model_path.write_bytes(b"model")
+    loaded = []
+
+    def load_actor(body: bytes) -> FakeActor:
+        loaded.append(FakeActor(body))
+        return loaded[-1]
+
+    receiver = ActorReceiverController(
+        False, "broker", str(model_path), "actor", load_actor
+    )
+    receiver.reader_grace_period = 0.1
+    yield receiver, loaded, model_path
+    receiver.stop()
+
+
+def receive(receiver: ActorReceiverController, body: bytes):
+    receiver._ActorReceiverController__update_actor_callback(None, None, None, body)
+
+
+def weights(version: int) -> bytes:
+    return WeightsUpdate(version, [np.full(2, version, dtype=np.float32)]).to_bytes()
+
+
+def test_weights_are_set_in_place_on_the_released_standby_actor(receiver):
+    receiver, loaded, _ = receiver
+    for version in range(4):
+        receive(receiver, weights(version))
+        with receiver.latest_actor() as actor:
+            assert actor.weights[0][0] == version
+    # The first update builds the second slot, the following ones reuse both
+    assert len(loaded) == 2
+
+
+def test_a_held_actor_is_never_updated(receiver):
+    receiver, loaded, _ = receiver
+    receive(receiver, weights(0))
+    receive(receiver, weights(1))
+    held, release, seen = Event(), Event(), []
+
+    def read():
+        with receiver.latest_actor() as actor:
+            held.set()
+            release.wait()
+            seen.append(actor.weights[0][0])
+
+    reader = Thread(target=read)
+    reader.start()
+    held.wait()
+    receive(receiver, weights(2))
+    # The actor of version 1 is still held, so version 3 goes to a new actor
+    receive(receiver, weights(3))
+    release.set()
+    reader.join()
+    assert seen == [1]
+    assert len(loaded) == 3
+    with receiver.latest_actor() as actor:
+        assert actor.weights[0][0] == 3
+
+
+def test_a_new_model_rebuilds_the_standby_actor(receiver):
+    receiver, loaded, _ = receiver
+    receive(receiver, weights(0))
+    receive(receiver, b"new model")
+    receive(receiver, weights(1))
+    with receiver.latest_actor() as actor:
+        assert actor.body == b"new model"
+        assert actor.weights[0][0] == 1
+
+
+def test_stop_writes_the_pending_disk_copy(receiver):
+    receiver, _, model_path = receiver
+    receive(receiver, b"new model")
+    receive(receiver, weights(5))
+    receiver.stop()
+    assert model_path.read_bytes() == b"new model"
+    assert (
+        WeightsUpdate.from_bytes(
+            (model_path.parent / "actor.keras.weights").read_bytes()
+        ).version
+        == 5
+    )
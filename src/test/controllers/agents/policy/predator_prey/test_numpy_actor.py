@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from src.main.controllers.agents.policy.predator_prey.numpy_actor import NumpyActor
+
+NUM_STATES = 8
+
+
+@pytest.fixture
+def keras_actor(tmp_path):
+    """
+    Actor saved as a .keras file, chaining Dense and Activation layers with
+    every supported activation.
+    """
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential(
+        [
+            tf.keras.Input(shape=(NUM_STATES,)),
+            tf.keras.layers.Dense(32, activation="relu"),
+            tf.keras.layers.Dense(32, activation="sigmoid"),
+            tf.keras.layers.Dense(16, use_bias=False),
+            tf.keras.layers.Activation("tanh"),
+            tf.keras.layers.Dropout(0.5),
+            tf.keras.layers.Dense(4, activation="softmax"),
+            tf.keras.layers.Dense(2, activation="tanh"),
+        ]
+    )
+    path = str(tmp_path / "actor.keras")
+    model.save(path)
+    return model, path
+
+
+def states(batch_size: int) -> np.ndarray:
+    return np.random.default_rng(0).uniform(0, 1, (batch_size, NUM_STATES))
+
+
+def test_outputs_match_keras(keras_actor):
+    model, path = keras_actor
+    actor = NumpyActor.from_keras_file(path)
+    for batch_size in [1, 64]:
+        np.testing.assert_allclose(
+            actor(states(batch_size)),
+            model(states(batch_size).astype(np.float32)).numpy(),
+            rtol=1e-5,
+            atol=1e-6,
+        )
+
+
+def test_set_weights_matches_keras(keras_actor):
+    model, path = keras_actor
+    actor = NumpyActor.from_keras_file(path)
+    rng = np.random.default_rng(1)
+    weights = [rng.standard_normal(w.shape) for w in model.get_weights()]
+    model.set_weights(weights)
+    actor.set_weights(weights)
+    np.testing.assert_allclose(
+        actor(states(16)),
+        model(states(16).astype(np.float32)).numpy(),
+        rtol=1e-5,
+        atol=1e-6,
+    )
+
+
+@pytest.mark.parametrize(
+    "layer",
+    [
+        tf.keras.layers.BatchNormalization(),
+        tf.keras.layers.Dense(4, activation="elu"),
+    ],
+)
+def test_unsupported_layers_raise_a_clear_error(tmp_path, layer):
+    model = tf.keras.Sequential([tf.keras.Input(shape=(NUM_STATES,)), layer])
+    path = str(tmp_path / "actor.keras")
+    model.save(path)
+    with pytest.raises(ValueError, match="Unsupported .* in the NumPy actor"):
+        NumpyActor.from_keras_file(path)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.main.controllers.agents.sensor.incremental_z3_sensor import (
+    IncrementalZ3Sensor,
+)
+from src.main.controllers.agents.sensor.ray_casting_sensor import RayCastingSensor
+from src.main.controllers.agents.sensor.z3_sensor import Z3Sensor
+
+NUM_STATES = 8
+R = 1.0
+VD = 6.0
+
+
+def assert_sensors_agree(origin, cds):
+    cds = np.array(cds, dtype=float).reshape(-1, 2)
+    expected = Z3Sensor(NUM_STATES, R, VD).sense(origin, cds)
+    for sensor in [RayCastingSensor, IncrementalZ3Sensor]:
+        np.testing.assert_allclose(
+            sensor(NUM_STATES, R, VD).sense(origin, cds), expected, atol=1e-6
+        )
+    return expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_scenes(seed):
+    rng = np.random.default_rng(seed)
+    origin = tuple(rng.uniform(0, 10, 2))
+    cds = rng.uniform(0, 10, (rng.integers(1, 6), 2))
+    assert_sensors_agree(origin, cds)
+
+
+@pytest.mark.parametrize(
+    "origin, cds",
+    [
+        # Agent on each side and corner of a box
+        ((3.0, 3.0), [[4.0, 3.0]]),
+        ((3.0, 3.0), [[2.0, 3.0]]),
+        ((3.0, 3.0), [[3.0, 4.0]]),
+        ((3.0, 3.0), [[3.0, 2.0]]),
+        ((3.0, 3.0), [[4.0, 4.0]]),
+        ((3.0, 3.0), [[2.0, 2.0]]),
+        # Agent on the environment border
+        ((0.0, 0.0), [[0.0, 1.0], [1.5, 0.0]]),
+    ],
+)
+def test_agent_touching_a_border(origin, cds):
+    state = assert_sensors_agree(origin, cds)
+    assert np.any(state == 0)
+
+
+@pytest.mark.parametrize(
+    "cds",
+    [
+        [[3.0, 3.0]],
+        [[3.5, 3.2]],
+        [[3.5, 3.2], [2.8, 3.9]],
+    ],
+)
+def test_overlapping_agents(cds):
+    state = assert_sensors_agree((3.0, 3.0), cds)
+    assert np.all((0 < state) & (state < 1))
+
+
+@pytest.mark.parametrize("cds", [[], [[20.0, 20.0]], [[3.0 + VD + R, 3.0]]])
+def test_nothing_in_range(cds):
+    state = assert_sensors_agree((3.0, 3.0), cds)
+    np.testing.assert_allclose(state, np.ones(NUM_STATES))
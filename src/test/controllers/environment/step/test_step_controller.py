@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from src.main.controllers.environment.step.step_controller import StepController
+from src.main.model.environment.agents.predator import Predator
+from src.main.model.environment.agents.prey import Prey
+from src.main.model.environment.environment import Environment
+from src.main.model.environment.vector_environment import VectorEnvironment
+from src.main.model.environment.world_state import WorldState
+
+X_DIM, Y_DIM, T_STEP = 50, 40, 1
+
+
+def population(size: int = 30):
+    return [
+        Predator(f"predator_{i}", 0, 0) if i % 3 == 0 else Prey(f"prey_{i}", 0, 0)
+        for i in range(size)
+    ]
+
+
+def actions(rng: np.random.Generator, shape) -> np.ndarray:
+    """
+    Actions with negative speeds and speeds pushing the agents out of the environment.
+    """
+    speeds = rng.uniform(-30, 30, shape)
+    turns = rng.uniform(-2 * np.pi, 2 * np.pi, shape)
+    return np.stack([speeds, turns], axis=-1)
+
+
+def baseline_step(state: WorldState, actions: np.ndarray):
+    """
+    Per-agent step the vectorized one replaced.
+    """
+    for i, (v, turn) in enumerate(actions.tolist()):
+        state.vx[i], state.vy[i] = np.abs(v) * np.cos(turn), np.abs(v) * np.sin(turn)
+        next_x = state.x[i] + state.vx[i] * T_STEP
+        next_y = state.y[i] + state.vy[i] * T_STEP
+        state.x[i], state.y[i] = (
+            np.clip(next_x, 0, X_DIM - 1),
+            np.clip(next_y, 0, Y_DIM - 1),
+        )
+
+
+def copy(state: WorldState) -> WorldState:
+    expected = WorldState(len(state))
+    expected.kinematics[:] = state.kinematics
+    return expected
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_step_matches_the_per_agent_step(seed):
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    environment = Environment(X_DIM, Y_DIM, population(), cell_size=5)
+    environment.randomize()
+    step_controller = StepController(environment, T_STEP)
+    expected = copy(environment.state)
+    clipped = np.zeros(len(expected), dtype=bool)
+    for _ in range(20):
+        step_actions = actions(rng, len(expected))
+        step_controller.step(step_actions)
+        baseline_step(expected, step_actions)
+        np.testing.assert_array_equal(environment.state.kinematics, expected.kinematics)
+        clipped |= np.isin(expected.x, [0, X_DIM - 1])
+        clipped |= np.isin(expected.y, [0, Y_DIM - 1])
+    assert clipped.any()
+
+    # The spatial index followed the agents that changed cell
+    moved = set(zip(*environment.candidate_pairs(6)))
+    environment.reindex()
+    assert moved == set(zip(*environment.candidate_pairs(6)))
+
+
+def test_step_of_stacked_worlds_matches_the_per_agent_step():
+    np.random.seed(0)
+    rng = np.random.default_rng(0)
+    environment = VectorEnvironment(
+        X_DIM, Y_DIM, [population() for _ in range(4)], cell_size=5
+    )
+    for world in environment.environments:
+        world.randomize()
+    step_controller = StepController(environment, T_STEP)
+    expected = [copy(world.state) for world in environment.environments]
+    for _ in range(10):
+        step_actions = actions(rng, (4, len(expected[0])))
+        step_controller.step(step_actions)
+        for k, world in enumerate(environment.environments):
+            baseline_step(expected[k], step_actions[k])
+            np.testing.assert_array_equal(
+                world.state.kinematics, expected[k].kinematics
+            )
@@ -0,0 +1,68 @@
+import time
+from threading import Event
+
+import numpy as np
+
+from src.main.controllers.environment.telemetry.telemetry_controller import (
+    TelemetryController,
+)
+
+
+class FailingUtils:
+    """
+    Experiment files failing to save the odd steps.
+    """
+
+    def __init__(self):
+        self.saved, self.closed = [], False
+
+    def save_data(self, rewards, positions, timestamp):
+        if len(self.saved) % 2 == 1:
+            self.saved.append(None)
+            raise OSError("No space left on device")
+        self.saved.append(rewards)
+
+    def reset(self, timestamp):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class BlockedUtils(FailingUtils):
+    def __init__(self):
+        super().__init__()
+        self.release = Event()
+
+    def save_data(self, rewards, positions, timestamp):
+        self.release.wait()
+
+
+def snapshot(i: int):
+    return np.full(2, float(i)), np.zeros((2, 2))
+
+
+def test_failed_writes_do_not_stop_the_writer():
+    utils = FailingUtils()
+    telemetry = TelemetryController(utils)
+    for i in range(6):
+        telemetry.record(*snapshot(i))
+    telemetry.close()
+
+    assert utils.saved == [[0.0, 0.0], None, [2.0, 2.0], None, [4.0, 4.0], None]
+    assert telemetry.failed == 3
+    assert utils.closed
+
+
+def test_close_returns_when_the_writer_is_stuck():
+    utils = BlockedUtils()
+    telemetry = TelemetryController(utils, queue_size=2)
+    for i in range(5):
+        telemetry.record(*snapshot(i))
+    start = time.monotonic()
+    telemetry.close(timeout=0.2)
+
+    assert time.monotonic() - start < 1
+    assert telemetry.dropped > 0
+    assert not utils.closed
+    utils.release.set()
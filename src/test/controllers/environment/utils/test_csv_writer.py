@@ -0,0 +1,124 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.main.controllers.environment.utils.csv_writer import CsvWriter
+from src.main.controllers.environment.utils.environment_controller_utils import (
+    EnvironmentControllerUtils,
+)
+
+COLUMNS = ["elapsed_time", "r_0", "r_1"]
+
+
+def write(path: str, start: int, stop: int, flush_interval: float = 60):
+    writer = CsvWriter(path, flush_interval)
+    for i in range(start, stop):
+        writer.append(COLUMNS, [i / 10, float(i), -float(i)])
+    return writer
+
+
+def read(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, index_col=0)
+
+
+def test_rows_match_the_pandas_layout(tmp_path):
+    path = str(tmp_path / "rewards.csv")
+    write(path, 0, 3).close()
+
+    expected = pd.DataFrame(
+        [[i / 10, float(i), -float(i)] for i in range(3)], columns=COLUMNS
+    )
+    pd.testing.assert_frame_equal(read(path), expected)
+
+
+def test_rows_are_flushed_every_flush_interval(tmp_path):
+    path = str(tmp_path / "rewards.csv")
+    buffered = write(path, 0, 3, flush_interval=60)
+    assert os.path.getsize(path) == 0
+    buffered.flush()
+    assert len(read(path)) == 3
+    buffered.close()
+
+    path = str(tmp_path / "positions.csv")
+    flushed = write(path, 0, 3, flush_interval=0)
+    assert len(read(path)) == 3
+    flushed.close()
+
+
+def test_resume_continues_the_index(tmp_path):
+    path = str(tmp_path / "rewards.csv")
+    write(path, 0, 3).close()
+    writer = write(path, 3, 5)
+    assert writer.index == 5
+    writer.close()
+
+    assert read(path).index.tolist() == list(range(5))
+    assert read(path)["r_0"].tolist() == [float(i) for i in range(5)]
+
+
+def test_resume_drops_a_truncated_last_row(tmp_path):
+    path = str(tmp_path / "rewards.csv")
+    write(path, 0, 3).close()
+    with open(path, "a") as f:
+        f.write("3,0.3,3.")
+
+    writer = write(path, 3, 5)
+    assert writer.index == 5
+    writer.close()
+    assert read(path).index.tolist() == list(range(5))
+    assert read(path)["r_1"].tolist() == [-float(i) for i in range(5)]
+
+
+def test_resume_a_header_only_file(tmp_path):
+    path = str(tmp_path / "rewards.csv")
+    with open(path, "w") as f:
+        f.write(f",{','.join(COLUMNS)}\n")
+
+    writer = write(path, 0, 2)
+    assert writer.index == 2
+    writer.close()
+    assert list(read(path).columns) == COLUMNS
+    assert read(path).index.tolist() == [0, 1]
+
+
+def test_resume_walks_back_over_long_rows(tmp_path):
+    path = str(tmp_path / "positions.csv")
+    columns = [f"x_{i}" for i in range(1000)]
+    writer = CsvWriter(path, flush_interval=60)
+    for i in range(3):
+        writer.append(columns, [float(i)] * len(columns))
+    writer.close()
+
+    assert CsvWriter(path).index == 3
+
+
+def test_columns_cannot_change(tmp_path):
+    path = str(tmp_path / "rewards.csv")
+    writer = write(path, 0, 1)
+    with pytest.raises(ValueError, match="cannot change"):
+        writer.append(["elapsed_time", "r_0"], [0.0, 1.0])
+    writer.close()
+
+    resumed = CsvWriter(path)
+    with pytest.raises(ValueError, match="cannot change"):
+        resumed.append(["elapsed_time", "r_0"], [0.0, 1.0])
+    resumed.close()
+
+
+def test_experiment_files_are_resumed_when_not_the_first_run(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, "src", "main", "resources"))
+    rewards_path = os.path.join(root, "src", "main", "resources", "rewards.csv")
+
+    for init in [True, False]:
+        utils = EnvironmentControllerUtils(init, root)
+        utils.save_data([1.0, 2.0], [(0.0, 1.0), (2.0, 3.0)])
+        utils.close()
+    assert read(rewards_path).index.tolist() == [0, 1]
+
+    # The first run removes the files of the previous ones
+    utils = EnvironmentControllerUtils(True, root)
+    utils.save_data([1.0, 2.0], [(0.0, 1.0), (2.0, 3.0)])
+    utils.close()
+    assert read(rewards_path).index.tolist() == [0]
@@ -0,0 +1,86 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.main.controllers.environment.utils.trajectory_store import (
+    INDEX_FILE,
+    TrajectoryStoreReader,
+    TrajectoryStoreWriter,
+)
+
+COLUMNS = ["elapsed_time", "x_0", "y_0", "r_0", "x_1", "y_1", "r_1"]
+
+
+def rows(count: int) -> np.ndarray:
+    return (
+        np.random.default_rng(0)
+        .uniform(-10, 10, (count, len(COLUMNS)))
+        .astype(np.float32)
+    )
+
+
+def write(directory: str, values: np.ndarray, **kwargs) -> TrajectoryStoreWriter:
+    writer = TrajectoryStoreWriter(directory, **kwargs)
+    for row in values:
+        writer.append(COLUMNS, row)
+    return writer
+
+
+def test_rows_round_trip_across_chunks(tmp_path):
+    directory = str(tmp_path / "store")
+    expected = rows(10)
+    write(directory, expected, chunk_size=4, flush_interval=60).close()
+
+    with open(os.path.join(directory, INDEX_FILE)) as index_file:
+        index = json.load(index_file)
+    assert (index["columns"], index["rows"], index["chunk_size"]) == (COLUMNS, 10, 4)
+    assert len(index["chunks"]) == 3
+
+    reader = TrajectoryStoreReader(directory)
+    assert len(reader) == 10
+    np.testing.assert_array_equal(reader.read(), expected)
+    # Windows and columns spanning the chunk boundaries
+    np.testing.assert_array_equal(reader.read(3, 9), expected[3:9])
+    np.testing.assert_array_equal(reader.agent(1, 2, 5), expected[2:5][:, [0, 4, 5, 6]])
+    assert reader.read(10).shape == (0, len(COLUMNS))
+
+
+def test_writer_resumes_from_the_index(tmp_path):
+    directory = str(tmp_path / "store")
+    expected = rows(10)
+    # The first run stops in the middle of the second chunk
+    write(directory, expected[:6], chunk_size=4, flush_interval=60).close()
+    write(directory, expected[6:], flush_interval=60).close()
+
+    reader = TrajectoryStoreReader(directory)
+    assert (len(reader), reader.chunk_size) == (10, 4)
+    np.testing.assert_array_equal(reader.read(), expected)
+
+
+def test_index_never_refers_to_unflushed_rows(tmp_path):
+    directory = str(tmp_path / "store")
+    writer = write(directory, rows(5), chunk_size=4, flush_interval=60)
+    writer.flush()
+    writer.append(COLUMNS, rows(6)[5])
+
+    assert len(TrajectoryStoreReader(directory)) == 5
+
+
+def test_to_csv_matches_the_store(tmp_path):
+    directory = str(tmp_path / "store")
+    expected = rows(10)
+    write(directory, expected, chunk_size=4, flush_interval=60).close()
+    rewards_path = str(tmp_path / "rewards.csv")
+    positions_path = str(tmp_path / "positions.csv")
+    TrajectoryStoreReader(directory).to_csv(rewards_path, positions_path)
+
+    rewards = pd.read_csv(rewards_path, index_col=0)
+    assert list(rewards.columns) == ["elapsed_time", "r_0", "r_1"]
+    np.testing.assert_allclose(rewards.to_numpy(), expected[:, [0, 3, 6]], rtol=1e-6)
+    positions = pd.read_csv(positions_path, index_col=0)
+    assert list(positions.columns) == ["elapsed_time", "x_0", "y_0", "x_1", "y_1"]
+    np.testing.assert_allclose(
+        positions.to_numpy(), expected[:, [0, 1, 2, 4, 5]], rtol=1e-6
+    )
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from src.main.controllers.replay_buffer.local.local_replay_buffer_controller import (
+    LocalReplayBufferController,
+)
+from src.test.controllers.replay_buffer.remote.replay_buffer_service_stub import (
+    transition,
+)
+
+
+def ids(controller: LocalReplayBufferController):
+    return controller.transitions().matrix[:, 0].astype(int).tolist()
+
+
+@pytest.mark.parametrize("spilled", [False, True])
+def test_transitions_are_ordered_from_the_oldest(tmp_path, spilled):
+    spill_path = str(tmp_path / "buffer.dat") if spilled else None
+    controller = LocalReplayBufferController(4, spill_path)
+    for i in range(3):
+        controller.record(transition(i))
+    assert ids(controller) == [0, 1, 2]
+
+    for i in range(3, 6):
+        controller.record(transition(i))
+    batch = controller.transitions()
+    assert ids(controller) == [2, 3, 4, 5]
+    assert type(batch.matrix) is np.ndarray
+    expected = np.concatenate(LocalReplayBufferController._transition(transition(5)))
+    np.testing.assert_array_equal(batch.matrix[-1], expected)
+    controller.close()
+
+
+def test_spilled_buffer_is_reopened_from_its_header(tmp_path):
+    spill_path = str(tmp_path / "buffer.dat")
+    controller = LocalReplayBufferController(4, spill_path)
+    for i in range(6):
+        controller.record(transition(i))
+    controller.close()
+    expected = controller.transitions()
+
+    reopened = LocalReplayBufferController.from_spill_file(spill_path)
+    assert (reopened.capacity, reopened.size) == (4, 4)
+    batch = reopened.transitions()
+    assert (batch.num_agents, batch.state_size, batch.action_size) == (
+        expected.num_agents,
+        expected.state_size,
+        expected.action_size,
+    )
+    np.testing.assert_array_equal(batch.matrix, expected.matrix)
+
+    # The ring goes on from the next slot
+    reopened.record(transition(6))
+    assert ids(reopened) == [3, 4, 5, 6]
+    reopened.close()
+
+
+def test_header_never_refers_to_unflushed_transitions(tmp_path):
+    spill_path = str(tmp_path / "buffer.dat")
+    controller = LocalReplayBufferController(4, spill_path)
+    controller.record(transition(0))
+    controller.flush()
+    controller.record(transition(1))
+
+    reopened = LocalReplayBufferController.from_spill_file(spill_path)
+    assert ids(reopened) == [0]
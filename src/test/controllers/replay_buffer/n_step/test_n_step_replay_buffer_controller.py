@@ -0,0 +1,115 @@
+from typing import Tuple
+
+import numpy as np
+import pytest
+
+from src.main.controllers.replay_buffer.n_step.n_step_replay_buffer_controller import (
+    NStepReplayBufferController,
+)
+from src.main.controllers.replay_buffer.replay_buffer_controller import (
+    ReplayBufferController,
+)
+from src.test.controllers.replay_buffer.remote.replay_buffer_service_stub import (
+    transition,
+)
+
+
+class RecordingReplayBufferController(ReplayBufferController):
+    """
+    Buffer controller keeping the forwarded transitions.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.episodes = 0
+        self.closed = False
+
+    def record(self, record_tuple: Tuple):
+        self.records.append(record_tuple)
+
+    def end_episode(self):
+        self.episodes += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def buffer():
+    return RecordingReplayBufferController()
+
+
+def first_ids(records, index: int):
+    return [int(record[index][0][0]) for record in records]
+
+
+def test_rewards_are_discounted_over_n_steps(buffer):
+    controller = NStepReplayBufferController(buffer, n=3, gamma=0.5)
+    for i in range(5):
+        controller.record(transition(i))
+
+    assert len(buffer.records) == 3
+    for t, (prev_states, actions, rewards, _) in enumerate(buffer.records):
+        expected = sum(0.5**k * (t + k) for k in range(3))
+        np.testing.assert_allclose(rewards, [expected, -expected])
+        assert prev_states == transition(t)[0]
+        assert actions == transition(t)[1]
+
+
+def test_next_state_is_the_one_after_n_steps(buffer):
+    controller = NStepReplayBufferController(buffer, n=3, gamma=0.5)
+    for i in range(5):
+        controller.record(transition(i))
+
+    # The transition starting at t bootstraps from the state reached at t + n
+    assert first_ids(buffer.records, 0) == [0, 1, 2]
+    assert first_ids(buffer.records, 3) == [3, 4, 5]
+    assert [record[3] for record in buffer.records] == [
+        transition(t + 2)[3] for t in range(3)
+    ]
+
+
+def test_one_step_transitions_are_forwarded_unchanged(buffer):
+    controller = NStepReplayBufferController(buffer, n=1, gamma=0.5)
+    for i in range(3):
+        controller.record(transition(i))
+
+    for i, (prev_states, actions, rewards, next_states) in enumerate(buffer.records):
+        assert (prev_states, actions, next_states) == (
+            transition(i)[0],
+            transition(i)[1],
+            transition(i)[3],
+        )
+        np.testing.assert_allclose(rewards, transition(i)[2])
+
+
+def test_only_one_every_stride_transitions_is_forwarded(buffer):
+    controller = NStepReplayBufferController(buffer, n=2, gamma=0.5, stride=3)
+    for i in range(9):
+        controller.record(transition(i))
+
+    assert first_ids(buffer.records, 0) == [0, 3, 6]
+
+
+def test_end_episode_clears_the_window(buffer):
+    controller = NStepReplayBufferController(buffer, n=3, gamma=0.5, stride=2)
+    for i in range(4):
+        controller.record(transition(i))
+    assert first_ids(buffer.records, 0) == [0]
+
+    controller.end_episode()
+    assert buffer.episodes == 1
+    # The cut steps 2 and 3 are dropped and never mixed with the next episode,
+    # whose first transition is forwarded whatever the stride
+    for i in range(10, 13):
+        controller.record(transition(i))
+    assert first_ids(buffer.records, 0) == [0, 10]
+    np.testing.assert_allclose(
+        buffer.records[-1][2][0], sum(0.5**k * (10 + k) for k in range(3))
+    )
+
+    controller.record(transition(13))
+    controller.close()
+    assert first_ids(buffer.records, 0) == [0, 10]
+    assert buffer.episodes == 2
+    assert buffer.closed
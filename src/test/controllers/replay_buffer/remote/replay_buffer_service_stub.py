@@ -0,0 +1,113 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Condition, Event, Thread
+from typing import List
+
+import numpy as np
+
+from src.main.model.replay_buffer.transition_batch import (
+    TRANSITION_BATCH_CONTENT_TYPE,
+    TransitionBatch,
+)
+
+
+class ReplayBufferServiceStub:
+    """
+    Local stand-in of the Replay Buffer Service, decoding the JSON and binary
+    /record_data/ bodies into the transition matrix of each request.
+    Responses are held while release is cleared.
+    """
+
+    def __init__(self, port: int = 0, status: int = 200):
+        """
+        :param port: port to listen on, any free one if 0
+        :param status: HTTP status of the responses
+        """
+        self.status = status
+        self.requests: List[np.ndarray] = []
+        self.times: List[float] = []
+        self.release = Event()
+        self.release.set()
+        self.__condition = Condition()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self.__handler())
+        self.server.daemon_threads = True
+        self.__thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.__thread.start()
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def rows(self) -> np.ndarray:
+        """
+        Gets the transitions received so far, in order of arrival.
+        :return: (transitions x columns) matrix
+        """
+        with self.__condition:
+            return np.concatenate(self.requests) if self.requests else np.empty((0, 0))
+
+    def wait_for_requests(self, count: int, timeout: float = 5.0) -> bool:
+        """
+        Waits until count requests were received.
+        :param count: number of requests
+        :param timeout: maximum time to wait, in seconds
+        :return: True if received, False on timeout
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: len(self.requests) >= count, timeout
+            )
+
+    def close(self):
+        """
+        Stops listening, as if the service was killed.
+        """
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _received(self, matrix: np.ndarray):
+        with self.__condition:
+            self.requests.append(matrix)
+            self.times.append(time.monotonic())
+            self.__condition.notify_all()
+
+    def __handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.headers["Content-Type"] == TRANSITION_BATCH_CONTENT_TYPE:
+                    matrix = TransitionBatch.from_bytes(body).matrix
+                else:
+                    payload = json.loads(body)
+                    matrix = np.hstack(
+                        [
+                            np.array(payload[key], dtype=float)
+                            for key in ["State", "Reward", "Action", "Next State"]
+                        ]
+                    )
+                stub._received(matrix)
+                stub.release.wait()
+                self.send_response(stub.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def transition(i: int):
+    """
+    Joint transition of two agents, identified by the first state column.
+    """
+    return (
+        [[i, 0.0, 0.5], [i, 1.0, 0.5]],
+        [[0.25, -0.25], [0.5, -0.5]],
+        [float(i), -float(i)],
+        [[i + 1, 0.0, 0.5], [i + 1, 1.0, 0.5]],
+    )
@@ -0,0 +1,185 @@
+import time
+from threading import Thread
+
+import numpy as np
+import pytest
+
+from src.main.controllers.replay_buffer.remote.batched_replay_buffer_controller import (
+    BatchedReplayBufferController,
+)
+from src.main.model.config.config import Backpressure, WireFormat
+from src.test.controllers.replay_buffer.remote.replay_buffer_service_stub import (
+    ReplayBufferServiceStub,
+    transition,
+)
+
+
+@pytest.fixture
+def service():
+    service = ReplayBufferServiceStub()
+    yield service
+    service.close()
+
+
+def ids(rows: np.ndarray):
+    return rows[:, 0].astype(int).tolist()
+
+
+@pytest.mark.parametrize("wire_format", [WireFormat.JSON, WireFormat.BINARY])
+def test_full_batches_are_sent_at_once(service, wire_format):
+    controller = BatchedReplayBufferController(
+        "127.0.0.1",
+        service.port,
+        batch_size=4,
+        flush_interval=60,
+        wire_format=wire_format,
+    )
+    for i in range(8):
+        controller.record(transition(i))
+    assert service.wait_for_requests(2)
+    controller.close()
+
+    assert [len(request) for request in service.requests] == [4, 4]
+    assert ids(service.rows()) == list(range(8))
+    expected = np.concatenate(BatchedReplayBufferController._transition(transition(3)))
+    assert np.array_equal(service.rows()[3], expected)
+
+
+def test_partial_batches_are_sent_after_the_flush_interval(service):
+    controller = BatchedReplayBufferController(
+        "127.0.0.1", service.port, batch_size=100, flush_interval=0.3
+    )
+    start = time.monotonic()
+    for i in range(3):
+        controller.record(transition(i))
+    assert service.wait_for_requests(1)
+    controller.close()
+
+    assert service.times[0] - start >= 0.3
+    assert [len(request) for request in service.requests] == [3]
+
+
+def test_block_waits_for_room_in_the_queue(service):
+    service.release.clear()
+    controller = BatchedReplayBufferController(
+        "127.0.0.1",
+        service.port,
+        batch_size=1,
+        flush_interval=0,
+        queue_size=2,
+        backpressure=Backpressure.BLOCK,
+    )
+    controller.record(transition(0))
+    # The first transition is in flight, the next two fill the queue
+    assert service.wait_for_requests(1)
+    controller.record(transition(1))
+    controller.record(transition(2))
+    blocked = Thread(target=controller.record, args=(transition(3),))
+    blocked.start()
+    blocked.join(0.3)
+    assert blocked.is_alive()
+
+    service.release.set()
+    blocked.join(5)
+    assert not blocked.is_alive()
+    assert controller.flush(timeout=5)
+    controller.close()
+
+    assert ids(service.rows()) == [0, 1, 2, 3]
+    metrics = controller.metrics()
+    assert (metrics.recorded, metrics.sent, metrics.dropped) == (4, 4, 0)
+
+
+def test_drop_oldest_drops_the_oldest_queued_transitions(service):
+    service.release.clear()
+    controller = BatchedReplayBufferController(
+        "127.0.0.1",
+        service.port,
+        batch_size=1,
+        flush_interval=0,
+        queue_size=2,
+        backpressure=Backpressure.DROP_OLDEST,
+    )
+    controller.record(transition(0))
+    assert service.wait_for_requests(1)
+    # Never blocks, transitions 1 to 3 are dropped to make room for the last ones
+    for i in range(1, 6):
+        controller.record(transition(i))
+    assert controller.metrics().queue_depth == 2
+
+    service.release.set()
+    assert controller.flush(timeout=5)
+    controller.close()
+
+    assert ids(service.rows()) == [0, 4, 5]
+    metrics = controller.metrics()
+    assert (metrics.recorded, metrics.sent, metrics.dropped) == (6, 3, 3)
+
+
+def test_metrics_count_sent_and_failed_transitions(service):
+    controller = BatchedReplayBufferController(
+        "127.0.0.1", service.port, batch_size=2, flush_interval=60
+    )
+    for i in range(4):
+        controller.record(transition(i))
+    assert controller.flush(timeout=5)
+    service.status = 500
+    for i in range(4, 6):
+        controller.record(transition(i))
+    assert controller.flush(timeout=5)
+    controller.close()
+
+    metrics = controller.metrics()
+    assert metrics.queue_depth == 0
+    assert (metrics.recorded, metrics.sent, metrics.dropped, metrics.failed) == (
+        6,
+        4,
+        0,
+        2,
+    )
+    assert metrics.batches == 3
+    assert 0 < metrics.last_send_latency
+    assert 0 < metrics.mean_send_latency
+
+
+def test_hung_requests_time_out_and_are_retried(service):
+    service.release.clear()
+    controller = BatchedReplayBufferController(
+        "127.0.0.1",
+        service.port,
+        batch_size=2,
+        flush_interval=60,
+        request_timeout=0.2,
+        max_retries=3,
+        retry_interval=0.1,
+    )
+    controller.record(transition(0))
+    controller.record(transition(1))
+    # The first request times out, the service answers again to the retried one
+    assert service.wait_for_requests(2)
+    service.release.set()
+    assert controller.flush(timeout=5)
+    controller.close()
+
+    assert [ids(request) for request in service.requests] == [[0, 1], [0, 1]]
+    metrics = controller.metrics()
+    assert (metrics.sent, metrics.failed) == (2, 0)
+
+
+def test_close_returns_when_the_service_hangs(service):
+    service.release.clear()
+    controller = BatchedReplayBufferController(
+        "127.0.0.1",
+        service.port,
+        batch_size=1,
+        flush_interval=60,
+        request_timeout=0.2,
+        retry_interval=0.1,
+    )
+    controller.record(transition(0))
+    assert service.wait_for_requests(1)
+    start = time.monotonic()
+    controller.close()
+
+    assert time.monotonic() - start < 2
+    assert controller.metrics().failed == 1
@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.main.controllers.replay_buffer.remote.spooled_replay_buffer_controller import (
+    SpooledReplayBufferController,
+)
+from src.main.model.config.config import WireFormat
+from src.test.controllers.replay_buffer.remote.replay_buffer_service_stub import (
+    ReplayBufferServiceStub,
+    transition,
+)
+
+
+def client(port: int, spool_path: str, wire_format: WireFormat):
+    return SpooledReplayBufferController(
+        "127.0.0.1",
+        port,
+        spool_path=spool_path,
+        batch_size=8,
+        flush_interval=0.05,
+        segment_size=1024,
+        sync_interval=0,
+        max_retry_interval=0.1,
+        wire_format=wire_format,
+    )
+
+
+@pytest.mark.parametrize("wire_format", [WireFormat.JSON, WireFormat.BINARY])
+def test_spooled_transitions_are_delivered_after_restart(tmp_path, wire_format):
+    spool_path = str(tmp_path / "spool")
+    service = ReplayBufferServiceStub()
+    port = service.port
+    controller = client(port, spool_path, wire_format)
+    for i in range(40):
+        controller.record(transition(i))
+    assert service.wait_for_requests(1)
+    # The service is killed mid-run, the following transitions can only be spooled
+    service.close()
+    delivered = service.rows()
+    for i in range(40, 100):
+        controller.record(transition(i))
+    controller.close()
+
+    # Both the service and the client restart, the client from the same spool
+    service = ReplayBufferServiceStub(port)
+    try:
+        controller = client(port, spool_path, wire_format)
+        assert controller.flush(timeout=10)
+        controller.close()
+    finally:
+        service.close()
+
+    delivered = np.concatenate([delivered, service.rows()])
+    assert set(delivered[:, 0].astype(int).tolist()) == set(range(100))
+    assert controller.metrics().queue_depth == 0
+
+
+def test_hung_service_times_out_and_is_retried(tmp_path):
+    service = ReplayBufferServiceStub()
+    service.release.clear()
+    controller = SpooledReplayBufferController(
+        "127.0.0.1",
+        service.port,
+        spool_path=str(tmp_path / "spool"),
+        batch_size=2,
+        flush_interval=0.05,
+        max_retry_interval=0.1,
+        request_timeout=0.2,
+    )
+    try:
+        controller.record(transition(0))
+        controller.record(transition(1))
+        # The first request hangs until it times out, the retried one is answered
+        assert service.wait_for_requests(2)
+        service.release.set()
+        assert controller.flush(timeout=5)
+        assert controller.metrics().failed >= 2
+    finally:
+        start = time.monotonic()
+        controller.close()
+        service.close()
+    assert time.monotonic() - start < 2
@@ -0,0 +1,38 @@
+import os
+import threading
+
+from src.main.controllers.replay_buffer.remote import transition_spool
+from src.main.controllers.replay_buffer.remote.transition_spool import TransitionSpool
+
+
+def test_appends_never_sync_on_the_calling_thread(tmp_path, monkeypatch):
+    synced_by = []
+    fsync = os.fsync
+
+    def recording_fsync(fd):
+        synced_by.append(threading.current_thread())
+        fsync(fd)
+
+    monkeypatch.setattr(transition_spool.os, "fsync", recording_fsync)
+    spool = TransitionSpool(str(tmp_path), segment_size=64, sync_interval=0)
+    for i in range(20):
+        spool.append(bytes([i]) * 16)
+    spool.close()
+
+    assert synced_by
+    assert all(thread is not threading.current_thread() for thread in synced_by)
+
+
+def test_records_survive_a_reopen(tmp_path):
+    spool = TransitionSpool(str(tmp_path), segment_size=64, sync_interval=0.01)
+    for i in range(20):
+        spool.append(bytes([i]) * 16)
+    records, position = spool.read(5)
+    spool.ack(position, len(records))
+    spool.close()
+
+    spool = TransitionSpool(str(tmp_path), segment_size=64)
+    assert spool.pending() == 15
+    records, _ = spool.read(15, timeout=1)
+    spool.close()
+    assert records == [bytes([i]) * 16 for i in range(5, 20)]
@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.main.controllers.replay_buffer.remote.remote_replay_buffer_controller import (
+    RemoteReplayBufferController,
+)
+from src.main.model.replay_buffer.transition_batch import TransitionBatch
+
+
+def transitions(num_transitions: int, num_agents: int, state_size: int):
+    """
+    Flat (state, reward, action, next_state) transitions with float32 values,
+    which both wire formats represent exactly.
+    """
+    rng = np.random.default_rng(0)
+
+    def flat(size: int) -> np.ndarray:
+        return rng.standard_normal(size).astype(np.float32).astype(float)
+
+    return [
+        (
+            flat(num_agents * state_size),
+            flat(num_agents),
+            flat(num_agents * 2),
+            flat(num_agents * state_size),
+        )
+        for _ in range(num_transitions)
+    ]
+
+
+@pytest.mark.parametrize("num_transitions", [1, 32])
+def test_json_and_binary_bodies_decode_to_the_same_values(num_transitions):
+    batch = transitions(num_transitions, num_agents=3, state_size=5)
+    json_body = json.loads(
+        json.dumps(RemoteReplayBufferController._json_payload(batch))
+    )
+    decoded = TransitionBatch.from_bytes(
+        TransitionBatch.from_transitions(batch).to_bytes()
+    )
+
+    assert (decoded.num_agents, decoded.state_size, decoded.action_size) == (3, 5, 2)
+    assert decoded.to_json() == json_body
+    for key, column in zip(
+        ["State", "Reward", "Action", "Next State"], decoded.split()
+    ):
+        assert np.array_equal(np.array(json_body[key]), column)
+
+
+def test_from_bytes_rejects_other_bodies():
+    body = TransitionBatch.from_transitions(transitions(1, 2, 3)).to_bytes()
+    with pytest.raises(ValueError):
+        TransitionBatch.from_bytes(b"JSON" + body[4:])